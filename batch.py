@@ -0,0 +1,201 @@
+# batch.py
+# Headless batch runner: evaluates operating points from a CSV or JSON case file and streams the results.
+# Only the model and utils packages are imported, so it runs on machines without a display.
+#
+# Example:
+#   python batch.py cases.csv -o results.csv --outputs thrust,tsfc,S
+import argparse
+import csv
+import json
+import sys
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.atmosphere import atmosphere_table
+from utils.units import units as unit_registry
+
+INPUTS = ('M_0', 'T_0', 'P_0', 'T_t4', 'P9rat')
+
+# Units the model expects for the dimensional columns; --units can name others for the case file
+MODEL_UNITS = {'T_0': 'K', 'P_0': 'kPa', 'T_t4': 'K', 'altitude': 'km'}
+
+
+def read_points(stream, fmt):
+    """
+    Lazily read operating points from a case file.
+
+    Parameters:
+    - stream (file): Open text stream.
+    - fmt (str): 'csv', 'jsonl' (one JSON object per line) or 'json' (a JSON array of objects, which is
+      parsed in one go).
+
+    Yields:
+    - dict: One operating point, column name -> value.
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    elif fmt == 'jsonl':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == 'json':
+        yield from json.load(stream)
+    else:
+        raise ValueError(f"Unknown input format: {fmt}")
+
+
+def usable_points(rows, skipped):
+    """
+    Drop cases that give none of the recognized columns, which would otherwise be evaluated silently at the
+    default design point (an all-empty CSV row, or {} in JSON).
+
+    Parameters:
+    - rows (iterable): Cases from read_points().
+    - skipped (list): Receives the 1-based number of every dropped case.
+
+    Yields:
+    - dict: Cases with at least one of M_0, T_0, P_0, T_t4, P9rat or altitude.
+    """
+    for number, row in enumerate(rows, 1):
+        if isinstance(row, dict) and any(row.get(name) not in (None, '') for name in INPUTS + ('altitude',)):
+            yield row
+        else:
+            skipped.append(number)
+
+
+def chunked(rows, size):
+    """
+    Group an iterable into lists of at most `size` items.
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def column(rows, name):
+    # Missing or empty fields become NaN so they can be filled in with defaults
+    values = np.full(len(rows), np.nan)
+    for i, row in enumerate(rows):
+        value = row.get(name)
+        if value is not None and value != '':
+            values[i] = float(value)
+    return values
+
+
+def parse_units(text):
+    """
+    Parse 'column=unit,...' into a dict, checking each unit fits the column.
+    """
+    columns = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, unit = (part.strip() for part in item.partition('='))
+        if name not in MODEL_UNITS:
+            raise ValueError(f"{name} has no unit to convert ({', '.join(MODEL_UNITS)} do)")
+        if unit not in unit_registry or unit_registry.dimension(unit) != unit_registry.dimension(MODEL_UNITS[name]):
+            raise ValueError(f"{unit} is not a {unit_registry.dimension(MODEL_UNITS[name])} unit")
+        columns[name] = unit
+    return columns
+
+
+def evaluate_chunk(analysis, rows, outputs, units=None):
+    """
+    Evaluate one chunk of operating points.
+
+    Columns listed in units (column name -> unit) are converted in place to the model's units first.
+
+    Altitude (km) supplies T_0 and P_0 through the standard atmosphere wherever they are not given;
+    anything still missing falls back to the analysis object's defaults.
+
+    Returns:
+    - dict: Resolved inputs and requested outputs, name -> array with one entry per row.
+    """
+    values = {name: column(rows, name) for name in INPUTS}
+    values['altitude'] = column(rows, 'altitude')
+    if units:
+        unit_registry.convert_columns(values, units, MODEL_UNITS)
+    altitude = values.pop('altitude')
+    if not np.all(np.isnan(altitude)):
+        _, _, T_alt, P_alt, _, _ = atmosphere_table().lookup(altitude)
+        has_altitude = ~np.isnan(altitude)
+        for name, ambient in (('T_0', T_alt), ('P_0', P_alt)):
+            values[name] = np.where(np.isnan(values[name]) & has_altitude, ambient, values[name])
+    for name in INPUTS:
+        values[name] = np.where(np.isnan(values[name]), getattr(analysis, name), values[name])
+
+    result = analysis.calculateCycle(**values)
+    values.update((name, np.broadcast_to(result[name], altitude.shape)) for name in outputs)
+    return values
+
+
+def write_chunk(stream, fmt, values, names, header):
+    if fmt == 'csv':
+        writer = csv.writer(stream)
+        if header:
+            writer.writerow(names)
+        writer.writerows(zip(*(values[name].tolist() for name in names)))
+    else:
+        for row in zip(*(values[name].tolist() for name in names)):
+            stream.write(json.dumps(dict(zip(names, row))) + '\n')
+
+
+def infer_format(path, default):
+    for suffix, fmt in (('.csv', 'csv'), ('.jsonl', 'jsonl'), ('.ndjson', 'jsonl'), ('.json', 'json')):
+        if path.lower().endswith(suffix):
+            return fmt
+    return default
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate turbojet operating points from a case file without the GUI.")
+    parser.add_argument('cases', help="CSV, JSON or JSON Lines case file ('-' for stdin). Columns: M_0, T_0 or altitude (km), P_0, T_t4, P9rat.")
+    parser.add_argument('-o', '--output', default='-', help="Result file ('-' for stdout, the default).")
+    parser.add_argument('--input-format', choices=('csv', 'json', 'jsonl'), help="Defaults to the case file extension, or csv.")
+    parser.add_argument('--output-format', choices=('csv', 'jsonl'), help="Defaults to the output file extension, or csv.")
+    parser.add_argument('--outputs', default='thrust,tsfc', help="Comma-separated CycleResult fields to write (default: thrust,tsfc).")
+    parser.add_argument('--units', default='', help="Comma-separated column=unit pairs for columns not in K, kPa and km, e.g. altitude=ft,P_0=psia,T_0=F.")
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Operating points evaluated and written at a time.")
+    args = parser.parse_args(argv)
+
+    input_format = args.input_format or infer_format(args.cases, 'csv')
+    output_format = args.output_format or infer_format(args.output, 'csv')
+    if output_format == 'json':
+        output_format = 'jsonl'
+    outputs = [name.strip() for name in args.outputs.split(',') if name.strip()]
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    try:
+        column_units = parse_units(args.units)
+    except ValueError as error:
+        parser.error(str(error))
+
+    analysis = GeneralAnalysis()
+    unknown = [name for name in outputs if name not in analysis.calculateCycle()]
+    if unknown:
+        parser.error(f"unknown output(s): {', '.join(unknown)}")
+    names = list(INPUTS) + outputs
+    source = sys.stdin if args.cases == '-' else open(args.cases, newline='')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+    skipped = []
+    try:
+        points = usable_points(read_points(source, input_format), skipped)
+        for i, rows in enumerate(chunked(points, args.chunk_size)):
+            write_chunk(target, output_format, evaluate_chunk(analysis, rows, outputs, column_units), names, header=(i == 0))
+            target.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    if skipped:
+        shown = ', '.join(map(str, skipped[:20])) + (', ...' if len(skipped) > 20 else '')
+        print(f"batch.py: skipped {len(skipped)} case(s) with no M_0, T_0, P_0, T_t4, P9rat or altitude: {shown}",
+              file=sys.stderr)
+
+
+# Check if the script is executed directly
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+# benchmark_suite.py
+# Times the main computational paths and records their peak memory, as JSON that can be kept per commit
+# and compared between branches. Every benchmark runs in its own interpreter.
+#
+# Examples (from the repository root):
+#   python benchmarks/benchmark_suite.py -o main.json
+#   python benchmarks/benchmark_suite.py --compare main.json --tolerance 0.15
+#   python benchmarks/benchmark_suite.py --filter turbojet --quick
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.atmosphere import AtmosphereTable
+from utils.turbine import TVel2h_total, EnthalpyTable
+from utils.unit_conversions import UnitConversions
+from utils.units import units
+from model.turbojet_model import TurbojetModel
+
+MODEL_INPUTS = {'M_0': 0.0, 'M_1': 2.0, 'T_0': 229.8, 'P_0': 30.8, 'T_t4': 1670.0, 'P9rat': 0.955}
+
+
+def scalar_thrust(points):
+    analysis = GeneralAnalysis()
+    a = analysis
+    mach = [float(m) for m in np.linspace(0, 2, points)]
+
+    def run():
+        for M_0 in mach:
+            a.calculateThrust(M_0, a.T_0, a.P_0, a.T_t4, a.P_9, a.g_c, a.gamma_c, a.c_pc, a.gamma_t, a.c_pt,
+                              a.pi_d_max, a.tau_cR, a.T_t4R, a.tau_rR, a.eta_c, a.h_pR, a.eta_b, a.m_dot_R,
+                              a.P_0R, a.pi_rR, a.pi_cR, a.pi_b, a.pi_t, a.pi_n, a.tau_t)
+    return run
+
+
+def turbojet_sweep(points):
+    model = TurbojetModel(num_points=points, **MODEL_INPUTS)
+    return model.calculate
+
+
+def atmosphere(points):
+    analysis = GeneralAnalysis()
+    altitude = np.linspace(0, 30, points)
+    return lambda: analysis.AtmosphereFunction(altitude)
+
+
+def atmosphere_table(points):
+    altitude = np.linspace(0, 30, points)
+    table = AtmosphereTable(max_error=1e-6)
+    return lambda: table.lookup(altitude)
+
+
+def total_enthalpy(points, table=False):
+    temperature = np.linspace(220, 1800, points)
+    velocity = np.linspace(0, 600, points)
+    enthalpy = EnthalpyTable() if table else None
+    return lambda: TVel2h_total(temperature, velocity, enthalpy)
+
+
+def unit_conversions(points):
+    values = np.linspace(1, 1000, points)
+
+    def run():
+        UnitConversions.F_to_K(values)
+        UnitConversions.psia_to_Pa(values)
+        UnitConversions.lbf_to_N(values)
+        UnitConversions.lbhr_to_kgs(values)
+        UnitConversions.feet_to_km(values)
+    return run
+
+
+def unit_registry_inplace(points):
+    values = np.linspace(1, 1000, points)
+    # Each conversion is undone right after, so repeated runs keep the values bounded
+    chain = [units.conversion(source, target) for source, target in
+             (('F', 'K'), ('psia', 'Pa'), ('lbf', 'N'), ('lbm/hr', 'kg/s'), ('ft', 'km'))]
+
+    def run():
+        for conversion in chain:
+            conversion(values, out=values)
+            conversion.inverse()(values, out=values)
+    return run
+
+
+# name -> (factory taking the number of points, points per call, points per call with --quick)
+BENCHMARKS = {
+    'scalar_calculateThrust': (scalar_thrust, 2000, 200),
+    'turbojet_calculate_1k': (turbojet_sweep, 1000, 1000),
+    'turbojet_calculate_100k': (turbojet_sweep, 100000, 100000),
+    'turbojet_calculate_1m': (turbojet_sweep, 1000000, None),
+    'AtmosphereFunction_array': (atmosphere, 1000000, 100000),
+    'AtmosphereTable_lookup': (atmosphere_table, 1000000, 100000),
+    'TVel2h_total_cantera': (total_enthalpy, 2000, 200),
+    'TVel2h_total_table': (lambda n: total_enthalpy(n, table=True), 1000000, 100000),
+    'unit_conversions_array': (unit_conversions, 1000000, 100000),
+    'unit_registry_inplace': (unit_registry_inplace, 1000000, 100000),
+}
+
+
+def measure(run, points, repeat, min_time):
+    """
+    Time a benchmark callable and record its peak traced memory.
+
+    Each of `repeat` samples calls run() as many times as needed to last at least min_time seconds.
+    Peak memory comes from a separate traced call, so tracing never slows the timed samples.
+
+    Returns:
+    - dict: Timing statistics per call, throughput and peak memory.
+    """
+    run()  # warm-up: imports, lazily built tables, caches
+    start = time.perf_counter()
+    run()
+    loops = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                run()
+            samples.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(samples)
+    return {
+        'points': points,
+        'loops': loops,
+        'repeat': repeat,
+        'median_s': median,
+        'min_s': min(samples),
+        'stdev_s': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'points_per_sec': points / median,
+        'peak_bytes': peak,
+    }
+
+
+def run_isolated(name, points, repeat, min_time):
+    # Each benchmark gets a fresh interpreter, so allocator state and caches left by one benchmark
+    # cannot change the timings of the next and filtered runs stay comparable with full ones
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--single', name, '--points', str(points),
+                                '--repeat', str(repeat), '--min-time', str(min_time)],
+                               cwd=ROOT, capture_output=True, text=True)
+    if completed.returncode != 0:
+        lines = completed.stderr.strip().splitlines()
+        return {'error': lines[-1] if lines else f"exit status {completed.returncode}"}
+    return json.loads(completed.stdout)
+
+
+def git_revision():
+    def git(*args):
+        completed = subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True)
+        return completed.stdout.strip() if completed.returncode == 0 else None
+    return {'commit': git('rev-parse', 'HEAD'), 'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+            'dirty': bool(git('status', '--porcelain', '--untracked-files=no'))}
+
+
+def compare(report, baseline, tolerance):
+    """
+    Compare throughput and peak memory against a previous report.
+
+    Returns:
+    - tuple: (per-benchmark comparison dict, list of regressions beyond tolerance)
+    """
+    comparison = {}
+    regressions = []
+    for name, result in report['results'].items():
+        old = baseline.get('results', {}).get(name)
+        if old is None or 'error' in result or 'error' in old:
+            continue
+        speedup = result['points_per_sec'] / old['points_per_sec']
+        memory = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else None
+        comparison[name] = {'speedup': speedup, 'memory_ratio': memory}
+        if speedup < 1 - tolerance:
+            regressions.append(f"{name}: throughput {speedup:.2f}x of baseline")
+        if memory is not None and memory > 1 + tolerance:
+            regressions.append(f"{name}: peak memory {memory:.2f}x of baseline")
+    return comparison, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark throughput and peak memory of the main computational paths.")
+    parser.add_argument('--filter', help="Only run benchmarks whose name contains this text.")
+    parser.add_argument('--quick', action='store_true', help="Smaller problem sizes, skipping the largest sweeps.")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed samples per benchmark (default: 5).")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds per sample (default: 0.2).")
+    parser.add_argument('-o', '--output', help="Also write the JSON report to this file.")
+    parser.add_argument('--compare', help="Previous JSON report (e.g. from another branch) to compare against.")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="Relative slowdown or memory growth versus --compare that counts as a regression (default: 0.10).")
+    parser.add_argument('--single', help=argparse.SUPPRESS)
+    parser.add_argument('--points', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(measure(BENCHMARKS[args.single][0](args.points), args.points, args.repeat, args.min_time)))
+        return 0
+
+    report = {
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'git': git_revision(),
+        'quick': args.quick,
+        'results': {},
+    }
+    for name, (_, points, quick_points) in BENCHMARKS.items():
+        if args.filter and args.filter.lower() not in name.lower():
+            continue
+        points = quick_points if args.quick else points
+        if points is None:
+            continue
+        # A failing benchmark (e.g. Cantera missing) is reported as an error and the rest still run
+        report['results'][name] = run_isolated(name, points, args.repeat, args.min_time)
+        print(f"{name}: {report['results'][name]}", file=sys.stderr)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            report['comparison'], regressions = compare(report, json.load(f), args.tolerance)
+    report['regressions'] = regressions
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# startup_benchmark.py
+# Measures cold-start import time of the library path and the GUI path, each in a fresh interpreter,
+# and checks that the library path does not pull in plotting, Tk or Cantera. The GUI defers matplotlib to
+# its first plot, so that cost is timed separately: headless (importing the TkAgg backend and drawing a first
+# figure) and, when a display is available, by building the GUI and its plot canvas.
+#
+# Example (from the repository root):
+#   python benchmarks/startup_benchmark.py --repeat 10 --budget-ms 400
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only load when they are actually used
+HEAVY_MODULES = ('matplotlib', 'tkinter', 'cantera')
+
+PATHS = {
+    'library': 'import model.turbojet_model',
+    'gui': 'import main; import gui.turbojet_gui',
+    'gui_plot_backend': (
+        'import main; import gui.turbojet_gui\n'
+        'from matplotlib.figure import Figure\n'
+        'from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk\n'
+        'from matplotlib.backends.backend_agg import FigureCanvasAgg\n'
+        'figure = Figure(figsize=(9, 4.5)); FigureCanvasAgg(figure)\n'
+        'figure.add_subplot(1, 2, 1).plot([0, 1]); figure.add_subplot(1, 2, 2).plot([0, 1]); figure.canvas.draw()'
+    ),
+    # Needs a display; reported as an error without one
+    'gui_first_plot': (
+        'import tkinter as tk; import main; from gui.turbojet_gui import TurbojetGUI\n'
+        'root = tk.Tk(); root.withdraw(); view = TurbojetGUI(root)\n'
+        'view.create_plot_canvas(); view.canvas.draw(); root.destroy()'
+    ),
+}
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': sorted({{m.split('.')[0] for m in sys.modules}})}}))
+"""
+
+
+def measure(statement, repeat):
+    """
+    Time an import statement in `repeat` fresh interpreters.
+
+    Returns:
+    - dict: Median/min/max seconds and the heavy modules that ended up loaded.
+    """
+    times = []
+    loaded = set()
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-c', _PROBE.format(statement=statement)],
+                                   cwd=ROOT, capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {'error': completed.stderr.strip().splitlines()[-1]}
+        probe = json.loads(completed.stdout)
+        times.append(probe['seconds'])
+        loaded.update(m for m in probe['modules'] if m in HEAVY_MODULES)
+    return {
+        'median_ms': 1000 * statistics.median(times),
+        'min_ms': 1000 * min(times),
+        'max_ms': 1000 * max(times),
+        'heavy_modules': sorted(loaded),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report cold-start import time for the library and GUI paths.")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per path (default: 5).")
+    parser.add_argument('--budget-ms', type=float, help="Fail if the library path's median exceeds this many ms.")
+    parser.add_argument('--plot-budget-ms', type=float, help="Fail if the headless first-plot path's median exceeds this many ms.")
+    parser.add_argument('-o', '--output', help="Also write the JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    report = {'python': sys.version.split()[0], 'repeat': args.repeat,
+              'paths': {name: measure(statement, args.repeat) for name, statement in PATHS.items()}}
+
+    failures = []
+    library = report['paths']['library']
+    if 'error' in library:
+        failures.append(f"library path failed to import: {library['error']}")
+    else:
+        if library['heavy_modules']:
+            failures.append(f"library path loaded {', '.join(library['heavy_modules'])}")
+        if args.budget_ms is not None and library['median_ms'] > args.budget_ms:
+            failures.append(f"library path took {library['median_ms']:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    plot = report['paths']['gui_plot_backend']
+    if 'error' in plot:
+        failures.append(f"first-plot path failed: {plot['error']}")
+    elif args.plot_budget_ms is not None and plot['median_ms'] > args.plot_budget_ms:
+        failures.append(f"first-plot path took {plot['median_ms']:.1f} ms (budget {args.plot_budget_ms:.1f} ms)")
+    report['failures'] = failures
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,19 @@
+import queue
+import threading
 import tkinter as tk
-import matplotlib.pyplot as plt
-from tkinter import simpledialog, messagebox
-from model.turbojet_model import TurbojetModel
-from utils.unit_conversions import UnitConversions
+from tkinter import simpledialog, messagebox, ttk
+from model.turbojet_model import TurbojetModel, CalculationCancelled
+from model.result_cache import ResultCache
+from utils.units import units
+from utils.decimation import decimate
+from utils.atmosphere import standard_atmosphere
 import numpy as np
 
 class TurbojetGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Turbojet Engine Model")
-        self.root.geometry("750x550")
+        self.root.geometry("900x850")
 
         # Labels and Entries for input parameters
         self.label_M_0 = tk.Label(self.root, text="Low Inlet Mach Number:")
@@ -33,6 +37,8 @@ class TurbojetGUI:
         self.dropdown_T_t4_unit = tk.OptionMenu(self.root, self.entry_T_t4_unit, "K", "C", "F")
         self.label_P9rat = tk.Label(self.root, text="Exit Pressure Ratio:")
         self.entry_P9rat = tk.Entry(self.root, width=10)
+        self.label_num_points = tk.Label(self.root, text="Number of Points:")
+        self.entry_num_points = tk.Entry(self.root, width=10)
 
         # Button to trigger calculation and plotting
         self.calculate_button = tk.Button(self.root, text="Calculate", command=self.calculate_and_display)
@@ -46,8 +52,33 @@ class TurbojetGUI:
         # Button to show altitude input
         self.altitude_button = tk.Button(self.root, text="Don't know values?", command=self.show_altitude_input)
         
+        # Progress of the running calculation and a button to cancel it
+        self.progress_bar = ttk.Progressbar(self.root, length=300, mode="determinate")
+        self.cancel_button = tk.Button(self.root, text="Cancel", command=self.cancel_calculation, state=tk.DISABLED)
+
         # Output label
         self.output_label = tk.Label(self.root, text="Results will be displayed here.")
+
+        # Plot canvas, created with the first results and updated in place afterwards
+        self.plot_frame = tk.Frame(self.root)
+        self.figure = None
+        self.canvas = None
+        self.thrust_line = None
+        self.tsfc_line = None
+
+        # Full results behind the plot; the lines only ever hold a decimated copy sized to the axes
+        self.plot_data = None
+        self.decimation = "minmax"
+
+        # Background calculation state; the worker reports through the queue, polled on the Tk thread
+        self.worker = None
+        self.cancel_event = None
+        self.job_id = 0
+        self.polling = False
+        self.messages = queue.Queue()
+
+        # Repeated runs of the same case are served from memory
+        self.result_cache = ResultCache()
         
         # Place widgets using grid layout
         # Your existing grid layout code
@@ -66,11 +97,18 @@ class TurbojetGUI:
         self.dropdown_T_t4_unit.grid(row=3, column=2, padx=5, pady=5, sticky=tk.W)
         self.label_P9rat.grid(row=4, column=0, padx=10, pady=5, sticky=tk.E)
         self.entry_P9rat.grid(row=4, column=1, padx=5, pady=5)
+        self.label_num_points.grid(row=4, column=2, padx=10, pady=5, sticky=tk.E)
+        self.entry_num_points.grid(row=4, column=3, padx=5, pady=5)
         self.calculate_button.grid(row=5, column=0, columnspan=2, pady=10)
         self.clear_button.grid(row=5, column=2, pady=10)
         self.default_button.grid(row=5, column=3, pady=10)
         self.altitude_button.grid(row=5, column=4, padx=10, pady=10, sticky=tk.W)  # New button added
-        self.output_label.grid(row=6, column=0, columnspan=5, pady=10)
+        self.progress_bar.grid(row=6, column=0, columnspan=3, padx=10, pady=5)
+        self.cancel_button.grid(row=6, column=3, pady=5)
+        self.output_label.grid(row=7, column=0, columnspan=5, pady=10)
+        self.plot_frame.grid(row=8, column=0, columnspan=5, padx=10, pady=5, sticky=tk.NSEW)
+        self.root.grid_rowconfigure(8, weight=1)
+        self.root.grid_columnconfigure(4, weight=1)
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
 
@@ -85,51 +123,142 @@ class TurbojetGUI:
         T_t4 = float(self.entry_T_t4.get())
         P9rat = float(self.entry_P9rat.get())
 
-        # Convert ambient temperature to Kelvin based on the selected unit
-        T_0_unit = self.entry_T_0_unit.get()
-        if T_0_unit == "C":
-            T_0 = UnitConversions.C_to_K(T_0)
-        elif T_0_unit == "F":
-            T_0 = UnitConversions.F_to_K(T_0)
-
-        # Convert ambient pressure to kPa based on the selected unit
-        P_0_unit = self.entry_P_0_unit.get()
-        if P_0_unit == "Pa":
-            P_0 = UnitConversions.Pa_to_kPa(P_0)
-        elif P_0_unit == "atm":
-            P_0 = UnitConversions.atm_to_kPa(P_0)
-
-        # Convert turbine inlet temperature to Kelvin based on the selected unit
-        T_t4_unit = self.entry_T_t4_unit.get()
-        if T_t4_unit == "C":
-            T_t4 = UnitConversions.C_to_K(T_t4)
-        elif T_t4_unit == "F":
-            T_t4 = UnitConversions.F_to_K(T_t4)
-
-        # Calculate results
-        inputs = {'M_0': M_0, 'M_1': M_1, 'T_0': T_0, 'P_0': P_0, 'T_t4': T_t4, 'P9rat': P9rat}
-        model = TurbojetModel(**inputs)
-        mach_vals, thrust_vals, tsfc_vals = model.calculate()
-
-        # Plotting
-        plt.figure(figsize=(12, 6))
+        # Convert the inputs from the selected units to the ones the model works in (K and kPa)
+        T_0 = units.convert(T_0, self.entry_T_0_unit.get(), 'K')
+        P_0 = units.convert(P_0, self.entry_P_0_unit.get(), 'kPa')
+        T_t4 = units.convert(T_t4, self.entry_T_t4_unit.get(), 'K')
+
+        # Calculate results on a background thread so the window stays responsive
+        num_points = int(float(self.entry_num_points.get()))
+        inputs = {'M_0': M_0, 'M_1': M_1, 'T_0': T_0, 'P_0': P_0, 'T_t4': T_t4, 'P9rat': P9rat, 'num_points': num_points}
+        self.start_calculation(TurbojetModel(**inputs))
+
+    def start_calculation(self, model):
+        # A new calculation replaces any that is still running
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+        self.job_id += 1
+        self.cancel_event = threading.Event()
+        self.worker = threading.Thread(target=self.run_calculation, args=(self.job_id, model, self.cancel_event), daemon=True)
+        self.progress_bar["value"] = 0
+        self.cancel_button.config(state=tk.NORMAL)
+        self.output_label.config(text=f"Calculating {model.num_points} points...")
+        self.worker.start()
+        if not self.polling:
+            self.polling = True
+            self.root.after(50, self.poll_calculation)
+
+    def run_calculation(self, job_id, model, cancel_event):
+        # Runs on the worker thread: never touch Tk widgets here, only post messages
+        def progress(done, total):
+            self.messages.put((job_id, "progress", done / total))
+
+        try:
+            results = model.calculate(progress=progress, cancel=cancel_event, chunk_size=max(model.num_points // 100, 1000), cache=self.result_cache)
+            self.messages.put((job_id, "done", results))
+        except CalculationCancelled:
+            self.messages.put((job_id, "cancelled", None))
+        except Exception as error:
+            self.messages.put((job_id, "error", error))
+
+    def poll_calculation(self):
+        finished = False
+        while True:
+            try:
+                job_id, kind, payload = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if job_id != self.job_id:
+                continue  # message from a calculation that has since been replaced
+            if kind == "progress":
+                self.progress_bar["value"] = 100 * payload
+            else:
+                finished = True
+                self.cancel_button.config(state=tk.DISABLED)
+                if kind == "done":
+                    self.display_results(*payload)
+                    self.output_label.config(text=f"Calculated {len(payload[0])} points.")
+                elif kind == "cancelled":
+                    self.output_label.config(text="Calculation cancelled.")
+                else:
+                    self.output_label.config(text="Calculation failed.")
+                    messagebox.showerror("Calculation Error", str(payload))
+        if finished:
+            self.polling = False
+        else:
+            self.root.after(50, self.poll_calculation)
+
+    def cancel_calculation(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+
+    def display_results(self, mach_vals, thrust_vals, tsfc_vals):
+        if self.canvas is None:
+            self.create_plot_canvas()
+
+        # Keep the full results sorted by Mach number so the visible range can be found by bisection
+        self.plot_data = tuple(np.asarray(values, dtype=float) for values in (mach_vals, thrust_vals, tsfc_vals))
+        if np.any(np.diff(self.plot_data[0]) < 0):
+            order = np.argsort(self.plot_data[0], kind="stable")
+            self.plot_data = tuple(values[order] for values in self.plot_data)
+
+        # Update the existing lines rather than building a new figure
+        self.update_plot_lines(full=True)
+        for axes in self.figure.axes:
+            axes.relim()
+            axes.autoscale_view()
+        self.canvas.draw_idle()
+
+    def update_plot_lines(self, axes=None, full=False):
+        # Re-decimate from the full data for the current view and plot width, so drawing takes the same time
+        # however many points were calculated
+        if self.plot_data is None:
+            return
+        mach_vals, *series = self.plot_data
+        for line, values in zip((self.thrust_line, self.tsfc_line), series):
+            if axes is not None and line.axes is not axes:
+                continue
+            pixels = line.axes.get_window_extent().width
+            xlim = None if full else line.axes.get_xlim()
+            line.set_data(*decimate(mach_vals, values, pixels, method=self.decimation, xlim=xlim))
+
+    def on_xlim_changed(self, axes):
+        # Zooming or panning: pick up the detail of the new range from the full data
+        self.update_plot_lines(axes)
+
+    def on_plot_resize(self, event):
+        self.update_plot_lines()
+
+    def create_plot_canvas(self):
+        # Plotting (matplotlib is only imported once there is something to plot)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+        self.figure = Figure(figsize=(9, 4.5))
 
         # Plot Mach number vs Thrust
-        plt.subplot(1, 2, 1)
-        plt.plot(mach_vals, thrust_vals)
-        plt.xlabel('Mach Number')
-        plt.ylabel('Thrust (N)')
-        plt.title('Calculated Thrust vs Inlet Mach Number')
-
-        # Plot Mach number vs RPM
-        plt.subplot(1, 2, 2)
-        plt.plot(mach_vals, tsfc_vals)
-        plt.xlabel('Mach Number')
-        plt.ylabel('TSFC (kg kN$^{-1}$ hr$^{-1}$)')
-        plt.title('Calculated TSFC vs Inlet Mach Number')
-
-        plt.tight_layout()
-        plt.show()
+        thrust_axes = self.figure.add_subplot(1, 2, 1)
+        self.thrust_line, = thrust_axes.plot([], [])
+        thrust_axes.set_xlabel('Mach Number')
+        thrust_axes.set_ylabel('Thrust (N)')
+        thrust_axes.set_title('Calculated Thrust vs Inlet Mach Number')
+
+        # Plot Mach number vs TSFC
+        tsfc_axes = self.figure.add_subplot(1, 2, 2)
+        self.tsfc_line, = tsfc_axes.plot([], [])
+        tsfc_axes.set_xlabel('Mach Number')
+        tsfc_axes.set_ylabel('TSFC (kg kN$^{-1}$ hr$^{-1}$)')
+        tsfc_axes.set_title('Calculated TSFC vs Inlet Mach Number')
+
+        self.figure.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.plot_frame)
+        NavigationToolbar2Tk(self.canvas, self.plot_frame).pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        # Re-decimate whenever the view or the plot size changes
+        for axes in self.figure.axes:
+            axes.callbacks.connect("xlim_changed", self.on_xlim_changed)
+        self.canvas.mpl_connect("resize_event", self.on_plot_resize)
 
     def clear_inputs(self):
         # Clear all input fields
@@ -139,6 +268,7 @@ class TurbojetGUI:
         self.entry_P_0.delete(0, tk.END)
         self.entry_T_t4.delete(0, tk.END)
         self.entry_P9rat.delete(0, tk.END)
+        self.entry_num_points.delete(0, tk.END)
 
     def fill_default_inputs(self):
         # Fill empty input fields with default values and set corresponding dropdowns to default units
@@ -157,6 +287,8 @@ class TurbojetGUI:
             self.entry_T_t4_unit.set("K")
         if not self.entry_P9rat.get():
             self.entry_P9rat.insert(tk.END, "0.955")
+        if not self.entry_num_points.get():
+            self.entry_num_points.insert(tk.END, "1000")
     
     def show_altitude_input(self):
         # Create a pop-up window
@@ -181,13 +313,9 @@ class TurbojetGUI:
         def calculate_and_display_values():
             # Retrieve altitude and units from the input fields
             altitude = float(altitude_entry.get())
-            units = units_var.get()
 
-            # Convert altitude to kilometers if necessary
-            if units == "m":
-                altitude = UnitConversions.meters_to_km(altitude)  # Convert from meters to km
-            elif units == "ft":
-                altitude = UnitConversions.feet_to_km(altitude)  # Convert from feet to km
+            # Convert altitude to kilometers
+            altitude = units.convert(altitude, units_var.get(), 'km')
 
             # Calculate ambient temperature and pressure based on altitude
             _, _, T, P, _, _ = self.AtmosphereFunction(altitude)
@@ -207,41 +335,11 @@ class TurbojetGUI:
 
 
     def AtmosphereFunction(self, h_G_km):       #Atmosphere Function input hieght in Kilometers
-            h_G = h_G_km*3280.84              #Kilometers to feet
-            r_e=3959*5280                     #miles to feet
-            R=1716.5                          #ft2/R-sec
-            g0=32.174                         #ft/s^2
-            T0=518.69                         #deg R
-            g_hG=g0*(r_e/(r_e+h_G))**2        #gravity acceleration based on geopotential altitude
-            h=(r_e/(r_e+h_G))*h_G             #altitude from geopotential altitude and earth radius
-            if h<36000:                       # standard atmosphere maths up until tropopause
-                h0=0                          # initial altitude of comparison is sea level
-                T0=518.69                     #deg R
-                P0=2116.22                    #psf
-                rho0=2.3769e-3                #slugs/ft3
-                a1=-3.57/1000                 #deg R/ft
-                T= T0 + a1*(h-h0)             # calculate temperature from linear distribution
-                P= P0*(T/T0)**(-g0/(R*a1))    #pressure from temperature
-                rho = rho0*(T/T0)**(-((g0/(R*a1))+1))       #density from temperature
-            else:
-                h0=36000                      #tropopause altitude (ft)
-                P0=4.760119191888137e+2       #from anderson
-                rho0=7.103559955456123e-4     #from running code at 36000
-                T=389.99                      # constant temperature
-                P= P0*np.exp((-g0/(R*T)*(h-h0)))            #pressure from temperature
-                rho = rho0*np.exp(-(g0/(R*T)*(h-h0)))       #density from temperature
-            a=np.sqrt(1.4*P/rho)              # speed of sound
-            h_G = h_G_km/3280.84              #Feet to Km
-            h = h/3280.84                     #Geopotential altitude in km
-            T = T*0.555556                    #Rankine to Kelvin
-            P = P /0.020885 /1000             #Psf to KPa
-            rho = rho/515.4                   #Density in kg/m^2
-            a = a/3.281                       #Local  m/s
-            return [h_G, h, T, P, rho,a]
-
+        return standard_atmosphere(h_G_km)
 
     def on_closing(self):
         if messagebox.askyesno(title="Exit Application", message="Are you sure you want to exit?"):
+            self.cancel_calculation()
             self.root.destroy()
 
 # Example usage
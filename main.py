@@ -1,7 +1,9 @@
 import tkinter as tk
-from gui.turbojet_gui import TurbojetGUI
 
 def main():
+    # Imported here so that importing main (e.g. from the startup benchmark) does not load the GUI
+    from gui.turbojet_gui import TurbojetGUI
+
     # Initialize the main application window
     root = tk.Tk()
 
@@ -0,0 +1,299 @@
+# design_study.py
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.atmosphere import standard_atmosphere
+
+
+class DesignStudyResult:
+    """
+    Grid evaluation of a DesignStudy.
+
+    Attributes:
+    - pi_c, T_t4, M_0 (array): Design grid values, one axis each.
+    - objective (array): Aggregated objective on the grid, shape (len(pi_c), len(T_t4), len(M_0)).
+    - feasible (array of bool): Designs meeting every constraint at every flight condition.
+    - outputs (dict): Output name -> array with an extra leading axis over the flight conditions.
+    - best (dict): pi_c, T_t4, M_0 and objective of the best feasible grid design (empty if none).
+    """
+
+    def __init__(self, pi_c, T_t4, M_0, objective, feasible, outputs, best):
+        self.pi_c = pi_c
+        self.T_t4 = T_t4
+        self.M_0 = M_0
+        self.objective = objective
+        self.feasible = feasible
+        self.outputs = outputs
+        self.best = best
+
+
+class DesignStudy:
+    """
+    Parametric design-point study over compressor pressure ratio, turbine inlet temperature and flight Mach.
+
+    A design fixes the reference values GeneralAnalysis uses for off-design performance: pi_cR = pi_c,
+    T_t4R = T_t4 and the ram and diffuser reference at M_0, with tau_cR following from pi_c and eta_c, and
+    tau_t and pi_t from the compressor-turbine work balance at the design point. Designs
+    are passed to calculateCycle as arrays of design constants, so a whole grid (or every vertex of every
+    simplex during refinement) is one array evaluation on a single GeneralAnalysis object.
+
+    Each design is run at every flight condition in `conditions` (by default only the design point itself).
+    The objective is the weighted mean of one output over those conditions, and a design is feasible when
+    every constrained output stays within its limits at every condition (and the turbine balances with
+    0 < tau_t < 1, and thrust and fuel-air ratio are positive throughout). Note that the `tsfc` output of
+    GeneralAnalysis is specific thrust F/m_dot; fuel consumption per unit thrust is `S`.
+    """
+
+    def __init__(self, analysis=None, objective='S', sense='min', conditions=None, weights=None, constraints=None,
+                 altitude=None, eta_m=None, e_t=None):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Provides the remaining design constants.
+        - objective (str): CycleResult field to optimize, e.g. 'S' (fuel consumption) or 'tsfc' (specific thrust).
+        - sense (str): 'min' or 'max'.
+        - conditions (list of dict, optional): Off-design flight conditions with any of M_0, altitude (km),
+          T_0, P_0, T_t4 and P9rat. Inputs left out take the design's own value (M_0, T_t4) or the design
+          ambient. Defaults to the design point alone.
+        - weights (sequence, optional): Weight of each condition in the objective. Equal by default.
+        - constraints (dict, optional): Output name -> (low, high) limits, either may be None.
+        - altitude (float, optional): Design altitude in km. Defaults to the analysis reference ambient T_0R/P_0R.
+        - eta_m (float, optional): Shaft mechanical efficiency. Defaults to the analysis eta_mR.
+        - e_t (float, optional): Turbine polytropic efficiency. Defaults to the value that links the analysis
+          reference tau_tR and pi_tR.
+        """
+        if sense not in ('min', 'max'):
+            raise ValueError("sense must be 'min' or 'max'")
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        self.objective = objective
+        self.sense = sense
+        self.conditions = list(conditions) if conditions else [{}]
+        weights = np.ones(len(self.conditions)) if weights is None else np.asarray(weights, dtype=float)
+        if weights.shape != (len(self.conditions),):
+            raise ValueError("weights must have one entry per condition")
+        self.weights = weights / weights.sum()
+        self.constraints = dict(constraints or {})
+        a = self.analysis
+        self.eta_m = a.eta_mR if eta_m is None else float(eta_m)
+        self.e_t = a.gamma_t*np.log(a.tau_tR)/((a.gamma_t - 1)*np.log(a.pi_tR)) if e_t is None else float(e_t)
+        if altitude is None:
+            self.T_0, self.P_0 = self.analysis.T_0R, self.analysis.P_0R
+        else:
+            _, _, self.T_0, self.P_0, _, _ = standard_atmosphere(float(altitude))
+
+    def design_constants(self, pi_c, T_t4, M_0):
+        """
+        Reference values that make (pi_c, T_t4, M_0) the design point, broadcast over the inputs.
+
+        Returns:
+        - dict: Design constant overrides for calculateCycle.
+        """
+        return self._design(pi_c, T_t4, M_0)[0]
+
+    def _design(self, pi_c, T_t4, M_0):
+        # Design constant overrides, and the design fuel-air ratio they were balanced with
+        a = self.analysis
+        gamma_c, gamma_t, eta_c = a.gamma_c, a.gamma_t, a.eta_c
+        pi_c, T_t4, M_0 = (np.asarray(v, dtype=float) for v in (pi_c, T_t4, M_0))
+        T_0 = np.asarray(self.T_0, dtype=float)
+        tau_r = a.calc_tau_r(gamma_c, M_0)
+        tau_c = 1 + (pi_c**((gamma_c - 1)/gamma_c) - 1)/eta_c
+        tau_lambda = a.calc_tau_lambda(a.c_pt, T_t4, a.c_pc, T_0)
+        f = a.calc_f(tau_lambda, tau_r, tau_c, a.h_pR, a.eta_b, a.c_p, T_0)
+        # The turbine drives the compressor: its temperature ratio follows from the work balance, and its
+        # pressure ratio from the polytropic efficiency
+        tau_t = 1 - tau_r*(tau_c - 1)/(self.eta_m*(1 + f)*tau_lambda)
+        with np.errstate(invalid='ignore'):
+            pi_t = tau_t**(gamma_t/((gamma_t - 1)*self.e_t))
+        constants = {
+            'pi_cR': pi_c,
+            'tau_cR': tau_c,
+            'T_t4R': T_t4,
+            'tau_rR': tau_r,
+            'pi_rR': a.calc_pi_r(tau_r, gamma_c),
+            'pi_dR': a.calc_pi_d(a.pi_d_max, a.calc_eta_r(M_0)),
+            'T_0R': T_0,
+            'P_0R': np.asarray(self.P_0, dtype=float),
+            'tau_t': tau_t,
+            'pi_t': pi_t,
+        }
+        return constants, f
+
+    def evaluate(self, pi_c, T_t4, M_0):
+        """
+        Evaluate designs at every flight condition.
+
+        Parameters:
+        - pi_c, T_t4, M_0 (float or array): Design values, broadcast against each other.
+
+        Returns:
+        - tuple: (objective, feasible, outputs) where outputs maps the objective, thrust, f and each
+          constrained output to an array with a leading axis over the conditions.
+        """
+        pi_c, T_t4, M_0 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (pi_c, T_t4, M_0)))
+        constants, f_design = self._design(pi_c, T_t4, M_0)
+        names = list(dict.fromkeys([self.objective, 'thrust', 'f', *self.constraints]))
+        outputs = {name: np.empty((len(self.conditions),) + pi_c.shape) for name in names}
+        for i, condition in enumerate(self.conditions):
+            point = {'M_0': condition.get('M_0', M_0), 'T_t4': condition.get('T_t4', T_t4),
+                     'T_0': condition.get('T_0', self.T_0), 'P_0': condition.get('P_0', self.P_0)}
+            if 'P9rat' in condition:
+                point['P9rat'] = condition['P9rat']
+            if 'altitude' in condition:
+                _, _, point['T_0'], point['P_0'], _, _ = standard_atmosphere(np.asarray(condition['altitude'], dtype=float))
+            with np.errstate(all='ignore'):
+                result = self.analysis.calculateCycle(**point, **constants)
+            for name in names:
+                outputs[name][i] = result[name]
+
+        # A design must balance its turbine with fuel to spare, and burn fuel and produce thrust everywhere,
+        # before its constraints are checked
+        tau_t = constants['tau_t']
+        feasible = (f_design > 0) & (tau_t > 0) & (tau_t < 1)
+        feasible &= np.all((outputs['thrust'] > 0) & (outputs['f'] > 0), axis=0)
+        for name, (low, high) in self.constraints.items():
+            if low is not None:
+                feasible &= np.all(outputs[name] >= low, axis=0)
+            if high is not None:
+                feasible &= np.all(outputs[name] <= high, axis=0)
+        objective = np.tensordot(self.weights, outputs[self.objective], axes=1)
+        feasible &= np.isfinite(objective)
+        return objective, feasible, outputs
+
+    def _penalized(self, pi_c, T_t4, M_0):
+        # Objective turned into a quantity to minimize, with infeasible designs pushed to +inf
+        objective, feasible, _ = self.evaluate(pi_c, T_t4, M_0)
+        value = objective if self.sense == 'min' else -objective
+        return np.where(feasible, value, np.inf)
+
+    def grid(self, pi_c, T_t4, M_0):
+        """
+        Evaluate the Cartesian grid of the given design values in one array pass.
+
+        Returns:
+        - DesignStudyResult: Objective, feasibility and outputs on the grid, and its best feasible design.
+        """
+        axes = [np.atleast_1d(np.asarray(v, dtype=float)) for v in (pi_c, T_t4, M_0)]
+        mesh = np.meshgrid(*axes, indexing='ij')
+        objective, feasible, outputs = self.evaluate(*mesh)
+        best = {}
+        if feasible.any():
+            score = np.where(feasible, objective if self.sense == 'min' else -objective, np.inf)
+            i = np.unravel_index(np.argmin(score), score.shape)
+            best = {'pi_c': float(mesh[0][i]), 'T_t4': float(mesh[1][i]), 'M_0': float(mesh[2][i]),
+                    'objective': float(objective[i])}
+        return DesignStudyResult(*axes, objective, feasible, outputs, best)
+
+    def refine(self, starts, bounds, xtol=1e-6, ftol=1e-10, max_iter=500):
+        """
+        Refine designs with Nelder-Mead, running every start point together.
+
+        The search works in coordinates scaled to the bounds and clips trial points back into them. Every
+        iteration evaluates the reflection, expansion and both contraction points of all simplices in a single
+        array call, and a second call for the simplices that shrink.
+
+        Parameters:
+        - starts (array): Start designs as (pi_c, T_t4, M_0) rows, shape (n_starts, 3) or (3,).
+        - bounds (sequence): (low, high) for pi_c, T_t4 and M_0.
+        - xtol (float): Converged once every simplex vertex is this close to the best, in scaled coordinates.
+        - ftol (float): ... and the objective spread over the simplex is below this (relative).
+        - max_iter (int): Iteration limit.
+
+        Returns:
+        - dict: pi_c, T_t4, M_0 and objective of the best refined design, plus 'designs' and 'objectives'
+          with the result of each start and 'iterations'.
+        """
+        low, high = (np.asarray(b, dtype=float) for b in zip(*bounds))
+        starts = np.atleast_2d(np.asarray(starts, dtype=float))
+        k, d = starts.shape
+
+        def scaled_cost(u):
+            x = low + np.clip(u, 0.0, 1.0) * (high - low)
+            return self._penalized(x[..., 0], x[..., 1], x[..., 2])
+
+        # Initial simplices: each start plus a 5% step along every axis (stepping inwards near the upper bound)
+        u0 = (starts - low) / (high - low)
+        step = np.where(u0 + 0.05 <= 1.0, 0.05, -0.05)
+        simplex = np.repeat(u0[:, None, :], d + 1, axis=1)
+        simplex[:, 1:, :] += np.eye(d)[None] * step[:, None, :]
+        cost = scaled_cost(simplex)
+
+        iterations = 0
+        active = np.ones(k, dtype=bool)
+        for iterations in range(1, max_iter + 1):
+            order = np.argsort(cost, axis=1)
+            simplex = np.take_along_axis(simplex, order[:, :, None], axis=1)
+            cost = np.take_along_axis(cost, order, axis=1)
+            spread = np.max(np.abs(simplex - simplex[:, :1]), axis=(1, 2))
+            finite = np.isfinite(cost[:, 0])
+            with np.errstate(invalid='ignore'):
+                flat = np.abs(cost[:, -1] - cost[:, 0]) <= ftol * np.maximum(np.abs(cost[:, 0]), 1e-300)
+            active &= ~((spread <= xtol) & (flat | ~finite))
+            if not active.any():
+                break
+
+            centroid = simplex[:, :-1].mean(axis=1)
+            worst = simplex[:, -1]
+            trials = np.stack([centroid + (centroid - worst),            # reflection
+                               centroid + 2.0 * (centroid - worst),      # expansion
+                               centroid + 0.5 * (centroid - worst),      # outside contraction
+                               centroid - 0.5 * (centroid - worst)],     # inside contraction
+                              axis=1)
+            trials = np.clip(trials, 0.0, 1.0)
+            f_r, f_e, f_oc, f_ic = np.moveaxis(scaled_cost(trials), 1, 0)
+
+            best, second = cost[:, 0], cost[:, -2]
+            expand = f_r < best
+            reflect = ~expand & (f_r < second)
+            outside = ~expand & ~reflect & (f_r < cost[:, -1]) & (f_oc <= f_r)
+            inside = ~expand & ~reflect & (f_r >= cost[:, -1]) & (f_ic < cost[:, -1])
+            use_e = expand & (f_e < f_r)
+            replace = (expand | reflect | outside | inside) & active
+            shrink = ~(expand | reflect | outside | inside) & active
+
+            new_point = np.where(use_e[:, None], trials[:, 1], trials[:, 0])
+            new_point = np.where(outside[:, None], trials[:, 2], new_point)
+            new_point = np.where(inside[:, None], trials[:, 3], new_point)
+            new_cost = np.where(use_e, f_e, f_r)
+            new_cost = np.where(outside, f_oc, new_cost)
+            new_cost = np.where(inside, f_ic, new_cost)
+            simplex[replace, -1] = new_point[replace]
+            cost[replace, -1] = new_cost[replace]
+
+            if shrink.any():
+                shrunk = simplex[shrink, :1] + 0.5 * (simplex[shrink, 1:] - simplex[shrink, :1])
+                simplex[shrink, 1:] = shrunk
+                cost[shrink, 1:] = scaled_cost(shrunk)
+
+        i = np.argmin(cost, axis=1)
+        designs = low + np.clip(simplex[np.arange(k), i], 0.0, 1.0) * (high - low)
+        objectives, feasible, _ = self.evaluate(designs[:, 0], designs[:, 1], designs[:, 2])
+        objectives = np.where(feasible, objectives, np.nan)
+        refined = {'designs': designs, 'objectives': objectives, 'iterations': iterations}
+        if feasible.any():
+            score = np.where(feasible, objectives if self.sense == 'min' else -objectives, np.inf)
+            j = int(np.argmin(score))
+            refined.update(pi_c=float(designs[j, 0]), T_t4=float(designs[j, 1]), M_0=float(designs[j, 2]),
+                           objective=float(objectives[j]))
+        return refined
+
+    def optimize(self, pi_c, T_t4, M_0, starts=3, **options):
+        """
+        Grid search followed by Nelder-Mead refinement of the best feasible grid designs.
+
+        Parameters:
+        - pi_c, T_t4, M_0 (sequence): Grid values; their ranges also bound the refinement.
+        - starts (int): Number of best grid designs to refine.
+        - **options: Passed to refine().
+
+        Returns:
+        - tuple: (DesignStudyResult of the grid, dict from refine(), or None if no grid design is feasible)
+        """
+        study = self.grid(pi_c, T_t4, M_0)
+        if not study.feasible.any():
+            return study, None
+        score = np.where(study.feasible, study.objective if self.sense == 'min' else -study.objective, np.inf)
+        count = min(int(starts), int(study.feasible.sum()))
+        best = np.argsort(score, axis=None)[:count]
+        index = np.unravel_index(best, score.shape)
+        points = np.column_stack([study.pi_c[index[0]], study.T_t4[index[1]], study.M_0[index[2]]])
+        bounds = [(axis.min(), axis.max()) for axis in (study.pi_c, study.T_t4, study.M_0)]
+        return study, self.refine(points, bounds, **options)
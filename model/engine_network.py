@@ -0,0 +1,242 @@
+# engine_network.py
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.atmosphere import standard_atmosphere
+from utils.compressor import CompressorModel
+from utils.burner import BurnerModel
+from utils.duct import DuctModel
+from utils.nozzle import NozzleModel
+from utils.shaft import ShaftModel
+from utils.turbine import TurbineModel
+
+
+def mass_flow_parameter(M, gamma, R):
+    """
+    Corrected mass flow per unit area, m_dot*sqrt(T_t)/(P_t*A), at Mach number M (SI units).
+    """
+    return np.sqrt(gamma/R) * M * (1 + (gamma - 1)/2 * M**2)**(-(gamma + 1)/(2*(gamma - 1)))
+
+
+class MatchResult:
+    """
+    Matched operating points of an EngineNetwork, one entry per point.
+
+    Attributes:
+    - converged (array of bool): Residuals fell below the tolerance.
+    - iterations (array of int): Newton iterations spent on each point.
+    - residual (array): Largest remaining normalized residual.
+    - stations (dict): Station and performance quantities: pi_c, tau_c, pi_t, tau_t, f, m_dot, T_t2..T_t9 (K),
+      P_t2..P_t9 and P_9 (kPa), M_9, thrust (N), S (kg/s/N) and N (RPM).
+    """
+
+    def __init__(self, converged, iterations, residual, stations):
+        self.converged = converged
+        self.iterations = iterations
+        self.residual = residual
+        self.stations = stations
+
+    def __getitem__(self, name):
+        return self.stations[name]
+
+    def __contains__(self, name):
+        return name in self.stations
+
+
+class EngineNetwork:
+    """
+    Station-by-station single-spool turbojet that is matched off-design with a batched Newton solver.
+
+    The stations are chained through the component models: inlet and burner pressure losses through
+    DuctModel, compression through CompressorModel, heat addition through BurnerModel, expansion through
+    TurbineModel, the shaft power balance through ShaftModel and gross thrust through NozzleModel. Gases are
+    calorically perfect with the GeneralAnalysis constants (c_pc, gamma_c before the burner, c_pt, gamma_t
+    after it).
+
+    For a given flight condition and T_t4 the unknowns are the compressor and turbine pressure ratios. The
+    turbine nozzle guide vanes are choked, which fixes the mass flow, and the two residuals are
+    - the shaft power balance, eta_m*turbine power - compressor power = 0, and
+    - the exit nozzle throat flow, which must pass the turbine exit flow (choked or not).
+    The throat areas and the turbine efficiency are calibrated so that the GeneralAnalysis reference design
+    is an exact match point.
+
+    Every point of a batch iterates together on log(pi_c) and log(pi_t). The 2x2 Jacobians come from forward
+    differences and are solved in closed form, steps are limited in size, and points drop out of the active
+    set as soon as they converge, so later iterations only touch the slow points.
+    """
+
+    def __init__(self, analysis=None, eta_t=None, C_fg=1.0, max_step=0.5):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Component constants and the reference design.
+        - eta_t (float, optional): Turbine isentropic efficiency. Defaults to the value that balances the
+          shaft at the reference design.
+        - C_fg (float): Nozzle gross thrust coefficient passed to NozzleModel.
+        - max_step (float): Largest change of log(pi_c) or log(pi_t) per Newton step.
+        """
+        a = self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        self.R_c = a.calc_R_c(a.gamma_c, a.c_pc)
+        self.R_t = a.calc_R_t(a.gamma_t, a.c_pt)
+        self.eta_m = a.eta_mR
+        self.C_fg = C_fg
+        self.max_step = max_step
+
+        # Calibrate the turbine efficiency so the shaft balances at the reference pi_cR and pi_tR (the
+        # tabulated tau_tR is rounded), then the choked turbine flow and the exit nozzle throat
+        self.eta_t = 1.0
+        design = self.stations(a.M_0R, a.T_0R, a.P_0R, a.T_t4R, a.pi_cR, a.pi_tR, m_dot=a.m_dot_R)
+        if eta_t is None:
+            tau_t = 1 - design['power_c'] / (self.eta_m * design['power_t'] / (1 - design['tau_t']))
+            eta_t = (1 - tau_t) / (1 - a.pi_tR**((a.gamma_t - 1)/a.gamma_t))
+        self.eta_t = eta_t
+        design = self.stations(a.M_0R, a.T_0R, a.P_0R, a.T_t4R, a.pi_cR, a.pi_tR, m_dot=a.m_dot_R)
+        self.turbine_flow = design['flow_4']
+        self.A_8 = 1.0
+        self.A_8 = design['flow_8'] / mass_flow_parameter(design['M_8'], a.gamma_t, self.R_t)
+
+    def stations(self, M_0, T_0, P_0, T_t4, pi_c, pi_t, m_dot=None):
+        """
+        Walk the stations for given pressure ratios.
+
+        Parameters:
+        - M_0, T_0 (K), P_0 (kPa), T_t4 (K): Flight condition and throttle, arrays or scalars.
+        - pi_c, pi_t: Compressor and turbine total pressure ratios.
+        - m_dot (optional): Air mass flow in kg/s. Defaults to the flow the choked turbine passes.
+
+        Returns:
+        - dict: Station quantities, plus the corrected flows at stations 4 and 8 and the Mach number at the
+          nozzle throat used by the matching residuals.
+        """
+        a = self.analysis
+        gamma_c, gamma_t = a.gamma_c, a.gamma_t
+        c_pc, c_pt = a.c_pc * 1000, a.c_pt * 1000
+
+        # Inlet: ram recovery and diffuser loss
+        tau_r = a.calc_tau_r(gamma_c, M_0)
+        pi_d = a.calc_pi_d(a.pi_d_max, a.calc_eta_r(M_0))
+        T_t2 = T_0 * tau_r
+        P_t2 = DuctModel.calculate_total_pressure_out(P_0 * a.calc_pi_r(tau_r, gamma_c), 1 - pi_d)
+
+        # Compressor
+        h_t2 = c_pc * T_t2
+        h_t3 = CompressorModel.calculate_total_enthalpy_out(h_t2, h_t2 * pi_c**((gamma_c - 1)/gamma_c), a.eta_c)
+        T_t3 = h_t3 / c_pc
+        P_t3 = P_t2 * pi_c
+
+        # Burner: the fuel-air ratio that makes BurnerModel's energy balance reach T_t4
+        LHV = a.h_pR * 1000
+        h_t4 = c_pt * T_t4
+        f = (h_t4 - h_t3) / (a.eta_b * LHV - h_t4)
+        h_t4 = BurnerModel.calculate_total_enthalpy_out(1.0, h_t3, f, LHV, a.eta_b, 1 + f)
+        P_t4 = DuctModel.calculate_total_pressure_out(P_t3, 1 - a.pi_b)
+        if m_dot is None:
+            m_dot = self.turbine_flow * P_t4 * 1000 / ((1 + f) * np.sqrt(T_t4))
+
+        # Turbine
+        h_t5 = TurbineModel.calculate_total_enthalpy_out(h_t4, h_t4 * pi_t**((gamma_t - 1)/gamma_t), self.eta_t)
+        T_t5 = h_t5 / c_pt
+        P_t5 = P_t4 * pi_t
+
+        # Nozzle: convergent, so the exit is either choked or expanded to ambient
+        P_t9 = DuctModel.calculate_total_pressure_out(P_t5, 1 - a.pi_n)
+        critical = (2/(gamma_t + 1))**(gamma_t/(gamma_t - 1))
+        P_9 = np.maximum(P_0, P_t9 * critical)
+        ratio = np.maximum(P_t9 / P_9, 1.0)
+        M_9 = np.sqrt(2/(gamma_t - 1) * (ratio**((gamma_t - 1)/gamma_t) - 1))
+        T_9 = T_t5 / (1 + (gamma_t - 1)/2 * M_9**2)
+        V_9 = M_9 * np.sqrt(gamma_t * self.R_t * T_9)
+        V_0 = M_0 * np.sqrt(gamma_c * self.R_c * T_0)
+        m_9 = m_dot * (1 + f)
+        A_9 = m_9 * np.sqrt(T_t5) / (P_t9 * 1000 * mass_flow_parameter(M_9, gamma_t, self.R_t))
+        thrust = NozzleModel.calculate_thrust_guess(self.C_fg, m_9, V_9, a.g_c) + (P_9 - P_0) * 1000 * A_9 - m_dot * V_0
+
+        return {
+            'pi_c': pi_c, 'tau_c': T_t3 / T_t2, 'pi_t': pi_t, 'tau_t': T_t5 / T_t4, 'f': f, 'm_dot': m_dot,
+            'T_t2': T_t2, 'T_t3': T_t3, 'T_t4': T_t4, 'T_t5': T_t5, 'T_t9': T_t5,
+            'P_t2': P_t2, 'P_t3': P_t3, 'P_t4': P_t4, 'P_t5': P_t5, 'P_t9': P_t9, 'P_9': P_9, 'M_9': M_9,
+            'thrust': thrust, 'S': m_dot * f / thrust,
+            'N': a.n_over_nr(T_0, tau_r, pi_c, gamma_t, a.T_0R, a.tau_rR, a.pi_cR) * a.N_R,
+            'power_c': m_dot * (h_t3 - h_t2), 'power_t': m_9 * (h_t4 - h_t5),
+            'flow_4': m_9 * np.sqrt(T_t4) / (P_t4 * 1000),
+            'flow_8': m_9 * np.sqrt(T_t5) / (P_t9 * 1000), 'M_8': np.minimum(M_9, 1.0),
+        }
+
+    def residuals(self, x, M_0, T_0, P_0, T_t4):
+        """
+        Normalized matching residuals at x = (log pi_c, log pi_t), shape (2, n).
+        """
+        s = self.stations(M_0, T_0, P_0, T_t4, np.exp(x[0]), np.exp(x[1]))
+        N = np.maximum(s['N'], 1e-6)
+        omega = ShaftModel.calculate_angular_velocity(N)
+        # Net shaft torque, expressed as a fraction of the compressor torque
+        alpha = ShaftModel.calculate_angular_acceleration(-s['power_c']/omega, self.eta_m*s['power_t']/omega, 0.0, 1.0)
+        balance = alpha * 2*np.pi / (s['power_c']/omega)
+        nozzle = s['flow_8'] / (self.A_8 * mass_flow_parameter(s['M_8'], self.analysis.gamma_t, self.R_t)) - 1
+        return np.stack([balance, nozzle])
+
+    def match(self, T_t4=None, M_0=None, T_0=None, P_0=None, altitude=None, tol=1e-10, max_iter=50):
+        """
+        Find the matched operating point for a batch of flight conditions.
+
+        Parameters:
+        - T_t4, M_0, T_0, P_0 (float or array, optional): Broadcast against each other; missing values come
+          from the analysis object.
+        - altitude (float or array, optional): Altitude in km, supplying T_0 and P_0 from the atmosphere.
+        - tol (float): Convergence tolerance on the largest normalized residual.
+        - max_iter (int): Newton iteration limit.
+
+        Returns:
+        - MatchResult: Per-point convergence and the matched station quantities.
+        """
+        a = self.analysis
+        if altitude is not None:
+            if T_0 is not None or P_0 is not None:
+                raise ValueError("Give either altitude or T_0/P_0, not both")
+            _, _, T_0, P_0, _, _ = standard_atmosphere(np.asarray(altitude, dtype=float))
+        inputs = [np.asarray(a_ if v is None else v, dtype=float)
+                  for v, a_ in ((M_0, a.M_0), (T_0, a.T_0), (P_0, a.P_0), (T_t4, a.T_t4))]
+        shape = np.broadcast_shapes(*(v.shape for v in inputs))
+        n = int(np.prod(shape))
+        M_0, T_0, P_0, T_t4 = (np.broadcast_to(v, shape).reshape(n) for v in inputs)
+
+        # Start from the reference design; its match is usually close in log space
+        x = np.empty((2, n))
+        x[0] = np.log(a.pi_cR)
+        x[1] = np.log(a.pi_tR)
+        iterations = np.zeros(n, dtype=int)
+        converged = np.zeros(n, dtype=bool)
+        residual = np.full(n, np.inf)
+        active = np.arange(n)
+        h = 1e-7
+        with np.errstate(all='ignore'):
+            for _ in range(max_iter):
+                if active.size == 0:
+                    break
+                condition = (M_0[active], T_0[active], P_0[active], T_t4[active])
+                xa = x[:, active]
+                # Base point and both forward-difference perturbations in one batched evaluation
+                trial = np.concatenate([xa, xa + [[h], [0]], xa + [[0], [h]]], axis=1)
+                r = self.residuals(trial, *(np.tile(c, 3) for c in condition))
+                m = active.size
+                r0, r1, r2 = r[:, :m], r[:, m:2*m], r[:, 2*m:]
+                size = np.max(np.abs(r0), axis=0)
+                residual[active] = size
+                done = size <= tol
+                converged[active[done]] = True
+
+                J11, J21 = (r1 - r0) / h
+                J12, J22 = (r2 - r0) / h
+                det = J11*J22 - J12*J21
+                dx0 = -( J22*r0[0] - J12*r0[1]) / det
+                dx1 = -(-J21*r0[0] + J11*r0[1]) / det
+                step = np.maximum(np.maximum(np.abs(dx0), np.abs(dx1)) / self.max_step, 1.0)
+                bad = ~np.isfinite(step)
+                step_ok = ~done & ~bad
+                x[0, active[step_ok]] += dx0[step_ok] / step[step_ok]
+                x[1, active[step_ok]] += dx1[step_ok] / step[step_ok]
+                iterations[active[~done]] += 1
+                active = active[step_ok]
+
+            stations = self.stations(M_0, T_0, P_0, T_t4, np.exp(x[0]), np.exp(x[1]))
+        stations = {name: np.broadcast_to(value, (n,)).reshape(shape) for name, value in stations.items()
+                    if name not in ('flow_4', 'flow_8', 'M_8')}
+        return MatchResult(converged.reshape(shape), iterations.reshape(shape), residual.reshape(shape), stations)
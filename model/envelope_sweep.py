@@ -0,0 +1,302 @@
+# envelope_sweep.py
+import queue
+import threading
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.atmosphere import atmosphere_table
+
+
+class SweepResult:
+    """
+    Labeled N-dimensional result of an EnvelopeSweep.
+
+    Every output array has one axis per swept variable, in the order given by `dims`.
+    """
+
+    def __init__(self, dims, coords, outputs, fixed=None):
+        """
+        Parameters:
+        - dims (tuple): Names of the swept variables, one per array axis.
+        - coords (dict): 1-D grid values for each name in dims.
+        - outputs (dict): Output name -> N-d array of shape (len(coords[d]) for d in dims).
+        - fixed (dict, optional): Inputs that were held constant during the sweep.
+        """
+        self.dims = tuple(dims)
+        self.coords = coords
+        self.outputs = outputs
+        self.fixed = fixed or {}
+
+    @property
+    def shape(self):
+        return tuple(len(self.coords[d]) for d in self.dims)
+
+    def __getitem__(self, name):
+        return self.outputs[name]
+
+    def __contains__(self, name):
+        return name in self.outputs
+
+    def sel(self, **values):
+        """
+        Select the grid point nearest to the given value along one or more axes.
+
+        Parameters:
+        - **values: Swept variable name -> value, e.g. sel(altitude=10, P9rat=0.955).
+
+        Returns:
+        - SweepResult: Result with the selected axes dropped (they move to `fixed`).
+        """
+        index = [slice(None)] * len(self.dims)
+        fixed = dict(self.fixed)
+        for name, value in values.items():
+            axis = self.dims.index(name)
+            i = int(np.argmin(np.abs(self.coords[name] - value)))
+            index[axis] = i
+            fixed[name] = float(self.coords[name][i])
+        dims = tuple(d for d in self.dims if d not in values)
+        coords = {d: self.coords[d] for d in dims}
+        outputs = {name: array[tuple(index)] for name, array in self.outputs.items()}
+        return SweepResult(dims, coords, outputs, fixed)
+
+
+class SweepChunk:
+    """
+    One chunk of a streamed sweep, backed by a buffer that EnvelopeSweep.stream reuses.
+
+    Attributes:
+    - start, stop (int): Flat grid positions covered by this chunk.
+    - inputs (dict): Swept variable name -> its value at each point of the chunk.
+    - outputs (dict): Output name -> values at each point of the chunk.
+    """
+
+    def __init__(self, dims, outputs, size):
+        self.start = self.stop = 0
+        self._inputs = {name: np.empty(size) for name in dims}
+        self._outputs = {name: np.empty(size) for name in outputs}
+
+    def __len__(self):
+        return self.stop - self.start
+
+    @property
+    def inputs(self):
+        return {name: values[:len(self)] for name, values in self._inputs.items()}
+
+    @property
+    def outputs(self):
+        return {name: values[:len(self)] for name, values in self._outputs.items()}
+
+    def __getitem__(self, name):
+        values = self._outputs[name] if name in self._outputs else self._inputs[name]
+        return values[:len(self)]
+
+    def copy(self):
+        """
+        Returns:
+        - dict: Name -> independent copy of every input and output of this chunk.
+        """
+        return {name: values[:len(self)].copy() for name, values in {**self._inputs, **self._outputs}.items()}
+
+
+class EnvelopeSweep:
+    """
+    Evaluates GeneralAnalysis.calculateCycle over a Cartesian grid of operating conditions.
+
+    The grid is walked in flat chunks of at most `chunk_size` points, so only the output arrays are
+    allocated at full size; the station intermediates only ever exist for one chunk at a time.
+    """
+
+    # Variables that may be swept, in the axis order of the result
+    AXES = ('M_0', 'altitude', 'T_t4', 'P9rat')
+
+    def __init__(self, analysis=None, outputs=('thrust', 'tsfc'), chunk_size=262144, atmosphere=None):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Provides the design constants and the default inputs.
+        - outputs (tuple): Names of the CycleResult fields to keep.
+        - chunk_size (int): Maximum number of grid points evaluated at once.
+        - atmosphere (callable, optional): Altitude (km) -> standard_atmosphere() layout. Defaults to the shared
+          AtmosphereTable lookup; pass standard_atmosphere to evaluate the model exactly.
+        """
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        self.atmosphere = atmosphere if atmosphere is not None else atmosphere_table().lookup
+        self.outputs = tuple(outputs)
+        self.chunk_size = int(chunk_size)
+        if self.chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+    def ambient(self, altitude):
+        """
+        Map altitudes to ambient temperature and pressure through the atmosphere model.
+
+        Parameters:
+        - altitude (array): Geometric altitudes in km.
+
+        Returns:
+        - tuple: (T_0 in K, P_0 in kPa) arrays of the same shape.
+        """
+        _, _, T_0, P_0, _, _ = self.atmosphere(altitude)
+        return T_0, P_0
+
+    def grid(self, M_0=None, altitude=None, T_t4=None, P9rat=None, T_0=None, P_0=None):
+        """
+        Resolve sweep arguments into axes and fixed inputs (see run() for their meaning).
+
+        Returns:
+        - tuple: (dims, coords, fixed) as used by SweepResult.
+        """
+        if altitude is not None and (T_0 is not None or P_0 is not None):
+            raise ValueError("Give either altitude or T_0/P_0, not both")
+
+        given = {'M_0': M_0, 'altitude': altitude, 'T_t4': T_t4, 'P9rat': P9rat}
+        dims = tuple(name for name in self.AXES if given[name] is not None and np.ndim(given[name]) > 0)
+        coords = {name: np.asarray(given[name], dtype=float).ravel() for name in dims}
+        fixed = {name: float(value) for name, value in given.items() if value is not None and name not in dims}
+        if T_0 is not None:
+            fixed['T_0'] = float(T_0)
+        if P_0 is not None:
+            fixed['P_0'] = float(P_0)
+        return dims, coords, fixed
+
+    def _points(self, dims, coords, fixed):
+        # Returns a function mapping a flat range of grid points to calculateCycle keyword arguments
+        # Atmosphere is only needed once per altitude grid value, not once per point
+        fixed = dict(fixed)
+        if 'altitude' in coords:
+            T_alt, P_alt = self.ambient(coords['altitude'])
+        elif 'altitude' in fixed:
+            T_fix, P_fix = self.ambient(fixed['altitude'])
+            fixed['T_0'], fixed['P_0'] = float(T_fix), float(P_fix)
+        shape = tuple(len(coords[name]) for name in dims)
+
+        def points(start, stop):
+            index = np.unravel_index(np.arange(start, stop), shape) if dims else ()
+            point = {name: fixed[name] for name in ('M_0', 'T_t4', 'P9rat', 'T_0', 'P_0') if name in fixed}
+            for axis, name in enumerate(dims):
+                if name == 'altitude':
+                    point['T_0'] = T_alt[index[axis]]
+                    point['P_0'] = P_alt[index[axis]]
+                else:
+                    point[name] = coords[name][index[axis]]
+            return index, point
+
+        return points
+
+    def run(self, M_0=None, altitude=None, T_t4=None, P9rat=None, T_0=None, P_0=None, out=None):
+        """
+        Sweep the cycle over every combination of the given grid values.
+
+        Each of M_0, altitude, T_t4 and P9rat may be a 1-D sequence (which becomes an axis of the result),
+        a scalar (held fixed) or None (the analysis object's value is used). Altitude, in km, replaces
+        T_0 and P_0 with the atmosphere at that height, so it cannot be combined with them.
+
+        Parameters:
+        - out (dict, optional): Preallocated arrays (e.g. np.memmap) to write each output into.
+
+        Returns:
+        - SweepResult: One array per requested output with one axis per swept variable.
+        """
+        dims, coords, fixed = self.grid(M_0, altitude, T_t4, P9rat, T_0, P_0)
+        points = self._points(dims, coords, fixed)
+        if 'altitude' in fixed:
+            fixed['T_0'], fixed['P_0'] = (float(v) for v in self.ambient(fixed['altitude']))
+
+        shape = tuple(len(coords[name]) for name in dims)
+        total = int(np.prod(shape))
+        if out is None:
+            out = {name: np.empty(shape) for name in self.outputs}
+        flat = {name: out[name].reshape(-1) for name in self.outputs}
+
+        for start in range(0, total, self.chunk_size):
+            stop = min(start + self.chunk_size, total)
+            _, point = points(start, stop)
+            result = self.analysis.calculateCycle(**point)
+            for name in self.outputs:
+                flat[name][start:stop] = result[name]
+
+        return SweepResult(dims, coords, out, fixed)
+
+    def stream(self, M_0=None, altitude=None, T_t4=None, P9rat=None, T_0=None, P_0=None, buffers=1, cancel=None):
+        """
+        Evaluate the sweep chunk by chunk and yield each chunk as soon as it is computed.
+
+        Chunks are written into a fixed ring of `buffers` preallocated chunk buffers, which are reused for the
+        whole sweep. A yielded chunk is therefore only valid until the next one is requested; copy it to keep
+        it. With buffers=1 evaluation happens in the consumer's thread, one chunk per request. With more
+        buffers a background thread computes ahead while the consumer works (e.g. writes a file), and blocks
+        once every buffer is waiting to be consumed, so a slow consumer bounds memory use to `buffers` chunks.
+
+        Parameters:
+        - M_0, altitude, T_t4, P9rat, T_0, P_0: As for run().
+        - buffers (int): Number of chunk buffers; evaluation runs at most buffers - 1 chunks ahead.
+        - cancel (threading.Event, optional): When set, the stream stops after the current chunk.
+
+        Yields:
+        - SweepChunk: Flat inputs and outputs for grid points start to stop (in C order over dims).
+        """
+        if buffers < 1:
+            raise ValueError("buffers must be at least 1")
+        dims, coords, fixed = self.grid(M_0, altitude, T_t4, P9rat, T_0, P_0)
+        points = self._points(dims, coords, fixed)
+        shape = tuple(len(coords[name]) for name in dims)
+        total = int(np.prod(shape))
+        if total == 0:
+            return
+        size = min(self.chunk_size, total)
+        ring = [SweepChunk(dims, self.outputs, size) for _ in range(buffers)]
+
+        def fill(chunk, start):
+            stop = min(start + size, total)
+            index, point = points(start, stop)
+            result = self.analysis.calculateCycle(**point)
+            chunk.start, chunk.stop = start, stop
+            n = stop - start
+            for axis, name in enumerate(dims):
+                np.take(coords[name], index[axis], out=chunk._inputs[name][:n])
+            for name in self.outputs:
+                chunk._outputs[name][:n] = result[name]
+            return chunk
+
+        if buffers == 1:
+            for start in range(0, total, size):
+                if cancel is not None and cancel.is_set():
+                    return
+                yield fill(ring[0], start)
+            return
+
+        free = queue.Queue()
+        ready = queue.Queue()
+        stopped = threading.Event()
+        for chunk in ring:
+            free.put(chunk)
+
+        def produce():
+            try:
+                for start in range(0, total, size):
+                    chunk = free.get()
+                    if stopped.is_set() or (cancel is not None and cancel.is_set()):
+                        break
+                    ready.put(fill(chunk, start))
+            except BaseException as error:
+                ready.put(error)
+                return
+            ready.put(None)
+
+        worker = threading.Thread(target=produce, daemon=True)
+        worker.start()
+        previous = None
+        try:
+            while True:
+                item = ready.get()
+                if previous is not None:
+                    free.put(previous)  # the consumer is done with the chunk it was last given
+                    previous = None
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                previous = item
+                yield item
+        finally:
+            stopped.set()
+            free.put(None)  # wake the producer if it is waiting for a buffer
+            worker.join()
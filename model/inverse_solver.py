@@ -0,0 +1,170 @@
+# inverse_solver.py
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.atmosphere import standard_atmosphere
+
+
+class InverseResult:
+    """
+    Outcome of an InverseSolver run, one entry per flight condition.
+
+    Attributes:
+    - value (array): Solved input (T_t4 in K or P9rat), NaN where the target cannot be reached.
+    - achieved (array): Output at the solved value, NaN where unreachable.
+    - converged (array of bool): The root satisfies the tolerances.
+    - reachable (array of bool): The target lies within the output range found over the bounds.
+    - output_min, output_max (array): Smallest and largest output seen while bracketing, to show how far
+      off an unreachable target is.
+    - iterations (array of int): Root finder iterations spent on each point.
+    """
+
+    def __init__(self, variable, target, value, achieved, converged, reachable, output_min, output_max, iterations):
+        self.variable = variable
+        self.target = target
+        self.value = value
+        self.achieved = achieved
+        self.converged = converged
+        self.reachable = reachable
+        self.output_min = output_min
+        self.output_max = output_max
+        self.iterations = iterations
+
+    @property
+    def unreachable(self):
+        """
+        Returns:
+        - tuple: Indices of the flight conditions whose target cannot be reached (as from np.nonzero).
+        """
+        return np.nonzero(~self.reachable)
+
+
+class InverseSolver:
+    """
+    Finds the T_t4 (or P9rat) that produces a target thrust for many flight conditions at once.
+
+    Every point is bracketed by scanning the bounds on a coarse grid and keeping the first interval over which
+    the output crosses the target. The brackets are then narrowed together with the Illinois variant of
+    false position, falling back to bisection whenever it stalls. Each iteration evaluates calculateCycle only
+    for the points that have not converged yet.
+    """
+
+    # Default search interval for each variable that can be solved for
+    BOUNDS = {'T_t4': (800.0, 2600.0), 'P9rat': (0.5, 3.0)}
+
+    def __init__(self, analysis=None, variable='T_t4', output='thrust', bounds=None, scan=16, xtol=1e-6,
+                 rtol=1e-9, max_iter=100):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Provides the design constants and default inputs.
+        - variable (str): Input to solve for, 'T_t4' or 'P9rat'.
+        - output (str): CycleResult field to match, thrust by default.
+        - bounds (tuple, optional): (low, high) search interval, scalars or per-point arrays.
+        - scan (int): Grid intervals used to bracket the root, so outputs that are not monotonic in the
+          variable still find the lowest-valued crossing.
+        - xtol (float): Absolute tolerance on the variable.
+        - rtol (float): Relative tolerance on the output.
+        - max_iter (int): Iteration limit of the root finder.
+        """
+        if variable not in self.BOUNDS:
+            raise ValueError(f"Can only solve for {', '.join(self.BOUNDS)}")
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        self.variable = variable
+        self.output = output
+        self.bounds = bounds if bounds is not None else self.BOUNDS[variable]
+        self.scan = int(scan)
+        self.xtol = xtol
+        self.rtol = rtol
+        self.max_iter = int(max_iter)
+
+    def residual(self, x, target, inputs):
+        # Output minus target; NaN where the cycle is not defined at x
+        with np.errstate(all='ignore'):
+            result = self.analysis.calculateCycle(**inputs, **{self.variable: x})
+        return np.broadcast_to(result[self.output], np.shape(x)) - target
+
+    def solve(self, target, M_0=None, T_0=None, P_0=None, altitude=None, T_t4=None, P9rat=None):
+        """
+        Solve for the variable at every flight condition.
+
+        Parameters:
+        - target (float or array): Target output (thrust in N), per point if an array.
+        - M_0, T_0, P_0, T_t4, P9rat (float or array, optional): Flight condition and the input not being
+          solved for; they are broadcast against target. Missing values come from the analysis object.
+        - altitude (float or array, optional): Altitude in km, supplying T_0 and P_0 from the atmosphere.
+
+        Returns:
+        - InverseResult: Solved values with convergence and reachability masks.
+        """
+        if altitude is not None:
+            if T_0 is not None or P_0 is not None:
+                raise ValueError("Give either altitude or T_0/P_0, not both")
+            _, _, T_0, P_0, _, _ = standard_atmosphere(np.asarray(altitude, dtype=float))
+        given = {'M_0': M_0, 'T_0': T_0, 'P_0': P_0, 'T_t4': T_t4, 'P9rat': P9rat}
+        given.pop(self.variable)
+        a = self.analysis
+        given = {name: np.asarray(getattr(a, name) if value is None else value, dtype=float) for name, value in given.items()}
+        low, high = (np.asarray(b, dtype=float) for b in self.bounds)
+        target = np.asarray(target, dtype=float)
+        shape = np.broadcast_shapes(target.shape, low.shape, high.shape, *(v.shape for v in given.values()))
+        n = int(np.prod(shape))
+        flat = {name: np.broadcast_to(v, shape).reshape(n) for name, v in given.items()}
+        target = np.broadcast_to(target, shape).reshape(n)
+        low = np.broadcast_to(low, shape).reshape(n)
+        high = np.broadcast_to(high, shape).reshape(n)
+
+        # Bracket: evaluate a coarse grid for every point and take the first sign change
+        fraction = np.linspace(0.0, 1.0, self.scan + 1)[:, None]
+        grid = low + fraction * (high - low)
+        values = self.residual(grid, target, flat)
+        valid = ~np.isnan(values)
+        output_min = np.where(valid, values, np.inf).min(axis=0) + target
+        output_max = np.where(valid, values, -np.inf).max(axis=0) + target
+        crossing = (values[:-1] * values[1:] <= 0) & valid[:-1] & valid[1:]
+        reachable = crossing.any(axis=0)
+        first = np.argmax(crossing, axis=0)
+        columns = np.arange(n)
+        x0, x1 = grid[first, columns], grid[first + 1, columns]
+        f0, f1 = values[first, columns], values[first + 1, columns]
+
+        x = np.full(n, np.nan)
+        iterations = np.zeros(n, dtype=int)
+        converged = np.zeros(n, dtype=bool)
+        exact = reachable & ((f0 == 0) | (f1 == 0))
+        x[exact] = np.where(f0[exact] == 0, x0[exact], x1[exact])
+        converged[exact] = True
+
+        active = np.nonzero(reachable & ~exact)[0]
+        side = np.zeros(n, dtype=int)  # which end was kept last time, for the Illinois update
+        for _ in range(self.max_iter):
+            if active.size == 0:
+                break
+            a0, a1, g0, g1 = x0[active], x1[active], f0[active], f1[active]
+            # False position, unless it would fall outside the bracket (then bisect)
+            with np.errstate(all='ignore'):
+                trial = a1 - g1 * (a1 - a0) / (g1 - g0)
+            inside = np.isfinite(trial) & (trial > np.minimum(a0, a1)) & (trial < np.maximum(a0, a1))
+            trial = np.where(inside, trial, 0.5 * (a0 + a1))
+            g = self.residual(trial, target[active], {name: v[active] for name, v in flat.items()})
+            iterations[active] += 1
+
+            # A NaN inside the bracket is treated like the end it replaces, so bisection moves past it
+            keep_low = np.where(np.isnan(g), True, np.sign(g) == np.sign(g0))
+            stalled_low = keep_low & (side[active] == 1)
+            stalled_high = ~keep_low & (side[active] == -1)
+            x0[active] = np.where(keep_low, trial, a0)
+            f0[active] = np.where(keep_low, np.where(np.isnan(g), g0, g), np.where(stalled_high, g0 / 2, g0))
+            x1[active] = np.where(keep_low, a1, trial)
+            f1[active] = np.where(keep_low, np.where(stalled_low, g1 / 2, g1), g)
+            side[active] = np.where(keep_low, 1, -1)
+
+            done = (np.abs(x1[active] - x0[active]) <= self.xtol) | (np.abs(g) <= self.rtol * np.abs(target[active]))
+            done &= ~np.isnan(g)
+            x[active] = trial
+            converged[active[done]] = True
+            active = active[~done]
+
+        achieved = np.where(reachable, self.residual(np.where(reachable, x, low), target, flat) + target, np.nan)
+        x[~reachable] = np.nan
+        return InverseResult(self.variable, target.reshape(shape), x.reshape(shape), achieved.reshape(shape),
+                             converged.reshape(shape), reachable.reshape(shape), output_min.reshape(shape),
+                             output_max.reshape(shape), iterations.reshape(shape))
@@ -0,0 +1,110 @@
+# mission.py
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.atmosphere import atmosphere_table
+from model.inverse_solver import InverseSolver
+
+
+# Standard gravity in m/s^2, for turning burned fuel mass into weight
+G_0 = 9.80665
+
+
+class MissionResult:
+    """
+    Fuel burn of one or many mission profiles.
+
+    Per-knot arrays have the shape of the profile inputs, (n_knots,) or (n_profiles, n_knots); per-profile
+    values drop the last axis.
+
+    Attributes:
+    - t (array): Knot times in seconds.
+    - T_0, P_0 (array): Ambient temperature (K) and pressure (kPa) from the standard atmosphere.
+    - T_t4 (array): Turbine inlet temperature required for the thrust demand (NaN where unreachable).
+    - S (array): Fuel consumption per unit thrust in kg/s/N.
+    - fuel_flow (array): Fuel mass flow of all engines in kg/s.
+    - fuel_used (array): Fuel burned since the first knot in kg.
+    - fuel (array): Total fuel burned per profile in kg.
+    - weight_change (array): Weight lost per profile in N.
+    - idle (array of bool): The demand is below the engine's minimum thrust, so the knot runs at flight idle
+      (the lowest T_t4) and produces more thrust than asked for.
+    - reachable (array of bool): The thrust demand can be met at the knot (counting idle knots).
+    - feasible (array of bool): Every knot of the profile is reachable.
+    """
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+class Mission:
+    """
+    Integrates fuel burn along time-indexed altitude, Mach and thrust-demand profiles.
+
+    All knots of all profiles are handled together: the atmosphere is evaluated once for the whole batch, the
+    T_t4 that meets each thrust demand comes from one InverseSolver call, and fuel flow and the trapezoidal
+    time integration are array operations. Knots asking for more thrust than the engine gives at the
+    highest T_t4 are reported instead of clipped, and make their profile infeasible.
+    """
+
+    def __init__(self, analysis=None, engines=1, T_t4_bounds=None, solver=None, idle=True, atmosphere=None):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Engine design constants and defaults.
+        - engines (int): Number of engines sharing the thrust demand.
+        - T_t4_bounds (tuple, optional): (low, high) T_t4 range in K the engine may use.
+        - solver (InverseSolver, optional): Solver for the required T_t4. Built from analysis if omitted;
+          thrust rises monotonically with T_t4, so a coarse bracketing scan is enough.
+        - idle (bool): Run knots whose demand is below the minimum thrust at the lowest T_t4 (e.g. descent)
+          instead of marking them unreachable.
+        - atmosphere (callable, optional): Altitude (km) -> standard_atmosphere() layout. Defaults to the shared
+          AtmosphereTable lookup.
+        """
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        self.engines = engines
+        self.solver = solver if solver is not None else \
+            InverseSolver(self.analysis, variable='T_t4', output='thrust', bounds=T_t4_bounds, scan=2)
+        self.idle = idle
+        self.atmosphere = atmosphere if atmosphere is not None else atmosphere_table().lookup
+
+    def run(self, t, altitude, M_0, thrust, P9rat=None):
+        """
+        Evaluate a batch of profiles.
+
+        Parameters:
+        - t (array): Knot times in seconds, increasing along the last axis.
+        - altitude (array): Geometric altitude at each knot in km.
+        - M_0 (array): Flight Mach number at each knot.
+        - thrust (array): Total thrust demand at each knot in N.
+        - P9rat (float or array, optional): Nozzle pressure ratio, the analysis default if omitted.
+
+        All inputs broadcast against each other; a leading axis makes a batch of profiles.
+
+        Returns:
+        - MissionResult: Per-knot engine state and per-profile fuel totals.
+        """
+        t, altitude, M_0, thrust = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (t, altitude, M_0, thrust)))
+        if t.ndim == 0 or t.shape[-1] < 2:
+            raise ValueError("A profile needs at least two knots")
+        dt = np.diff(t, axis=-1)
+        if np.any(dt <= 0):
+            raise ValueError("Knot times must be strictly increasing")
+
+        _, _, T_0, P_0, _, _ = self.atmosphere(altitude)
+        demand = thrust / self.engines
+        solved = self.solver.solve(demand, M_0=M_0, T_0=T_0, P_0=P_0, P9rat=P9rat)
+        T_t4 = solved.value
+        idle = ~solved.reachable & (demand < solved.output_min) & self.idle
+        reachable = solved.reachable | idle
+        T_t4 = np.where(idle, np.broadcast_to(np.asarray(self.solver.bounds[0], dtype=float), t.shape), T_t4)
+        with np.errstate(all='ignore'):
+            cycle = self.analysis.calculateCycle(M_0=M_0, T_0=T_0, P_0=P_0, T_t4=T_t4, P9rat=P9rat)
+        S = np.broadcast_to(cycle.S, t.shape)
+        # Fuel flow follows from the demand itself, so the solver tolerance does not leak into it
+        produced = np.where(idle, np.broadcast_to(cycle.thrust, t.shape), demand)
+        fuel_flow = np.where(reachable, S * produced * self.engines, np.nan)
+
+        burned = 0.5 * (fuel_flow[..., 1:] + fuel_flow[..., :-1]) * dt
+        fuel_used = np.concatenate([np.zeros(t.shape[:-1] + (1,)), np.cumsum(burned, axis=-1)], axis=-1)
+        fuel = fuel_used[..., -1]
+        return MissionResult(t=t, T_0=T_0, P_0=P_0, T_t4=T_t4, S=S, fuel_flow=fuel_flow, fuel_used=fuel_used,
+                             fuel=fuel, weight_change=fuel * G_0, idle=idle, reachable=reachable,
+                             feasible=reachable.all(axis=-1))
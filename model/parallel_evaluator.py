@@ -0,0 +1,116 @@
+# parallel_evaluator.py
+import os
+import numpy as np
+from multiprocessing import get_context, shared_memory
+from utils.general_analysis import GeneralAnalysis
+
+# Per-process state set up once by _init_worker, so tasks only carry (start, stop)
+_worker = {}
+
+
+def _init_worker(analysis, input_names, fixed, output_names, in_name, out_name, size):
+    in_shm = shared_memory.SharedMemory(name=in_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    _worker['analysis'] = analysis
+    _worker['input_names'] = input_names
+    _worker['fixed'] = fixed
+    _worker['output_names'] = output_names
+    _worker['shm'] = (in_shm, out_shm)
+    _worker['inputs'] = np.ndarray((len(input_names), size), dtype=np.float64, buffer=in_shm.buf)
+    _worker['outputs'] = np.ndarray((len(output_names), size), dtype=np.float64, buffer=out_shm.buf)
+
+
+def _evaluate_chunk(start, stop, analysis, input_names, fixed, output_names, inputs, outputs):
+    point = dict(fixed)
+    for row, name in enumerate(input_names):
+        point[name] = inputs[row, start:stop]
+    result = analysis.calculateCycle(**point)
+    for row, name in enumerate(output_names):
+        outputs[row, start:stop] = result[name]
+
+
+def _run_task(bounds):
+    start, stop = bounds
+    _evaluate_chunk(start, stop, _worker['analysis'], _worker['input_names'], _worker['fixed'],
+                    _worker['output_names'], _worker['inputs'], _worker['outputs'])
+    return stop - start
+
+
+class ParallelCycleEvaluator:
+    """
+    Evaluates GeneralAnalysis.calculateCycle for a large batch of operating points on a process pool.
+
+    Inputs and outputs live in shared memory: workers read their slice of the batch and write results
+    straight into the output buffer, so only (start, stop) pairs cross process boundaries. The batch is
+    always split at the same chunk boundaries, so results do not depend on the number of workers.
+    """
+
+    INPUTS = ('M_0', 'T_0', 'P_0', 'T_t4', 'P9rat')
+
+    def __init__(self, analysis=None, outputs=('thrust', 'tsfc'), workers=None, chunk_size=65536, start_method=None):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Provides the design constants and the default inputs.
+        - outputs (tuple): Names of the CycleResult fields to return.
+        - workers (int, optional): Number of worker processes. Defaults to os.cpu_count().
+        - chunk_size (int): Number of points per task.
+        - start_method (str, optional): multiprocessing start method ('fork', 'spawn', ...).
+        """
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        self.outputs = tuple(outputs)
+        self.workers = int(workers) if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = int(chunk_size)
+        self.start_method = start_method
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        if self.chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+    def evaluate(self, M_0=None, T_0=None, P_0=None, T_t4=None, P9rat=None):
+        """
+        Evaluate a batch of operating points.
+
+        Array inputs are broadcast against each other and flattened into the batch; scalar inputs are
+        held fixed and inputs left as None fall back to the analysis object's values.
+
+        Returns:
+        - dict: Output name -> array with the broadcast shape of the array inputs.
+        """
+        given = {'M_0': M_0, 'T_0': T_0, 'P_0': P_0, 'T_t4': T_t4, 'P9rat': P9rat}
+        input_names = tuple(name for name in self.INPUTS if given[name] is not None and np.ndim(given[name]) > 0)
+        fixed = {name: float(given[name]) for name in self.INPUTS if given[name] is not None and name not in input_names}
+        arrays = np.broadcast_arrays(*(np.asarray(given[name], dtype=np.float64) for name in input_names))
+        shape = arrays[0].shape if arrays else ()
+        size = int(np.prod(shape))
+        tasks = [(start, min(start + self.chunk_size, size)) for start in range(0, size, self.chunk_size)]
+
+        if self.workers == 1 or len(tasks) <= 1:
+            inputs = np.array([a.ravel() for a in arrays]).reshape(len(input_names), size)
+            outputs = np.empty((len(self.outputs), size))
+            for start, stop in tasks:
+                _evaluate_chunk(start, stop, self.analysis, input_names, fixed, self.outputs, inputs, outputs)
+            return {name: outputs[row].reshape(shape) for row, name in enumerate(self.outputs)}
+
+        # SharedMemory refuses zero-sized blocks, hence the max(..., 1)
+        in_shm = shared_memory.SharedMemory(create=True, size=max(len(input_names) * size * 8, 1))
+        out_shm = shared_memory.SharedMemory(create=True, size=max(len(self.outputs) * size * 8, 1))
+        try:
+            inputs = np.ndarray((len(input_names), size), dtype=np.float64, buffer=in_shm.buf)
+            for row, array in enumerate(arrays):
+                inputs[row] = array.ravel()
+            shared_out = np.ndarray((len(self.outputs), size), dtype=np.float64, buffer=out_shm.buf)
+
+            context = get_context(self.start_method)
+            initargs = (self.analysis, input_names, fixed, self.outputs, in_shm.name, out_shm.name, size)
+            with context.Pool(min(self.workers, len(tasks)), _init_worker, initargs) as pool:
+                for _ in pool.imap_unordered(_run_task, tasks):
+                    pass
+
+            results = {name: shared_out[row].reshape(shape).copy() for row, name in enumerate(self.outputs)}
+            del inputs, shared_out
+        finally:
+            in_shm.close()
+            in_shm.unlink()
+            out_shm.close()
+            out_shm.unlink()
+        return results
@@ -0,0 +1,164 @@
+# result_cache.py
+import hashlib
+import json
+import os
+import threading
+import zipfile
+import zlib
+from collections import OrderedDict
+import numpy as np
+
+# Bump when the cached arrays' meaning changes, so old disk entries are never read back
+CACHE_VERSION = 1
+
+
+def _normalize(value):
+    # Floats are keyed by their exact repr so 1, 1.0 and -0.0/0.0 map to the same key
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool):
+        value = float(value)
+        return repr(value + 0.0)
+    return value
+
+
+class ResultCache:
+    """
+    Cache of sweep results with an in-memory LRU tier and an optional on-disk tier.
+
+    Entries are keyed on the normalized model inputs together with every design constant of the
+    GeneralAnalysis that produced them, so changing any constant can never return a stale result.
+    The memory tier evicts least recently used entries once their arrays exceed max_bytes; the disk tier
+    stores one .npz file per entry and survives restarts.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, disk_dir=None):
+        """
+        Parameters:
+        - max_bytes (int): Memory budget for cached arrays, in bytes.
+        - disk_dir (str, optional): Directory for the persistent tier. Created if it does not exist.
+        """
+        self.max_bytes = int(max_bytes)
+        self.disk_dir = disk_dir
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(inputs, constants):
+        """
+        Build the cache key for a set of model inputs and design constants.
+
+        Parameters:
+        - inputs (dict): Model input parameters, e.g. M_0, M_1, T_0, P_0, T_t4, P9rat, num_points.
+        - constants (dict): GeneralAnalysis.designConstants() of the analysis used.
+
+        Returns:
+        - str: Hex digest identifying the entry.
+        """
+        payload = {
+            'version': CACHE_VERSION,
+            'inputs': {name: _normalize(value) for name, value in inputs.items()},
+            'constants': {name: _normalize(value) for name, value in constants.items()},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Look up an entry, promoting disk hits into memory.
+
+        Returns:
+        - tuple or None: The cached arrays, or None on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        arrays = self._load(key)
+        with self._lock:
+            if arrays is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._insert(key, arrays)
+        return arrays
+
+    def put(self, key, arrays):
+        """
+        Store a tuple of arrays under key in memory and, if configured, on disk.
+        """
+        arrays = tuple(np.array(a, copy=True) for a in arrays)
+        for a in arrays:
+            a.setflags(write=False)
+        with self._lock:
+            self._insert(key, arrays)
+        if self.disk_dir is not None:
+            path = self._path(key)
+            temporary = path + '.tmp.npz'
+            np.savez(temporary, *arrays)
+            os.replace(temporary, path)
+
+    def _insert(self, key, arrays):
+        if key in self._entries:
+            self.bytes -= sum(a.nbytes for a in self._entries.pop(key))
+        self._entries[key] = arrays
+        self.bytes += sum(a.nbytes for a in arrays)
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= sum(a.nbytes for a in evicted)
+            self.evictions += 1
+        if self.bytes > self.max_bytes:
+            # A single entry larger than the whole budget is only kept on disk
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= sum(a.nbytes for a in evicted)
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key + '.npz')
+
+    def _load(self, key):
+        if self.disk_dir is None or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                arrays = tuple(data[f'arr_{i}'] for i in range(len(data.files)))
+        except (OSError, ValueError, EOFError, KeyError, zipfile.BadZipFile, zlib.error):
+            return None  # unreadable or partially written file counts as a miss
+        for a in arrays:
+            a.setflags(write=False)
+        return arrays
+
+    def invalidate(self, disk=True):
+        """
+        Drop every entry from memory and, unless disk is False, from the disk tier.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+        if disk and self.disk_dir is not None:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.npz'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self):
+        """
+        Returns:
+        - dict: Hit/miss counters, evictions and current memory use.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+            }
@@ -0,0 +1,187 @@
+# result_table.py
+import json
+import os
+import numpy as np
+
+_META = 'table.json'
+
+
+class ResultTable:
+    """
+    Columnar store for sweep results: one contiguous typed array per output and one 1-D array per input axis.
+
+    Output columns have one dimension per axis, in the order of `dims`. Column values may be kept as float32 to
+    halve memory, while the axes always stay float64 so altitudes and Mach numbers read back exactly. Indexing a table with a slice returns a view, so no values are copied. Tables are saved as a
+    directory of .npy files, one per column, and load() memory-maps them, so a result larger than RAM opens
+    immediately and is only paged in where it is read.
+    """
+
+    def __init__(self, dims, coords, columns, fixed=None, dtype=None):
+        """
+        Parameters:
+        - dims (tuple): Names of the input axes, one per column dimension.
+        - coords (dict): 1-D input values for each name in dims.
+        - columns (dict): Output name -> array of shape (len(coords[d]) for d in dims).
+        - fixed (dict, optional): Inputs that were held constant.
+        - dtype (numpy dtype, optional): Convert every column to this type (e.g. np.float32).
+        """
+        self.dims = tuple(dims)
+        self.coords = {name: np.ascontiguousarray(coords[name], dtype=np.float64) for name in self.dims}
+        self.columns = {name: self._column(values, dtype) for name, values in columns.items()}
+        self.fixed = dict(fixed or {})
+        self.directory = None
+        for name, values in self.columns.items():
+            if values.shape != self.shape:
+                raise ValueError(f"Column {name} has shape {values.shape}, expected {self.shape}")
+
+    @staticmethod
+    def _column(values, dtype):
+        # Memory maps are already contiguous and must not be copied into RAM
+        if isinstance(values, np.memmap) and (dtype is None or values.dtype == dtype):
+            return values
+        return np.ascontiguousarray(values, dtype=dtype)
+
+    @classmethod
+    def from_sweep(cls, sweep, dtype=None):
+        """
+        Build a table from a SweepResult of EnvelopeSweep.
+        """
+        return cls(sweep.dims, sweep.coords, sweep.outputs, sweep.fixed, dtype)
+
+    @property
+    def shape(self):
+        return tuple(len(self.coords[d]) for d in self.dims)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.coords.values()) + sum(a.nbytes for a in self.columns.values())
+
+    def __len__(self):
+        return self.shape[0] if self.dims else 1
+
+    def __contains__(self, name):
+        return name in self.columns or name in self.coords
+
+    def keys(self):
+        return list(self.coords) + list(self.columns)
+
+    def __getitem__(self, key):
+        """
+        Look up a column or axis by name, or slice the table along its axes.
+
+        table['thrust'] returns the column; table[100:200] or table[:, ::2] return a ResultTable whose axes and
+        columns are views into this one.
+        """
+        if isinstance(key, str):
+            return self.columns[key] if key in self.columns else self.coords[key]
+        index = key if isinstance(key, tuple) else (key,)
+        if len(index) > len(self.dims) or not all(isinstance(i, slice) for i in index):
+            raise IndexError("ResultTable can only be sliced, one slice per axis")
+        coords = dict(self.coords)
+        for name, i in zip(self.dims, index):
+            coords[name] = self.coords[name][i]
+        columns = {name: values[index] for name, values in self.columns.items()}
+        table = object.__new__(ResultTable)
+        table.dims, table.coords, table.columns, table.fixed = self.dims, coords, columns, dict(self.fixed)
+        table.directory = None
+        return table
+
+    def astype(self, dtype):
+        """
+        Returns:
+        - ResultTable: Copy of this table stored as dtype.
+        """
+        return ResultTable(self.dims, self.coords, self.columns, self.fixed, dtype)
+
+    @classmethod
+    def create(cls, directory, dims, coords, outputs, dtype=np.float64, fixed=None):
+        """
+        Allocate a table on disk whose output columns are writable memory maps, to be filled in place.
+
+        For example EnvelopeSweep.run(..., out=table.columns) writes a sweep straight to disk.
+
+        Parameters:
+        - directory (str): Directory to hold the .npy files. Created if it does not exist.
+        - outputs (iterable): Names of the output columns.
+
+        Returns:
+        - ResultTable: The table; call flush() once the columns are filled, and set_axes() to record inputs
+          that are only known afterwards.
+        """
+        os.makedirs(directory, exist_ok=True)
+        dims = tuple(dims)
+        shape = tuple(len(coords[d]) for d in dims)
+        columns = {}
+        for name in outputs:
+            columns[name] = np.lib.format.open_memmap(cls._path(directory, name), mode='w+', dtype=dtype, shape=shape)
+        table = cls(dims, coords, columns, fixed, None)
+        table.directory = directory
+        table._write_axes(directory)
+        return table
+
+    def set_axes(self, coords=None, fixed=None):
+        """
+        Replace axis values and/or the fixed inputs. For a table created or loaded from a directory, the axis
+        files and the JSON index there are rewritten too.
+
+        Parameters:
+        - coords (dict, optional): New 1-D values for any of the axes; the lengths must stay the same.
+        - fixed (dict, optional): Replaces the fixed inputs.
+        """
+        for name, values in (coords or {}).items():
+            if name not in self.coords:
+                raise KeyError(f"{name} is not an axis of this table")
+            values = np.ascontiguousarray(values, dtype=np.float64)
+            if values.shape != self.coords[name].shape:
+                raise ValueError(f"Axis {name} has shape {values.shape}, expected {self.coords[name].shape}")
+            self.coords[name] = values
+        if fixed is not None:
+            self.fixed = dict(fixed)
+        if self.directory is not None:
+            self._write_axes(self.directory)
+
+    def flush(self):
+        for values in self.columns.values():
+            if isinstance(values, np.memmap):
+                values.flush()
+
+    def save(self, directory):
+        """
+        Write every axis and column to its own .npy file in directory, plus a small JSON index.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, values in self.columns.items():
+            np.save(self._path(directory, name), values)
+        self._write_axes(directory)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        Open a table written by save() or create().
+
+        Parameters:
+        - mmap_mode (str or None): 'r' (default) memory-maps the columns read-only, 'r+' or 'c' allow writing,
+          None reads them fully into memory.
+
+        Returns:
+        - ResultTable: The table.
+        """
+        with open(os.path.join(directory, _META)) as f:
+            meta = json.load(f)
+        coords = {name: np.load(cls._path(directory, 'axis.' + name)) for name in meta['dims']}
+        columns = {name: np.load(cls._path(directory, name), mmap_mode=mmap_mode) for name in meta['columns']}
+        table = cls(meta['dims'], coords, columns, meta['fixed'])
+        table.directory = directory
+        return table
+
+    def _write_axes(self, directory):
+        for name, values in self.coords.items():
+            np.save(self._path(directory, 'axis.' + name), values)
+        meta = {'dims': list(self.dims), 'columns': list(self.columns),
+                'fixed': {name: float(value) for name, value in self.fixed.items()}}
+        with open(os.path.join(directory, _META), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @staticmethod
+    def _path(directory, name):
+        return os.path.join(directory, name + '.npy')
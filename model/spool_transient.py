@@ -0,0 +1,238 @@
+# spool_transient.py
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+from utils.shaft import ShaftModel
+
+# Dormand-Prince 5(4) tableau for the adaptive integrator
+_DP_C = (0.0, 1/5, 3/10, 4/5, 8/9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+_DP_B = (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84, 0.0)
+_DP_E = (71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40)
+
+
+class TransientResult:
+    """
+    Time history of a batch of spool transients.
+
+    Attributes:
+    - t (array): Output times in seconds, shape (n_steps,).
+    - N (array): Spool speed in RPM, shape (n_steps, n_scenarios).
+    - T_t4 (array): Turbine inlet temperature applied at each output time, same shape as N.
+    """
+
+    def __init__(self, t, N, T_t4, N_R):
+        self.t = t
+        self.N = N
+        self.T_t4 = T_t4
+        self.N_R = N_R
+
+    @property
+    def n_over_nr(self):
+        return self.N / self.N_R
+
+
+class SpoolTransient:
+    """
+    Steps single-spool shaft speed in time under compressor and turbine torque.
+
+    Component behaviour follows the off-design relations used in GeneralAnalysis, referenced to its design
+    point: compressor corrected flow scales with corrected speed, and its temperature rise with the square
+    of it, so the compressor absorbs m_dot*c_pc*T_t2R*(tau_cR - 1)*(N/N_R)^2. The turbine delivers
+    eta_m*m_dot*(1 + f)*c_pt*T_t4*(1 - tau_t). Dividing each power by the shaft angular velocity gives the
+    torques that ShaftModel turns into an acceleration.
+
+    Every scenario in a batch is integrated together, so each step is a few array operations regardless of
+    the batch size.
+    """
+
+    def __init__(self, analysis=None, I=20.0, trq_other=0.0, eta_m=None, N_min_ratio=0.05):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Provides the design point and the default flight condition.
+        - I (float or array): Spool inertia in kg m^2, per scenario if an array.
+        - trq_other (float or array): Additional shaft torque in N m (negative for accessory loads).
+        - eta_m (float, optional): Mechanical efficiency of the shaft. Defaults to analysis.eta_mR.
+        - N_min_ratio (float): Lowest N/N_R used when converting power to torque, to keep it finite at rest.
+        """
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        self.I = I
+        self.trq_other = trq_other
+        self.eta_m = eta_m if eta_m is not None else self.analysis.eta_mR
+        self.N_min_ratio = N_min_ratio
+
+    def flight_condition(self, M_0=None, T_0=None, P_0=None):
+        """
+        Precompute the inlet quantities that stay fixed during a transient.
+
+        Returns:
+        - dict: T_0, tau_r, T_t2 and the corrected flow factor delta_2/sqrt(theta_2).
+        """
+        a = self.analysis
+        M_0 = a.M_0 if M_0 is None else np.asarray(M_0, dtype=float)
+        T_0 = a.T_0 if T_0 is None else np.asarray(T_0, dtype=float)
+        P_0 = a.P_0 if P_0 is None else np.asarray(P_0, dtype=float)
+        tau_r = a.calc_tau_r(a.gamma_c, M_0)
+        pi_r = a.calc_pi_r(tau_r, a.gamma_c)
+        pi_d = a.calc_pi_d(a.pi_d_max, a.calc_eta_r(M_0))
+        T_t2 = a.calc_T_t2(T_0, tau_r)
+        T_t2R = a.calc_T_t2(a.T_0R, a.tau_rR)
+        delta_2 = (P_0*pi_r*pi_d)/(a.P_0R*a.pi_rR*a.pi_dR)
+        theta_2 = T_t2/T_t2R
+        return {'T_0': T_0, 'tau_r': tau_r, 'T_t2': T_t2, 'T_t2R': T_t2R, 'flow': delta_2/np.sqrt(theta_2)}
+
+    def derivative(self, N, T_t4, condition):
+        """
+        Rate of change of spool speed.
+
+        Parameters:
+        - N (array): Spool speed in RPM.
+        - T_t4 (array): Turbine inlet temperature in K.
+        - condition (dict): Output of flight_condition().
+
+        Returns:
+        - array: dN/dt in RPM per second.
+        """
+        a = self.analysis
+        n = N / a.N_R
+        m_dot = a.m_dot_R * n * condition['flow']
+
+        # Compressor work from the speed line, fuel-air ratio from the burner energy balance
+        tau_c = 1 + (a.tau_cR - 1) * n**2 * condition['T_t2R'] / condition['T_t2']
+        tau_lambda = a.calc_tau_lambda(a.c_pt, T_t4, a.c_pc, condition['T_0'])
+        f = a.calc_f(tau_lambda, condition['tau_r'], tau_c, a.h_pR, a.eta_b, a.c_p, condition['T_0'])
+        power_c = m_dot * a.c_pc * 1000 * condition['T_t2'] * (tau_c - 1)
+        power_t = self.eta_m * m_dot * (1 + f) * a.c_pt * 1000 * T_t4 * (1 - a.tau_t)
+
+        omega = ShaftModel.calculate_angular_velocity(np.maximum(N, self.N_min_ratio * a.N_R))
+        # ShaftModel divides the net torque by 2*pi*I, i.e. it returns revolutions per second squared
+        alpha = ShaftModel.calculate_angular_acceleration(-power_c / omega, power_t / omega, self.trq_other, self.I)
+        return 60 * alpha
+
+    def steady_state_speed(self, T_t4, M_0=None, T_0=None, P_0=None, iterations=50):
+        """
+        Spool speed at which compressor and turbine torques balance for a fixed T_t4.
+
+        Returns:
+        - array: Equilibrium speed in RPM (with trq_other ignored).
+        """
+        a = self.analysis
+        condition = self.flight_condition(M_0, T_0, P_0)
+        T_t4 = np.asarray(T_t4, dtype=float)
+        tau_lambda = a.calc_tau_lambda(a.c_pt, T_t4, a.c_pc, condition['T_0'])
+        turbine = self.eta_m * a.c_pt * T_t4 * (1 - a.tau_t)
+        compressor = a.c_pc * condition['T_t2R'] * (a.tau_cR - 1)
+        # f depends weakly on speed through tau_c, so iterate the balance n^2 = (1 + f)*turbine/compressor
+        n = np.sqrt(turbine / compressor)
+        for _ in range(iterations):
+            tau_c = 1 + (a.tau_cR - 1) * n**2 * condition['T_t2R'] / condition['T_t2']
+            f = a.calc_f(tau_lambda, condition['tau_r'], tau_c, a.h_pR, a.eta_b, a.c_p, condition['T_0'])
+            n = np.sqrt((1 + f) * turbine / compressor)
+        return n * a.N_R
+
+    def simulate(self, times, T_t4, N_0=None, M_0=None, T_0=None, P_0=None, method='rk4', dt=0.01,
+                 rtol=1e-6, atol=1e-3, max_step=None, min_step=None):
+        """
+        Integrate a batch of throttle schedules.
+
+        Parameters:
+        - times (array): Schedule knot times in seconds, increasing, shape (n_knots,).
+        - T_t4 (array): Turbine inlet temperature at each knot, shape (n_knots,) or (n_scenarios, n_knots).
+          It is interpolated linearly between knots.
+        - N_0 (float or array, optional): Initial speed in RPM. Defaults to the steady state at the first knot.
+        - M_0, T_0, P_0 (float or array, optional): Flight condition, per scenario if arrays.
+        - method (str): 'euler' or 'rk4' (fixed step dt), or 'dopri' (adaptive Dormand-Prince 5(4)).
+        - dt (float): Step for the fixed-step methods and the first trial step for 'dopri'.
+        - rtol, atol (float): Error tolerances for 'dopri' (atol in RPM).
+        - max_step (float, optional): Largest step 'dopri' may take.
+        - min_step (float, optional): Smallest step 'dopri' may take before it gives up with a RuntimeError.
+          Defaults to 1e-12 of the simulated time span.
+
+        Returns:
+        - TransientResult: Speed history for every scenario.
+        """
+        times = np.asarray(times, dtype=float)
+        schedule = np.atleast_2d(np.asarray(T_t4, dtype=float))
+        if schedule.shape[-1] != times.size:
+            raise ValueError("T_t4 must have one value per schedule time")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("times must be strictly increasing")
+
+        condition = self.flight_condition(M_0, T_0, P_0)
+        shape = np.broadcast_shapes(schedule.shape[:-1], *(np.shape(v) for v in condition.values()))
+        if N_0 is None:
+            N_0 = self.steady_state_speed(schedule[..., 0], M_0, T_0, P_0)
+        N = np.broadcast_to(np.asarray(N_0, dtype=float), shape).copy()
+
+        def throttle(t):
+            # Knot interval and weight are shared by the whole batch
+            j = min(max(int(np.searchsorted(times, t, side='right')), 1), times.size - 1)
+            w = min(max((t - times[j - 1]) / (times[j] - times[j - 1]), 0.0), 1.0)
+            return schedule[..., j - 1] * (1 - w) + schedule[..., j] * w
+
+        def rate(t, N):
+            return self.derivative(N, throttle(t), condition)
+
+        if method in ('euler', 'rk4'):
+            steps = max(int(np.ceil((times[-1] - times[0]) / dt)), 1)
+            t_out = np.linspace(times[0], times[-1], steps + 1)
+            h = t_out[1] - t_out[0]
+            N_out = np.empty((steps + 1,) + shape)
+            N_out[0] = N
+            for i, t in enumerate(t_out[:-1]):
+                if method == 'euler':
+                    N = N + h * rate(t, N)
+                else:
+                    k1 = rate(t, N)
+                    k2 = rate(t + h/2, N + h/2 * k1)
+                    k3 = rate(t + h/2, N + h/2 * k2)
+                    k4 = rate(t + h, N + h * k3)
+                    N = N + h/6 * (k1 + 2*k2 + 2*k3 + k4)
+                N_out[i + 1] = N
+        elif method == 'dopri':
+            t_out, N_out = self._dopri(rate, times[0], times[-1], N, dt, rtol, atol, max_step, min_step)
+        else:
+            raise ValueError(f"Unknown integration method: {method}")
+
+        T_t4_out = np.stack([np.broadcast_to(throttle(t), shape) for t in t_out])
+        return TransientResult(t_out, N_out, T_t4_out, self.analysis.N_R)
+
+    def _dopri(self, rate, t, t_end, N, h, rtol, atol, max_step, min_step):
+        # One step size for the whole batch, chosen from the worst scenario's error estimate
+        max_step = max_step if max_step is not None else t_end - t
+        min_step = min_step if min_step is not None else 1e-12 * (t_end - t)
+        t_out, N_out = [t], [N.copy()]
+        k1 = rate(t, N)
+        while t < t_end:
+            if not np.all(np.isfinite(k1)):
+                raise RuntimeError(f"Spool speed rate is not finite at t={t:g} s; cannot continue the transient")
+            h = min(h, max_step, t_end - t)
+            k = [k1]
+            for c, a in zip(_DP_C[1:], _DP_A[1:]):
+                k.append(rate(t + c*h, N + h * sum(a_j * k_j for a_j, k_j in zip(a, k))))
+            N_new = N + h * sum(b * k_j for b, k_j in zip(_DP_B, k))
+            error = h * sum(e * k_j for e, k_j in zip(_DP_E, k))
+            scale = atol + rtol * np.maximum(np.abs(N), np.abs(N_new))
+            norm = float(np.max(np.abs(error) / scale)) if error.size else 0.0
+            if not np.isfinite(norm) or not np.all(np.isfinite(N_new)):
+                # A step too large can overshoot into a region where the rates are undefined, so retry
+                # smaller; rates that stay non-finite however small the step are an error in the model
+                if h <= min_step:
+                    raise RuntimeError(f"Spool speed rate is not finite at t={t:g} s; cannot continue the transient")
+                h = max(0.2 * h, min_step)
+                continue
+            if norm <= 1.0:
+                t, N, k1 = t + h, N_new, k[-1]
+                t_out.append(t)
+                N_out.append(N.copy())
+            elif h <= min_step:
+                raise RuntimeError(f"Step size fell below min_step={min_step:g} s at t={t:g} s without meeting the tolerances")
+            h = max(h * min(5.0, max(0.2, 0.9 * (1.0 / max(norm, 1e-10)) ** 0.2)), min_step)
+        return np.array(t_out), np.stack(N_out)
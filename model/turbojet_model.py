@@ -1,5 +1,17 @@
+from contextlib import nullcontext
 from utils.general_analysis import GeneralAnalysis
+from model.envelope_sweep import EnvelopeSweep
+from model.result_table import ResultTable
+from utils.cycle_graph import CycleGraph
 import numpy as np
+
+
+class CalculationCancelled(Exception):
+    """
+    Raised by TurbojetModel.calculate when its cancel event is set part-way through a sweep.
+    """
+
+
 class TurbojetModel:
     def __init__(self, **input_parameters):
         # Initialization code for the TurbojetModel
@@ -10,16 +22,31 @@ class TurbojetModel:
         self.P_0 = input_parameters.get('P_0')  # Total pressure (kPa)
         self.T_t4 = input_parameters.get('T_t4')  # Turbine Inlet Temperature (degrees K)
         self.P9rat = input_parameters.get('P9rat')  # Exit Pressure ratio
+        self.num_points = int(input_parameters.get('num_points', 1000))  # Mach numbers in the sweep
+        self.profiler = input_parameters.get('profiler')  # optional StageProfiler for per-stage timings
+        self._graph = None  # CycleGraph kept by update() between edits
+
+    def analysis(self):
+        """
+        Returns:
+        - GeneralAnalysis: Analysis object for this model's inputs, reporting to this model's profiler.
+        """
+        analysis = GeneralAnalysis(M_0=self.M_1, T_0=self.T_0, P_0=self.P_0, T_t4=self.T_t4, P9rat=self.P9rat)
+        analysis.profiler = self.profiler
+        return analysis
 
-    def calculate(self):
+    def calculate(self, progress=None, cancel=None, chunk_size=65536, cache=None):
         """
         Example method to perform overall calculations using the model.
 
         Parameters:
-        - input_parameters (dict): Input parameters for the calculation.
+        - progress (callable, optional): Called as progress(points_done, points_total) after each chunk.
+        - cancel (threading.Event, optional): When set, the sweep stops and CalculationCancelled is raised.
+        - chunk_size (int): Mach numbers evaluated per chunk between progress reports.
+        - cache (ResultCache, optional): Reuse a previous sweep with the same inputs and design constants.
 
         Returns:
-        - dict: Results of calculations.
+        - tuple: Mach numbers, thrust values and TSFC values.
         """
         # Extract input parameters, with default values in case the field is empty
         #throttle = input_parameters.get('throttle', 0.8)
@@ -28,20 +55,166 @@ class TurbojetModel:
 
         # Using GeneralAnalysis functions for thrust calculation
         # Initialize results
-        mach_vals = np.linspace(self.M_0, self.M_1, 1000)
-        thrust_vals = []
-        tsfc_vals = []
-        #rpm_vals = []
+        mach_vals = np.linspace(self.M_0, self.M_1, self.num_points)
+        thrust_vals = np.empty_like(mach_vals)
+        tsfc_vals = np.empty_like(mach_vals)
 
         # Initialize Analysis object
-        analysis = GeneralAnalysis(M_0=self.M_1, T_0=self.T_0, P_0=self.P_0, T_t4=self.T_t4, P9rat=self.P9rat)
+        analysis = self.analysis()
+
+        if cache is not None:
+            key = cache.key(self.inputs(), analysis.designConstants())
+            cached = cache.get(key)
+            if cached is not None:
+                if progress is not None:
+                    progress(len(mach_vals), len(mach_vals))
+                return cached[0].copy(), list(cached[1]), list(cached[2])
 
-        # Calculate thrust over the range of Mach numbers
-        for M in mach_vals:
-            thrust_result = analysis.calculateThrust(M, self.T_0, self.P_0, self.T_t4, analysis.P_9, analysis.g_c, analysis.gamma_c, analysis.c_pc, analysis.gamma_t, analysis.c_pt, analysis.pi_d_max, analysis.tau_cR, analysis.T_t4R, analysis.tau_rR, analysis.eta_c, analysis.h_pR, analysis.eta_b, analysis.m_dot_R, analysis.P_0R, analysis.pi_rR, analysis.pi_cR, analysis.pi_b, analysis.pi_t, analysis.pi_n, analysis.tau_t)
-            thrust_vals.append(thrust_result)
-            tsfc_result = analysis.calculateTSFC(M, self.T_0, self.P_0, self.T_t4, analysis.P_9, analysis.g_c, analysis.gamma_c, analysis.c_pc, analysis.gamma_t, analysis.c_pt, analysis.pi_d_max, analysis.tau_cR, analysis.T_t4R, analysis.tau_rR, analysis.eta_c, analysis.h_pR, analysis.eta_b, analysis.m_dot_R, analysis.P_0R, analysis.pi_rR, analysis.pi_cR, analysis.pi_b, analysis.pi_t, analysis.pi_n, analysis.tau_t)
-            tsfc_vals.append(tsfc_result)
-            #rpm_result = analysis.calculateRPM(analysis.N_R, self.T_0, analysis.T_0R, analysis.gamma_c, analysis.gamma_t, analysis.c_pc, analysis.c_pt, analysis.g_c, analysis.M_0, analysis.pi_d_max, analysis.tau_cR, analysis.T_t4, analysis.T_t4R, analysis.tau_rR, analysis.eta_c)
-            #rpm_vals.append(rpm_result)
+        # Calculate thrust and TSFC over the range of Mach numbers, one vectorized pass per chunk
+        profiled = self.profiler.frame('TurbojetModel.calculate', len(mach_vals)) if self.profiler is not None else nullcontext()
+        with profiled:
+            for start in range(0, len(mach_vals), chunk_size):
+                if cancel is not None and cancel.is_set():
+                    raise CalculationCancelled()
+                stop = min(start + chunk_size, len(mach_vals))
+                thrust_vals[start:stop], tsfc_vals[start:stop] = analysis.calculateThrustAndTSFC(mach_vals[start:stop], self.T_0, self.P_0, self.T_t4, self.P9rat)
+                if progress is not None:
+                    progress(stop, len(mach_vals))
+        if cache is not None:
+            cache.put(key, (mach_vals, thrust_vals, tsfc_vals))
+        thrust_vals = list(thrust_vals)
+        tsfc_vals = list(tsfc_vals)
         return mach_vals, thrust_vals, tsfc_vals
+
+    def calculate_table(self, outputs=('thrust', 'tsfc'), dtype=np.float64, chunk_size=65536, progress=None, cancel=None):
+        """
+        Mach sweep as a ResultTable instead of Python lists.
+
+        Parameters:
+        - outputs (tuple): CycleResult fields to keep.
+        - dtype (numpy dtype): Storage type of the columns; np.float32 halves memory use. The cycle itself is
+          always evaluated in float64.
+        - chunk_size, progress, cancel: As for calculate().
+
+        Returns:
+        - ResultTable: One column per output over the 'M_0' axis.
+        """
+        mach_vals = np.linspace(self.M_0, self.M_1, self.num_points)
+        columns = {name: np.empty(mach_vals.shape, dtype=dtype) for name in outputs}
+        analysis = self.analysis()
+        for start in range(0, len(mach_vals), chunk_size):
+            if cancel is not None and cancel.is_set():
+                raise CalculationCancelled()
+            stop = min(start + chunk_size, len(mach_vals))
+            result = analysis.calculateCycle(mach_vals[start:stop], self.T_0, self.P_0, self.T_t4, self.P9rat)
+            for name in outputs:
+                columns[name][start:stop] = result[name]
+            if progress is not None:
+                progress(stop, len(mach_vals))
+        fixed = {'T_0': self.T_0, 'P_0': self.P_0, 'T_t4': self.T_t4, 'P9rat': self.P9rat}
+        return ResultTable(('M_0',), {'M_0': mach_vals}, columns, fixed, dtype)
+
+    def update(self, **changes):
+        """
+        Change some input parameters and recompute the sweep incrementally.
+
+        The first call evaluates the whole cycle; later calls only recompute the stations downstream of the
+        inputs that actually changed (e.g. a new P9rat leaves the inlet, compressor and burner untouched).
+
+        Parameters:
+        - **changes: New values for any of M_0, M_1, T_0, P_0, T_t4, P9rat and num_points.
+
+        Returns:
+        - tuple: Mach numbers, thrust values and TSFC values, as from calculate().
+        """
+        unknown = set(changes) - set(self.inputs())
+        if unknown:
+            raise TypeError(f"Unknown input parameter(s): {', '.join(sorted(unknown))}")
+        for name, value in changes.items():
+            setattr(self, name, int(value) if name == 'num_points' else value)
+
+        mach_vals = np.linspace(self.M_0, self.M_1, self.num_points)
+        inputs = {'M_0': mach_vals, 'T_0': self.T_0, 'P_0': self.P_0, 'T_t4': self.T_t4, 'P9rat': self.P9rat}
+        if self._graph is None:
+            self._graph = CycleGraph(self.analysis(), **inputs)
+        else:
+            self._graph.set(**inputs)
+        thrust_vals = np.broadcast_to(self._graph['thrust'], mach_vals.shape)
+        tsfc_vals = np.broadcast_to(self._graph['tsfc'], mach_vals.shape)
+        return mach_vals, list(thrust_vals), list(tsfc_vals)
+
+    def inputs(self):
+        """
+        Returns:
+        - dict: The input parameters this model was built with.
+        """
+        return {'M_0': self.M_0, 'M_1': self.M_1, 'T_0': self.T_0, 'P_0': self.P_0, 'T_t4': self.T_t4,
+                'P9rat': self.P9rat, 'num_points': self.num_points}
+
+    def calculate_envelope(self, outputs=('thrust', 'tsfc'), chunk_size=262144, **grid):
+        """
+        Sweep the model over a Cartesian grid of operating conditions.
+
+        Parameters:
+        - outputs (tuple): CycleResult fields to return.
+        - chunk_size (int): Maximum number of grid points evaluated at once.
+        - **grid: Any of M_0, altitude (km), T_t4 and P9rat as 1-D sequences (swept) or scalars (fixed).
+          Inputs that are not given fall back to this model's T_0, P_0, T_t4 and P9rat.
+
+        Returns:
+        - SweepResult: Labeled N-d result with one axis per swept variable.
+        """
+        analysis = self.analysis()
+        return EnvelopeSweep(analysis, outputs, chunk_size).run(**grid)
+
+    def stream(self, outputs=('thrust', 'tsfc'), chunk_size=65536, buffers=1, cancel=None, **grid):
+        """
+        Yield the sweep in fixed-size chunks as it is computed, for results too large to hold in memory.
+
+        Without a grid this is the Mach sweep of calculate(); otherwise the grid is swept as in
+        calculate_envelope(). Chunks live in reused buffers and are only valid until the next one is
+        requested; see EnvelopeSweep.stream for the buffering and back-pressure behaviour.
+
+        Parameters:
+        - outputs (tuple): CycleResult fields to compute.
+        - chunk_size (int): Grid points per chunk.
+        - buffers (int): Chunk buffers; more than one evaluates ahead of the consumer in a background thread.
+        - cancel (threading.Event, optional): Stops the stream after the current chunk when set.
+        - **grid: Any of M_0, altitude (km), T_t4 and P9rat, as for calculate_envelope().
+
+        Yields:
+        - SweepChunk: Inputs and outputs of consecutive grid points.
+        """
+        analysis = self.analysis()
+        if not grid:
+            grid = {'M_0': np.linspace(self.M_0, self.M_1, self.num_points)}
+        return EnvelopeSweep(analysis, outputs, chunk_size).stream(buffers=buffers, cancel=cancel, **grid)
+
+    def calculate_envelope_table(self, directory=None, dtype=np.float64, outputs=('thrust', 'tsfc'), chunk_size=262144, **grid):
+        """
+        Envelope sweep stored as a ResultTable.
+
+        With a directory the columns are memory-mapped .npy files that the sweep fills in place, so the result
+        never has to fit in RAM; reopen it later with ResultTable.load(directory).
+
+        Parameters:
+        - directory (str, optional): Where to write the table. Kept in memory if omitted.
+        - dtype (numpy dtype): Storage type of the columns, e.g. np.float32.
+        - outputs, chunk_size, **grid: As for calculate_envelope().
+
+        Returns:
+        - ResultTable: One column per output with one axis per swept variable.
+        """
+        analysis = self.analysis()
+        sweep = EnvelopeSweep(analysis, outputs, chunk_size)
+        dims = tuple(name for name in sweep.AXES if grid.get(name) is not None and np.ndim(grid[name]) > 0)
+        coords = {name: np.asarray(grid[name], dtype=float).ravel() for name in dims}
+        shape = tuple(len(coords[name]) for name in dims)
+        if directory is None:
+            out = {name: np.empty(shape, dtype=dtype) for name in outputs}
+            return ResultTable.from_sweep(sweep.run(out=out, **grid))
+        table = ResultTable.create(directory, dims, coords, outputs, dtype)
+        result = sweep.run(out=table.columns, **grid)
+        table.flush()
+        table.set_axes(fixed=result.fixed)
+        return table
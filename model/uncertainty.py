@@ -0,0 +1,203 @@
+# uncertainty.py
+import numpy as np
+from utils.general_analysis import GeneralAnalysis
+
+# Distribution name -> Generator method and the number of parameters it takes
+DISTRIBUTIONS = {
+    'normal': ('normal', 2),          # mean, standard deviation
+    'uniform': ('uniform', 2),        # low, high
+    'triangular': ('triangular', 3),  # low, mode, high
+    'lognormal': ('lognormal', 2),    # mean and sigma of the underlying normal
+    'beta': ('beta', 2),              # a, b (on 0..1)
+}
+
+
+class RunningStats:
+    """
+    Summary statistics of a stream of values, updated one chunk at a time in constant memory.
+
+    Mean and variance are merged across chunks exactly (Chan et al.'s parallel update). Percentiles come from
+    a fixed-bin histogram, so they are accurate to a fraction of a bin. Unless a range is given, it is set from
+    the first chunk (padded) and doubled towards any later value that falls outside it, merging neighbouring
+    bins so the counts stay exact; with a given range, values outside it are counted separately. Min and max
+    are always exact. NaN and infinite values are counted (nan_count, inf_count) and excluded from everything
+    else.
+    """
+
+    def __init__(self, bins=2048, range=None):
+        self.bins = int(bins) + int(bins) % 2   # even, so pairs of bins can be merged when the range widens
+        self.range = range
+        self.count = 0
+        self.nan_count = 0
+        self.inf_count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.below = 0
+        self.above = 0
+        self.edges = None
+        self.counts = None
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        finite = np.isfinite(values)
+        if not finite.all():
+            nan = int(np.count_nonzero(np.isnan(values)))
+            self.nan_count += nan
+            self.inf_count += int(values.size - finite.sum()) - nan
+            values = values[finite]
+        n = values.size
+        if n == 0:
+            return
+        if self.edges is None:
+            low, high = self.range if self.range is not None else (values.min(), values.max())
+            if self.range is None:
+                pad = 0.5 * (high - low) or max(abs(low), 1.0) * 1e-3
+                low, high = low - pad, high + pad
+            self.edges = np.linspace(low, high, self.bins + 1)
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+
+        mean = values.mean()
+        m2 = np.sum((values - mean)**2)
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        if self.range is None:
+            self._widen(values)
+        low, high = self.edges[0], self.edges[-1]
+        self.below += int(np.count_nonzero(values < low))
+        self.above += int(np.count_nonzero(values > high))
+        inside = values[(values >= low) & (values <= high)]
+        index = np.minimum(((inside - low) * (self.bins / (high - low))).astype(np.intp), self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+    def _widen(self, values):
+        # Double the histogram range towards the side that misses values until every value fits. Each
+        # doubling merges bins pairwise and extends the grid by the old width, so bin edges stay aligned
+        low, high = self.edges[0], self.edges[-1]
+        v_min, v_max = values.min(), values.max()
+        while v_min < low or v_max > high:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            if v_min < low:
+                self.counts = np.concatenate([np.zeros_like(merged), merged])
+                low -= high - low
+            else:
+                self.counts = np.concatenate([merged, np.zeros_like(merged)])
+                high += high - low
+            self.edges = np.linspace(low, high, self.bins + 1)
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+    def percentile(self, q):
+        """
+        Approximate percentiles from the histogram (linear within a bin).
+
+        Parameters:
+        - q (float or sequence): Percentiles in 0..100.
+
+        Returns:
+        - float or array: Estimated values; NaN if they fall outside the histogram range.
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)[()]
+        cumulative = self.below + np.concatenate([[0], np.cumsum(self.counts)])
+        rank = q / 100 * self.count
+        values = np.interp(rank, cumulative, self.edges)
+        values = np.where((rank < self.below) | (rank > self.count - self.above), np.nan, values)
+        values = np.where(q <= 0, self.min, np.where(q >= 100, self.max, values))
+        return values[()]
+
+    def summary(self, percentiles=(1, 5, 25, 50, 75, 95, 99)):
+        """
+        Returns:
+        - dict: count, nan_count, inf_count, mean, std, min, max, percentiles and the histogram.
+        """
+        return {
+            'count': self.count, 'nan_count': self.nan_count, 'inf_count': self.inf_count, 'mean': float(self.mean), 'std': self.std,
+            'min': float(self.min), 'max': float(self.max),
+            'percentiles': {float(q): float(v) for q, v in zip(percentiles, np.atleast_1d(self.percentile(percentiles)))},
+            'histogram': {'edges': self.edges, 'counts': self.counts, 'below': self.below, 'above': self.above},
+        }
+
+
+class UncertaintyAnalysis:
+    """
+    Monte Carlo propagation of scattered design constants through the cycle.
+
+    Each uncertain constant gets its own random stream, spawned from one seed, so a run is reproducible
+    and the samples do not depend on the chunk size. Samples are drawn and pushed through calculateCycle
+    chunk by chunk as arrays of constant overrides, and only RunningStats per output are kept, so memory is
+    bounded by the chunk size however many samples are run.
+    """
+
+    def __init__(self, distributions, analysis=None, outputs=('thrust', 'tsfc', 'S'), chunk_size=262144,
+                 bins=2048, ranges=None):
+        """
+        Parameters:
+        - distributions (dict): Constant name -> (distribution, *parameters), e.g.
+          {'eta_c': ('normal', 0.8641, 0.01), 'pi_b': ('uniform', 0.92, 0.96)}. Names are those of
+          GeneralAnalysis.designConstants() or the inputs M_0, T_0, P_0, T_t4, P9rat; the reference
+          attribute names (eta_cR, pi_bR, ...) are accepted for constants without an R.
+          Distributions: normal (mean, sd), uniform (low, high), triangular (low, mode, high),
+          lognormal (mu, sigma) and beta (a, b).
+        - analysis (GeneralAnalysis, optional): Nominal constants and operating point.
+        - outputs (tuple): CycleResult fields to summarize.
+        - chunk_size (int): Samples evaluated at once.
+        - bins (int): Histogram bins per output.
+        - ranges (dict, optional): Output name -> (low, high) histogram range.
+        """
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        constants = self.analysis.designConstants()
+        self.distributions = {}
+        for name, spec in distributions.items():
+            if name not in constants and name not in GeneralAnalysis.CYCLE_INPUTS:
+                if name.endswith('R') and name[:-1] in constants:
+                    name = name[:-1]
+                else:
+                    raise TypeError(f"{name} is not a design constant or cycle input")
+            kind, *parameters = spec
+            if kind not in DISTRIBUTIONS or len(parameters) != DISTRIBUTIONS[kind][1]:
+                raise ValueError(f"Bad distribution for {name}: {spec}")
+            self.distributions[name] = (kind, tuple(float(p) for p in parameters))
+        self.outputs = tuple(outputs)
+        self.chunk_size = int(chunk_size)
+        if self.chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.bins = bins
+        self.ranges = dict(ranges or {})
+
+    def run(self, samples, seed=None, **inputs):
+        """
+        Propagate samples through the cycle.
+
+        Parameters:
+        - samples (int): Number of Monte Carlo samples.
+        - seed (int, optional): Seed for reproducible runs.
+        - **inputs: Fixed operating point (M_0, T_0, P_0, T_t4, P9rat) as scalars.
+
+        Returns:
+        - dict: Output name -> RunningStats with the summary of every sample.
+        """
+        streams = np.random.SeedSequence(seed).spawn(len(self.distributions))
+        generators = {name: np.random.default_rng(s) for name, s in zip(self.distributions, streams)}
+        stats = {name: RunningStats(self.bins, self.ranges.get(name)) for name in self.outputs}
+        for start in range(0, int(samples), self.chunk_size):
+            n = min(self.chunk_size, int(samples) - start)
+            drawn = {name: getattr(generators[name], DISTRIBUTIONS[kind][0])(*parameters, size=n)
+                     for name, (kind, parameters) in self.distributions.items()}
+            point = dict(inputs)
+            point.update((name, drawn.pop(name)) for name in list(drawn) if name in GeneralAnalysis.CYCLE_INPUTS)
+            with np.errstate(all='ignore'):
+                result = self.analysis.calculateCycle(**point, **drawn)
+            for name in self.outputs:
+                stats[name].update(np.broadcast_to(result[name], (n,)))
+        return stats
@@ -0,0 +1,6 @@
+# conftest.py
+# The packages are imported from the repository root (from utils..., from model...), as main.py does
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
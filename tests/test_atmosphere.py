@@ -0,0 +1,30 @@
+# test_atmosphere.py
+import numpy as np
+from utils.atmosphere import AtmosphereTable, standard_atmosphere, atmosphere_table
+
+
+def test_table_matches_model_within_bound():
+    table = AtmosphereTable(max_error=1e-6)
+    h = np.random.default_rng(0).uniform(0, 30, 10000)
+    for exact, approx in zip(standard_atmosphere(h)[2:], table.lookup(h)[2:]):
+        assert np.max(np.abs(approx/exact - 1)) <= 1e-6
+
+
+def test_tropopause_edge_and_layers():
+    table = atmosphere_table()
+    h = np.array([0.0, 10.99, 11.0, 11.5, 30.0])
+    for exact, approx in zip(standard_atmosphere(h)[2:], table.lookup(h)[2:]):
+        np.testing.assert_allclose(approx, exact, rtol=1e-6)
+
+
+def test_nan_and_out_of_table_altitudes():
+    h = np.array([np.nan, -0.5, 5.0, 40.0])
+    values = atmosphere_table().lookup(h)
+    assert all(np.isnan(v[0]) for v in values[1:])
+    np.testing.assert_allclose(values[3][1:], standard_atmosphere(h[1:])[3], rtol=1e-6)
+
+
+def test_scalar_lookup():
+    values = atmosphere_table().lookup(5.0)
+    assert np.ndim(values[2]) == 0
+    assert np.isclose(values[2], standard_atmosphere(5.0)[2], rtol=1e-6)
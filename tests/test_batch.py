@@ -0,0 +1,112 @@
+# test_batch.py
+import csv
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+import batch
+from utils.atmosphere import atmosphere_table
+from utils.general_analysis import GeneralAnalysis
+from utils.units import units
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    {'M_0': 0.8, 'T_0': 250.0, 'P_0': 50.0, 'T_t4': 1500.0, 'P9rat': 0.9},
+    {'M_0': 1.5, 'T_0': 229.8, 'P_0': 30.8, 'T_t4': 1670.0, 'P9rat': 0.955},
+    {'M_0': 2.0, 'T_0': 216.7, 'P_0': 19.4, 'T_t4': 1800.0, 'P9rat': 1.0},
+]
+
+
+def write_csv(path, rows, fields):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return [{name: float(value) for name, value in row.items()} for row in csv.DictReader(f)]
+
+
+def expected(rows):
+    inputs = {name: np.array([row[name] for row in rows]) for name in batch.INPUTS}
+    return GeneralAnalysis().calculateCycle(**inputs)
+
+
+def test_csv_to_csv(tmp_path):
+    write_csv(tmp_path / 'cases.csv', CASES, list(batch.INPUTS))
+    batch.main([str(tmp_path / 'cases.csv'), '-o', str(tmp_path / 'out.csv'), '--outputs', 'thrust,tsfc,S',
+                '--chunk-size', '2'])
+    out = read_csv(tmp_path / 'out.csv')
+    result = expected(CASES)
+    assert len(out) == 3
+    for name in ('thrust', 'tsfc', 'S'):
+        np.testing.assert_array_equal([row[name] for row in out], result[name])
+    assert [row['M_0'] for row in out] == [case['M_0'] for case in CASES]
+
+
+def test_jsonl_to_jsonl(tmp_path):
+    (tmp_path / 'cases.jsonl').write_text(''.join(json.dumps(case) + '\n' for case in CASES))
+    batch.main([str(tmp_path / 'cases.jsonl'), '-o', str(tmp_path / 'out.jsonl')])
+    out = [json.loads(line) for line in (tmp_path / 'out.jsonl').read_text().splitlines()]
+    result = expected(CASES)
+    np.testing.assert_array_equal([row['thrust'] for row in out], result.thrust)
+    np.testing.assert_array_equal([row['tsfc'] for row in out], result.tsfc)
+    assert set(out[0]) == set(batch.INPUTS) | {'thrust', 'tsfc'}
+
+
+def test_units_are_converted(tmp_path):
+    cases = [{**case, 'T_0': units.convert(case['T_0'], 'K', 'F'), 'P_0': units.convert(case['P_0'], 'kPa', 'psia')}
+             for case in CASES]
+    write_csv(tmp_path / 'cases.csv', cases, list(batch.INPUTS))
+    batch.main([str(tmp_path / 'cases.csv'), '-o', str(tmp_path / 'out.csv'), '--units', 'T_0=F,P_0=psia'])
+    out = read_csv(tmp_path / 'out.csv')
+    np.testing.assert_allclose([row['T_0'] for row in out], [case['T_0'] for case in CASES], rtol=1e-12)
+    np.testing.assert_allclose([row['thrust'] for row in out], expected(CASES).thrust, rtol=1e-10)
+
+
+def test_altitude_fills_in_ambient(tmp_path):
+    rows = [{'M_0': 0.8, 'altitude': 11.0}, {'M_0': 0.8, 'altitude': 5.0, 'T_0': 260.0}]
+    write_csv(tmp_path / 'cases.csv', rows, ['M_0', 'altitude', 'T_0'])
+    batch.main([str(tmp_path / 'cases.csv'), '-o', str(tmp_path / 'out.csv')])
+    out = read_csv(tmp_path / 'out.csv')
+    _, _, T_0, P_0, _, _ = atmosphere_table().lookup(np.array([11.0, 5.0]))
+    assert out[0]['T_0'] == T_0[0] and out[0]['P_0'] == P_0[0]
+    assert out[1]['T_0'] == 260.0 and out[1]['P_0'] == P_0[1]
+    assert out[0]['T_t4'] == GeneralAnalysis().T_t4
+
+
+def test_empty_cases_are_skipped_and_reported(tmp_path, capsys):
+    (tmp_path / 'cases.csv').write_text('M_0,T_0,P_0,T_t4,P9rat\n0.8,250,50,1500,0.9\n,,,,\n1.5,,,,\n')
+    batch.main([str(tmp_path / 'cases.csv'), '-o', str(tmp_path / 'out.csv')])
+    assert [row['M_0'] for row in read_csv(tmp_path / 'out.csv')] == [0.8, 1.5]
+    assert 'skipped 1 case(s)' in capsys.readouterr().err
+
+    (tmp_path / 'cases.jsonl').write_text('{}\n{"M_0": 0.8}\n{"unknown": 1}\n')
+    batch.main([str(tmp_path / 'cases.jsonl'), '-o', str(tmp_path / 'out.jsonl')])
+    assert len((tmp_path / 'out.jsonl').read_text().splitlines()) == 1
+    err = capsys.readouterr().err
+    assert 'skipped 2 case(s)' in err and err.rstrip().endswith(': 1, 3')
+
+
+def test_runs_without_gui_or_cantera(tmp_path):
+    write_csv(tmp_path / 'cases.csv', CASES, list(batch.INPUTS))
+    script = (
+        "import sys, batch\n"
+        f"batch.main([{str(tmp_path / 'cases.csv')!r}, '-o', {str(tmp_path / 'out.csv')!r}])\n"
+        "loaded = [name for name in ('tkinter', 'matplotlib', 'cantera') if name in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, '-c', script], cwd=ROOT, check=True)
+    assert len(read_csv(tmp_path / 'out.csv')) == 3
+
+
+def test_rejects_unknown_units():
+    with pytest.raises(ValueError):
+        batch.parse_units('T_0=psia')
+    with pytest.raises(ValueError):
+        batch.parse_units('thrust=N')
@@ -0,0 +1,65 @@
+# test_component_map.py
+import numpy as np
+import pytest
+from utils.component_map import ComponentMap
+
+
+def make_map(function, speed=None, beta=None):
+    speed = np.linspace(0.5, 1.1, 7) if speed is None else speed
+    beta = np.linspace(0.0, 1.0, 6) if beta is None else beta
+    return ComponentMap(speed, beta, value=function(speed[:, None], beta[None, :]))
+
+
+@pytest.mark.parametrize('speed', [np.linspace(0.5, 1.1, 7), np.array([0.5, 0.55, 0.7, 0.8, 0.95, 1.0, 1.1])])
+def test_linear_is_exact_for_bilinear_functions(speed):
+    function = lambda s, b: 2.0 + 3.0 * s - b + 0.5 * s * b
+    table = make_map(function, speed=speed)
+    rng = np.random.default_rng(1)
+    s, b = rng.uniform(0.5, 1.1, 500), rng.uniform(0.0, 1.0, 500)
+    np.testing.assert_allclose(table.lookup(s, b)['value'], function(s, b), rtol=1e-12)
+
+
+def test_cubic_reproduces_nodes_and_smooth_functions():
+    function = lambda s, b: np.sin(3 * s) * np.cos(2 * b)
+    table = make_map(function, speed=np.linspace(0.5, 1.1, 25), beta=np.linspace(0.0, 1.0, 21))
+    np.testing.assert_allclose(table.lookup(table.speed[:, None], table.beta, method='cubic')['value'],
+                               function(table.speed[:, None], table.beta), atol=1e-12)
+    # Away from the edges, where the slopes are one-sided
+    rng = np.random.default_rng(2)
+    s, b = rng.uniform(0.6, 1.0, 500), rng.uniform(0.1, 0.9, 500)
+    cubic = np.abs(table.lookup(s, b, method='cubic')['value'] - function(s, b)).max()
+    linear = np.abs(table.lookup(s, b)['value'] - function(s, b)).max()
+    assert cubic < linear / 10
+
+
+def test_clip_holds_the_edge():
+    table = make_map(lambda s, b: s + b)
+    assert table.lookup(2.0, 0.5)['value'] == pytest.approx(1.6)
+    assert table.lookup(2.0, 0.5, clip=False)['value'] == pytest.approx(2.5)
+    assert table.in_range(np.array([0.7, 2.0]), 0.5).tolist() == [True, False]
+
+
+def test_csv_round_trip(tmp_path):
+    table = make_map(lambda s, b: s * b)
+    table.to_csv(tmp_path / 'map.csv')
+    loaded = ComponentMap.from_csv(tmp_path / 'map.csv')
+    np.testing.assert_array_equal(loaded.speed, table.speed)
+    np.testing.assert_array_equal(loaded.tables['value'], table.tables['value'])
+
+
+def test_rejects_bad_axes():
+    with pytest.raises(ValueError):
+        ComponentMap([1.0, 0.5], [0.0, 1.0], value=np.zeros((2, 2)))
+    with pytest.raises(ValueError):
+        ComponentMap([0.5, 1.0], [0.0, 1.0], value=np.zeros((3, 2)))
+
+
+@pytest.mark.parametrize('method', ['linear', 'cubic'])
+@pytest.mark.parametrize('clip', [True, False])
+def test_non_finite_points_give_nan(method, clip):
+    table = make_map(lambda s, b: s * b)
+    out = table.lookup([0.8, np.nan, 0.8, np.inf, 0.9], [0.5, 0.5, np.nan, 0.5, 0.5], method=method, clip=clip)
+    value = out['value']
+    assert np.isnan(value[1:4]).all()
+    assert value[[0, 4]] == pytest.approx([0.4, 0.45])
+    assert np.isnan(table.lookup(np.nan, 0.5, method=method)['value'])
@@ -0,0 +1,34 @@
+# test_cycle_graph.py
+import numpy as np
+import pytest
+from utils.cycle_graph import CycleGraph
+from utils.general_analysis import GeneralAnalysis
+
+
+def test_matches_calculate_cycle():
+    a = GeneralAnalysis()
+    graph = CycleGraph(a, M_0=np.linspace(0.5, 2.0, 4), T_t4=1600.0)
+    expected = a.calculateCycle(M_0=np.linspace(0.5, 2.0, 4), T_t4=1600.0)
+    for name in expected.keys():
+        np.testing.assert_array_equal(graph[name], expected[name])
+
+
+def test_changing_P9rat_skips_the_upstream_stations():
+    a = GeneralAnalysis()
+    graph = CycleGraph(a)
+    graph.result()
+    assert graph.evaluations == len(a.CYCLE_GRAPH)
+    stale = graph.set(P9rat=1.1)
+    assert {'P_9', 'M_9', 'thrust'} <= stale
+    assert not stale & {'tau_c', 'pi_c', 'f', 'm_dot'}
+    before = graph.evaluations
+    assert graph['thrust'] == a.calculateCycle(P9rat=1.1).thrust
+    assert 0 < graph.evaluations - before < len(a.CYCLE_GRAPH)
+
+
+def test_unchanged_value_invalidates_nothing():
+    graph = CycleGraph()
+    graph.result()
+    assert graph.set(T_t4=graph['T_t4']) == set()
+    with pytest.raises(TypeError):
+        graph.set(thrust=1.0)
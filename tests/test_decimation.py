@@ -0,0 +1,91 @@
+# test_decimation.py
+import numpy as np
+import pytest
+from utils.decimation import decimate, lttb, minmax, visible_slice
+
+
+def reference_lttb(x, y, threshold):
+    # Direct transcription of Steinarsson's algorithm, one bucket and one candidate at a time
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    kept = [0]
+    a = 0
+    for k in range(threshold - 2):
+        start, stop = int(k * every) + 1, int((k + 1) * every) + 1
+        next_stop = min(int((k + 2) * every) + 1, n) if k < threshold - 3 else n
+        if k == threshold - 3:
+            cx, cy = x[n - 1], y[n - 1]
+        else:
+            cx, cy = np.mean(x[stop:next_stop]), np.mean(y[stop:next_stop])
+        best, best_area = start, -1.0
+        for i in range(start, stop):
+            area = abs((x[a] - cx) * (y[i] - y[a]) - (x[a] - x[i]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return np.array(kept)
+
+
+def series(n=10007, seed=3):
+    rng = np.random.default_rng(seed)
+    x = np.sort(rng.uniform(0.0, 100.0, n))
+    y = np.cumsum(rng.normal(size=n))
+    return x, y
+
+
+def test_minmax_keeps_extremes_in_order():
+    x, y = series()
+    y[1234] = 1e3
+    y[8765] = -1e3
+    xd, yd = minmax(x, y, 200)
+    assert xd.size <= 2 * 200 + 2
+    assert np.all(np.diff(xd) >= 0)
+    assert yd.max() == y.max() and yd.min() == y.min()
+    assert xd[0] == x[0] and xd[-1] == x[-1]
+    # Every kept point is an original point
+    assert np.all(np.isin(xd, x))
+
+
+def test_minmax_ignores_nans_unless_bucket_is_empty():
+    x = np.arange(100.0)
+    y = np.sin(x)
+    y[10:20] = np.nan
+    _, yd = minmax(x, y, 10)
+    assert np.nanmax(yd) == np.nanmax(y) and np.nanmin(yd) == np.nanmin(y)
+    assert np.isnan(yd).any()
+
+
+def test_lttb_matches_reference():
+    x, y = series(2003)
+    for threshold in (3, 10, 97, 500):
+        xd, yd = lttb(x, y, threshold)
+        index = reference_lttb(x, y, threshold)
+        assert xd.size == threshold
+        np.testing.assert_array_equal(xd, x[index])
+        np.testing.assert_array_equal(yd, y[index])
+
+
+def test_short_series_pass_through():
+    x, y = series(20)
+    assert minmax(x, y, 50)[0] is x
+    assert lttb(x, y, 50)[1] is y
+
+
+def test_xlim_decimates_only_the_view():
+    x, y = series()
+    view = visible_slice(x, (60.0, 40.0))
+    assert x[view.start] < 40.0 <= x[view.start + 1]
+    assert x[view.stop - 2] <= 60.0 < x[view.stop - 1]
+    xd, yd = decimate(x, y, 100, xlim=(40.0, 60.0))
+    inside = (x >= 40.0) & (x <= 60.0)
+    assert xd[0] <= 40.0 and xd[-1] >= 60.0
+    assert yd.max() >= y[inside].max() and yd.min() <= y[inside].min()
+    xd, _ = decimate(x, y, 100, method='lttb')
+    assert xd.size == 200
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        decimate([0.0, 1.0], [0.0, 1.0], 10, method='every_other')
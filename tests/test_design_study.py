@@ -0,0 +1,33 @@
+# test_design_study.py
+import numpy as np
+from model.design_study import DesignStudy
+from utils.general_analysis import GeneralAnalysis
+
+
+def test_reference_design_reproduces_reference_turbine():
+    analysis = GeneralAnalysis()
+    constants = DesignStudy(analysis).design_constants(analysis.pi_cR, analysis.T_t4R, analysis.M_0R)
+    assert np.isclose(constants['tau_t'], analysis.tau_tR, rtol=1e-3)
+    assert np.isclose(constants['pi_t'], analysis.pi_tR, rtol=1e-3)
+
+
+def test_turbine_follows_compressor_work():
+    constants = DesignStudy().design_constants(np.array([5.0, 20.0, 40.0]), 1600, 0.8)
+    assert np.all(np.diff(constants['tau_t']) < 0)
+    assert np.all(np.diff(constants['pi_t']) < 0)
+
+
+def test_unbalanced_designs_are_infeasible():
+    # At T_t4 barely above the compressor exit temperature there is no fuel to burn and no turbine work left
+    _, feasible, _ = DesignStudy().evaluate(np.array([10.0, 40.0]), np.array([1600.0, 700.0]), 0.8)
+    assert feasible.tolist() == [True, False]
+
+
+def test_specific_thrust_optimum_is_interior_and_physical():
+    study = DesignStudy(objective='tsfc', sense='max')
+    pi_c, T_t4, M_0 = np.linspace(2, 60, 15), np.linspace(1500, 1700, 5), np.linspace(0.6, 0.9, 4)
+    _, refined = study.optimize(pi_c, T_t4, M_0)
+    assert pi_c[0] < refined['pi_c'] < pi_c[-1]
+    _, feasible, outputs = study.evaluate(refined['pi_c'], refined['T_t4'], refined['M_0'])
+    assert feasible
+    assert 0.01 < outputs['f'][0] < 0.1
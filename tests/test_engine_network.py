@@ -0,0 +1,32 @@
+# test_engine_network.py
+import numpy as np
+import pytest
+from utils.general_analysis import GeneralAnalysis
+from model.engine_network import EngineNetwork
+
+
+def test_reference_design_is_a_match_point():
+    a = GeneralAnalysis()
+    network = EngineNetwork(a)
+    result = network.match(T_t4=a.T_t4R, M_0=a.M_0R, T_0=a.T_0R, P_0=a.P_0R)
+    assert result.converged.all()
+    assert result['pi_c'] == pytest.approx(a.pi_cR, rel=1e-8)
+    assert result['pi_t'] == pytest.approx(a.pi_tR, rel=1e-8)
+    assert result['m_dot'] == pytest.approx(a.m_dot_R, rel=1e-8)
+
+
+def test_batch_converges_with_small_residuals():
+    network = EngineNetwork()
+    T_t4 = np.linspace(1400.0, 1800.0, 5)[:, None]
+    M_0 = np.array([0.5, 1.0, 1.5, 2.0])
+    result = network.match(T_t4=T_t4, M_0=M_0, altitude=11.0)
+    assert result.converged.shape == (5, 4) and result.converged.all()
+    assert np.all(result.residual <= 1e-10)
+    # Throttling back lowers the compressor pressure ratio at every Mach number
+    assert np.all(np.diff(result['pi_c'], axis=0) > 0)
+    assert np.all(result['thrust'] > 0)
+
+
+def test_altitude_excludes_ambient():
+    with pytest.raises(ValueError):
+        EngineNetwork().match(altitude=5.0, T_0=250.0)
@@ -0,0 +1,55 @@
+# test_envelope_sweep.py
+import threading
+import numpy as np
+import pytest
+from utils.atmosphere import standard_atmosphere
+from utils.general_analysis import GeneralAnalysis
+from model.envelope_sweep import EnvelopeSweep
+
+GRID = {'M_0': np.linspace(0.2, 2.0, 11), 'altitude': np.linspace(0.0, 15.0, 7), 'T_t4': [1500.0, 1700.0]}
+
+
+def test_run_matches_calculate_cycle():
+    a = GeneralAnalysis()
+    result = EnvelopeSweep(a, chunk_size=17, atmosphere=standard_atmosphere).run(**GRID)
+    assert result.dims == ('M_0', 'altitude', 'T_t4') and result.shape == (11, 7, 2)
+    _, _, T_0, P_0, _, _ = standard_atmosphere(GRID['altitude'])
+    expected = a.calculateCycle(M_0=GRID['M_0'][:, None, None], T_0=T_0[:, None], P_0=P_0[:, None],
+                                T_t4=np.asarray(GRID['T_t4']))
+    np.testing.assert_allclose(result['thrust'], expected.thrust, rtol=1e-14)
+    np.testing.assert_allclose(result['tsfc'], expected.tsfc, rtol=1e-14)
+
+
+@pytest.mark.parametrize('buffers', [1, 3])
+def test_stream_concatenates_to_run(buffers):
+    sweep = EnvelopeSweep(chunk_size=13)
+    expected = sweep.run(**GRID)
+    thrust = np.empty(expected.shape).reshape(-1)
+    seen = set()
+    stop = 0
+    for chunk in sweep.stream(**GRID, buffers=buffers):
+        assert chunk.start == stop
+        stop = chunk.stop
+        thrust[chunk.start:chunk.stop] = chunk['thrust']
+        seen.add(id(chunk))
+        M_0 = np.asarray(GRID['M_0'])[np.unravel_index(np.arange(chunk.start, chunk.stop), expected.shape)[0]]
+        np.testing.assert_array_equal(chunk.inputs['M_0'], M_0)
+    assert stop == thrust.size
+    np.testing.assert_array_equal(thrust.reshape(expected.shape), expected['thrust'])
+    # The ring of buffers is reused for every chunk
+    assert len(seen) <= buffers
+
+
+def test_stream_cancel_stops_early():
+    sweep = EnvelopeSweep(chunk_size=10)
+    cancel = threading.Event()
+    chunks = 0
+    for _ in sweep.stream(**GRID, buffers=2, cancel=cancel):
+        chunks += 1
+        cancel.set()
+    assert 1 <= chunks < 154 // 10
+
+
+def test_altitude_excludes_ambient():
+    with pytest.raises(ValueError):
+        EnvelopeSweep().run(M_0=[0.5, 1.0], altitude=5.0, T_0=250.0)
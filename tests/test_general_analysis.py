@@ -0,0 +1,46 @@
+# test_general_analysis.py
+import numpy as np
+import pytest
+from utils.general_analysis import GeneralAnalysis
+
+POINTS = [
+    (1.5, 229.8, 30.8, 1670.0, 0.955),
+    (0.8, 250.0, 50.0, 1500.0, 0.9),
+    (2.0, 216.7, 19.4, 1800.0, 0.955),
+    (0.3, 288.15, 101.325, 1400.0, 0.98),
+]
+
+
+def baseline_arguments(a):
+    return (a.M_0, a.T_0, a.P_0, a.T_t4, a.P_9, a.g_c, a.gamma_c, a.c_pc, a.gamma_t, a.c_pt, a.pi_d_max, a.tau_cR,
+            a.T_t4R, a.tau_rR, a.eta_c, a.h_pR, a.eta_b, a.m_dot_R, a.P_0R, a.pi_rR, a.pi_cR, a.pi_b, a.pi_t, a.pi_n,
+            a.tau_t)
+
+
+@pytest.mark.parametrize('point', POINTS)
+def test_cycle_matches_scalar_baseline(point):
+    a = GeneralAnalysis(*point)
+    result = a.calculateCycle()
+    assert result.thrust == a.calculateThrust(*baseline_arguments(a))
+    assert result.tsfc == a.calculateTSFC(*baseline_arguments(a))
+    assert a.calculateThrustAndTSFC() == (result.thrust, result.tsfc)
+
+
+def test_arrays_broadcast_to_pointwise_results():
+    a = GeneralAnalysis()
+    M_0 = np.linspace(0.2, 2.0, 7)[:, None]
+    T_t4 = np.array([1400.0, 1600.0, 1800.0])
+    result = a.calculateCycle(M_0=M_0, T_t4=T_t4)
+    assert result.thrust.shape == result.tsfc.shape == (7, 3)
+    for i, j in np.ndindex(7, 3):
+        point = a.calculateCycle(M_0=float(M_0[i, 0]), T_t4=float(T_t4[j]))
+        assert result.thrust[i, j] == pytest.approx(point.thrust, rel=1e-14)
+        assert result.S[i, j] == pytest.approx(point.S, rel=1e-14)
+
+
+def test_constant_override_and_unknown_name():
+    a = GeneralAnalysis()
+    assert a.calculateCycle(eta_c=a.eta_c).thrust == a.calculateCycle().thrust
+    assert a.calculateCycle(eta_c=0.8).thrust != a.calculateCycle().thrust
+    with pytest.raises(TypeError):
+        a.calculateCycle(not_a_constant=1.0)
@@ -0,0 +1,39 @@
+# test_inverse_solver.py
+import numpy as np
+import pytest
+from utils.general_analysis import GeneralAnalysis
+from model.inverse_solver import InverseSolver
+
+
+def test_recovers_known_T_t4():
+    a = GeneralAnalysis()
+    M_0 = np.array([0.5, 1.0, 1.5, 2.0])
+    T_t4 = np.array([1300.0, 1500.0, 1700.0, 1900.0])
+    target = a.calculateCycle(M_0=M_0, T_t4=T_t4).thrust
+    result = InverseSolver(a).solve(target, M_0=M_0)
+    assert result.converged.all() and result.reachable.all()
+    np.testing.assert_allclose(result.achieved, target, rtol=1e-9)
+    np.testing.assert_allclose(a.calculateCycle(M_0=M_0, T_t4=result.value).thrust, target, rtol=1e-9)
+
+
+def test_solves_for_P9rat():
+    a = GeneralAnalysis()
+    target = a.calculateCycle(P9rat=1.2).thrust
+    result = InverseSolver(a, variable='P9rat', xtol=1e-12).solve(target)
+    assert result.converged
+    assert result.achieved == pytest.approx(target, rel=1e-9)
+
+
+def test_unreachable_target_is_flagged():
+    a = GeneralAnalysis()
+    reachable = a.calculateCycle(T_t4=1600.0).thrust
+    result = InverseSolver(a).solve(np.array([reachable, 1e9]))
+    assert result.reachable.tolist() == [True, False]
+    assert result.unreachable[0].tolist() == [1]
+    assert np.isnan(result.value[1]) and np.isnan(result.achieved[1])
+    assert result.output_max[1] < 1e9
+
+
+def test_rejects_other_variables():
+    with pytest.raises(ValueError):
+        InverseSolver(variable='M_0')
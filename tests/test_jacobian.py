@@ -0,0 +1,48 @@
+# test_jacobian.py
+import numpy as np
+import pytest
+from utils.general_analysis import GeneralAnalysis
+
+
+def central_difference(a, output, variable, point):
+    x = point[variable]
+    h = 1e-6 * max(abs(x), 1.0)
+    upper = a.calculateCycle(**{**point, variable: x + h})[output]
+    lower = a.calculateCycle(**{**point, variable: x - h})[output]
+    return (upper - lower) / (2 * h)
+
+
+@pytest.mark.parametrize('output', ['thrust', 'tsfc'])
+def test_matches_central_differences(output):
+    a = GeneralAnalysis()
+    J = a.calculateJacobian(outputs=(output,))
+    point = {**{name: float(getattr(a, name)) for name in a.CYCLE_INPUTS}, **a.designConstants()}
+    for variable in J.wrt:
+        expected = central_difference(a, output, variable, point)
+        assert J[output][variable] == pytest.approx(expected, rel=1e-4, abs=1e-6 * abs(J.values[output]))
+
+
+def test_values_and_matrix_shape():
+    a = GeneralAnalysis()
+    J = a.calculateJacobian()
+    result = a.calculateCycle()
+    assert J.values['thrust'] == pytest.approx(result.thrust, rel=1e-15)
+    assert J.values['tsfc'] == pytest.approx(result.tsfc, rel=1e-15)
+    assert len(J.wrt) == len(a.CYCLE_INPUTS) + len(a.designConstants())
+    assert J.matrix().shape == (2, len(J.wrt))
+
+
+def test_chunked_sweep_matches_pointwise():
+    a = GeneralAnalysis()
+    M_0 = np.linspace(0.3, 2.0, 5)[:, None]
+    T_t4 = np.array([1500.0, 1700.0])
+    J = a.calculateJacobian(M_0=M_0, T_t4=T_t4, wrt=('M_0', 'T_t4', 'eta_c'), chunk_size=9)
+    assert J.matrix().shape == (5, 2, 2, 3)
+    for i, j in np.ndindex(5, 2):
+        point = a.calculateJacobian(M_0=M_0[i, 0], T_t4=T_t4[j], wrt=('M_0', 'T_t4', 'eta_c'))
+        np.testing.assert_allclose(J.matrix()[i, j], point.matrix(), rtol=1e-12)
+
+
+def test_unknown_variable():
+    with pytest.raises(TypeError):
+        GeneralAnalysis().calculateJacobian(wrt=('altitude',))
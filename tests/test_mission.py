@@ -0,0 +1,45 @@
+# test_mission.py
+import numpy as np
+import pytest
+from utils.atmosphere import standard_atmosphere
+from utils.general_analysis import GeneralAnalysis
+from model.mission import Mission
+
+
+def test_constant_cruise_burns_S_times_thrust_times_time():
+    a = GeneralAnalysis()
+    mission = Mission(a, engines=2, atmosphere=standard_atmosphere)
+    t = np.linspace(0.0, 3600.0, 13)
+    result = mission.run(t, 11.0, 1.5, 60000.0)
+    assert result.feasible and not result.idle.any()
+    _, _, T_0, P_0, _, _ = standard_atmosphere(11.0)
+    S = a.calculateCycle(M_0=1.5, T_0=T_0, P_0=P_0, T_t4=result.T_t4[0]).S
+    assert result.fuel == pytest.approx(S * 60000.0 * 3600.0, rel=1e-8)
+    np.testing.assert_allclose(np.diff(result.fuel_used), result.fuel / 12, rtol=1e-8)
+    assert result.weight_change == pytest.approx(result.fuel * 9.80665)
+
+
+def test_batch_matches_single_profiles():
+    mission = Mission()
+    t = np.linspace(0.0, 600.0, 6)
+    altitude = np.array([[0.0, 2.0, 4.0, 6.0, 8.0, 10.0], [10.0, 10.0, 10.0, 10.0, 10.0, 10.0]])
+    thrust = np.array([[45000.0], [30000.0]])
+    batch = mission.run(t, altitude, 0.8, thrust)
+    for k in range(2):
+        single = mission.run(t, altitude[k], 0.8, thrust[k])
+        assert batch.fuel[k] == pytest.approx(single.fuel, rel=1e-12)
+
+
+def test_unreachable_and_idle_knots():
+    mission = Mission()
+    t = np.array([0.0, 60.0, 120.0])
+    too_much = mission.run(t, 5.0, 0.8, [40000.0, 1e8, 40000.0])
+    assert not too_much.feasible and np.isnan(too_much.fuel)
+    descent = mission.run(t, 5.0, 0.8, [40000.0, 0.0, 40000.0])
+    assert descent.feasible and descent.idle.tolist() == [False, True, False]
+    assert descent.T_t4[1] == mission.solver.bounds[0]
+
+
+def test_times_must_increase():
+    with pytest.raises(ValueError):
+        Mission().run([0.0, 0.0], 5.0, 0.8, 40000.0)
@@ -0,0 +1,66 @@
+# test_parallel_evaluator.py
+import numpy as np
+import pytest
+from multiprocessing import shared_memory
+from utils.general_analysis import GeneralAnalysis
+from model import parallel_evaluator
+from model.parallel_evaluator import ParallelCycleEvaluator
+
+
+@pytest.fixture
+def created_blocks(monkeypatch):
+    # Names of the SharedMemory blocks the evaluator creates in this process
+    names = []
+
+    class Recording(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0, **kwargs):
+            super().__init__(name=name, create=create, size=size, **kwargs)
+            if create:
+                names.append(self.name)
+
+    monkeypatch.setattr(parallel_evaluator.shared_memory, 'SharedMemory', Recording)
+    return names
+
+
+def test_workers_agree_with_calculate_cycle(created_blocks):
+    a = GeneralAnalysis()
+    M_0 = np.linspace(0.2, 2.0, 50)
+    T_t4 = np.linspace(1400.0, 1800.0, 50)
+    serial = ParallelCycleEvaluator(a, workers=1, chunk_size=7).evaluate(M_0=M_0, T_t4=T_t4, P9rat=1.0)
+    pooled = ParallelCycleEvaluator(a, workers=2, chunk_size=7).evaluate(M_0=M_0, T_t4=T_t4, P9rat=1.0)
+    expected = a.calculateCycle(M_0=M_0, T_t4=T_t4, P9rat=1.0)
+    for name in ('thrust', 'tsfc'):
+        np.testing.assert_array_equal(serial[name], pooled[name])
+        np.testing.assert_array_equal(pooled[name], expected[name])
+
+    # The pool path ran, and both of its blocks are gone afterwards
+    assert len(created_blocks) == 2
+    for name in created_blocks:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_broadcast_shape():
+    a = GeneralAnalysis()
+    M_0 = np.linspace(0.2, 2.0, 9)[:, None]
+    T_t4 = np.linspace(1400.0, 1800.0, 4)[None, :]
+    result = ParallelCycleEvaluator(a, outputs=('thrust', 'S'), workers=2, chunk_size=5).evaluate(M_0=M_0, T_t4=T_t4)
+    expected = a.calculateCycle(M_0=M_0, T_t4=T_t4)
+    assert result['thrust'].shape == result['S'].shape == (9, 4)
+    np.testing.assert_array_equal(result['thrust'], expected.thrust)
+    np.testing.assert_array_equal(result['S'], expected.S)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_all_scalar_inputs(workers):
+    a = GeneralAnalysis()
+    result = ParallelCycleEvaluator(a, workers=workers).evaluate(M_0=0.8, T_t4=1500.0)
+    assert np.shape(result['thrust']) == ()
+    assert result['thrust'] == a.calculateCycle(M_0=0.8, T_t4=1500.0).thrust
+
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        ParallelCycleEvaluator(workers=0)
+    with pytest.raises(ValueError):
+        ParallelCycleEvaluator(chunk_size=0)
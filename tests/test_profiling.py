@@ -0,0 +1,69 @@
+# test_profiling.py
+import json
+import pytest
+from utils.general_analysis import GeneralAnalysis
+from utils.profiling import StageProfiler
+from model.turbojet_model import TurbojetModel
+
+INPUTS = {'M_0': 0.0, 'M_1': 2.0, 'T_0': 229.8, 'P_0': 30.8, 'T_t4': 1670.0, 'P9rat': 0.955, 'num_points': 1000}
+
+
+@pytest.fixture
+def profiler():
+    profiler = StageProfiler()
+    TurbojetModel(profiler=profiler, **INPUTS).calculate(chunk_size=300)
+    return profiler
+
+
+def test_stage_totals_add_up_to_the_root(profiler):
+    frames = {tuple(row['stack']): row for row in profiler.report()}
+    root = frames[('TurbojetModel.calculate',)]
+    cycle = frames[('TurbojetModel.calculate', 'calculateCycle')]
+    assert root['calls'] == 1 and root['points'] == 1000
+    assert cycle['calls'] == 4 and cycle['points'] == 1000
+    stages = [row for stack, row in frames.items() if len(stack) == 3]
+    assert {row['stack'][-1] for row in stages} == set(GeneralAnalysis.CYCLE_STAGES.values())
+    assert sum(row['total_s'] for row in stages) <= cycle['total_s'] <= root['total_s']
+    # Each stage is exactly the sum of its methods, and self times over the tree add up to the root
+    for stage in stages:
+        methods = [row for stack, row in frames.items() if stack[:3] == tuple(stage['stack']) and len(stack) == 4]
+        assert sum(row['total_s'] for row in methods) == pytest.approx(stage['total_s'], rel=1e-9, abs=1e-12)
+    assert sum(row['self_s'] for row in frames.values()) == pytest.approx(root['total_s'], rel=1e-6)
+
+
+def test_shared_methods_count_points_once(profiler):
+    totals = profiler.by_name()
+    for method in ('calc_T9T0Rat', 'calc_T_9', 'calc_T_t2', 'calc_tau_c', 'compressor', 'nozzle'):
+        assert totals[method]['calls'] == 4
+        assert totals[method]['points'] == 1000
+
+
+def test_nozzle_holds_P_9():
+    stages = GeneralAnalysis.CYCLE_STAGES
+    assert stages['P_9'] == 'nozzle'
+    assert stages['T_t2'] == stages['T_t2R'] == 'compressor'
+    order = [name for name, _, _ in GeneralAnalysis.CYCLE_GRAPH]
+    nozzle = [i for i, name in enumerate(order) if stages[name] == 'nozzle']
+    assert nozzle == list(range(nozzle[0], nozzle[-1] + 1))
+
+
+def test_folded_lines_parse(profiler, tmp_path):
+    text = profiler.to_folded(tmp_path / 'profile.folded')
+    assert (tmp_path / 'profile.folded').read_text() == text
+    lines = text.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0
+        frames = stack.split(';')
+        assert frames[0] == 'TurbojetModel.calculate' and all(frames)
+
+
+def test_json_round_trip(profiler, tmp_path):
+    text = profiler.to_json(tmp_path / 'profile.json')
+    data = json.loads((tmp_path / 'profile.json').read_text())
+    assert data == json.loads(text)
+    assert data['frames'] == profiler.report()
+    assert data['totals'] == profiler.by_name()
+    profiler.reset()
+    assert profiler.report() == [] and profiler.to_folded() == ''
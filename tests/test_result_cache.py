@@ -0,0 +1,111 @@
+# test_result_cache.py
+import os
+import numpy as np
+import pytest
+from model.result_cache import ResultCache
+from model.turbojet_model import TurbojetModel
+
+INPUTS = {'M_0': 0.0, 'M_1': 2.0, 'T_0': 229.8, 'P_0': 30.8, 'T_t4': 1670.0, 'P9rat': 0.955, 'num_points': 200}
+
+
+def entry(n, value=0.0):
+    # n float64 values, so n * 8 bytes
+    return (np.full(n, value),)
+
+
+def test_lru_eviction_and_byte_accounting():
+    cache = ResultCache(max_bytes=3 * 800)
+    for key in 'abc':
+        cache.put(key, entry(100))
+    assert cache.bytes == 2400
+    cache.get('a')              # a becomes most recently used, so b is the oldest
+    cache.put('d', entry(100))
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in 'acd')
+    assert cache.bytes == 2400 and cache.evictions == 1
+    cache.put('a', entry(50))   # replacing an entry releases its old bytes
+    assert cache.bytes == 2000
+
+
+def test_oversized_entry_is_kept_only_on_disk(tmp_path):
+    cache = ResultCache(max_bytes=800, disk_dir=tmp_path)
+    cache.put('small', entry(50))
+    cache.put('big', entry(1000, 2.0))
+    assert cache.stats()['entries'] == 0 and cache.bytes == 0
+    assert os.path.exists(tmp_path / 'big.npz')
+    arrays = cache.get('big')
+    np.testing.assert_array_equal(arrays[0], np.full(1000, 2.0))
+    assert cache.disk_hits == 1 and cache.bytes == 0
+
+
+def test_disk_entry_survives_a_new_cache(tmp_path):
+    model = TurbojetModel(**INPUTS)
+    first = ResultCache(disk_dir=tmp_path)
+    expected = model.calculate(cache=first)
+    second = ResultCache(disk_dir=tmp_path)
+    mach, thrust, tsfc = model.calculate(cache=second)
+    assert second.disk_hits == 1 and second.hits == 1 and second.misses == 0
+    np.testing.assert_array_equal(mach, expected[0])
+    assert thrust == expected[1] and tsfc == expected[2]
+    # Now in memory, so the next hit does not touch the disk
+    model.calculate(cache=second)
+    assert second.hits == 2 and second.disk_hits == 1
+
+
+def test_changed_design_constant_misses():
+    model = TurbojetModel(**INPUTS)
+    cache = ResultCache()
+    baseline = model.calculate(cache=cache)
+    build = model.analysis
+
+    def degraded():
+        analysis = build()
+        analysis.eta_c = 0.8
+        return analysis
+
+    model.analysis = degraded
+    changed = model.calculate(cache=cache)
+    assert cache.misses == 2 and cache.hits == 0
+    assert changed[1] != baseline[1]
+
+
+def test_invalidate_memory_only_or_both(tmp_path):
+    cache = ResultCache(disk_dir=tmp_path)
+    cache.put('a', entry(10))
+    cache.invalidate(disk=False)
+    assert cache.stats()['entries'] == 0 and cache.bytes == 0
+    assert cache.get('a') is not None and cache.disk_hits == 1
+    cache.invalidate()
+    assert os.listdir(tmp_path) == []
+    assert cache.get('a') is None
+
+
+def test_stats_counters():
+    cache = ResultCache()
+    assert cache.stats()['hit_rate'] == 0.0
+    cache.put('a', entry(10))
+    cache.get('a')
+    cache.get('a')
+    cache.get('missing')
+    assert cache.stats() == {'hits': 2, 'disk_hits': 0, 'misses': 1, 'hit_rate': pytest.approx(2 / 3),
+                             'evictions': 0, 'entries': 1, 'bytes': 80}
+
+
+@pytest.mark.parametrize('contents', [b'', b'PK\x03\x04 truncated', b'not an npz at all'])
+def test_corrupt_file_is_a_miss(tmp_path, contents):
+    cache = ResultCache(disk_dir=tmp_path)
+    cache.put('a', entry(10))
+    with open(tmp_path / 'a.npz', 'wb') as f:
+        f.write(contents)
+    fresh = ResultCache(disk_dir=tmp_path)
+    assert fresh.get('a') is None
+    assert fresh.misses == 1 and fresh.disk_hits == 0
+
+
+def test_truncated_file_is_a_miss(tmp_path):
+    cache = ResultCache(disk_dir=tmp_path)
+    cache.put('a', entry(1000))
+    path = tmp_path / 'a.npz'
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+    assert ResultCache(disk_dir=tmp_path).get('a') is None
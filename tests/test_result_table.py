@@ -0,0 +1,61 @@
+# test_result_table.py
+import numpy as np
+import pytest
+from model.result_table import ResultTable
+from model.turbojet_model import TurbojetModel
+
+
+def make_table(dtype=None):
+    coords = {'M_0': np.linspace(0.1, 2.0, 7), 'altitude': np.array([0.0, 3.3, 11.1])}
+    columns = {'thrust': np.arange(21.0).reshape(7, 3), 'tsfc': np.ones((7, 3))}
+    return ResultTable(('M_0', 'altitude'), coords, columns, {'T_t4': 1670.0}, dtype)
+
+
+def test_save_load_round_trip(tmp_path):
+    table = make_table()
+    table.save(str(tmp_path))
+    loaded = ResultTable.load(str(tmp_path))
+    assert loaded.dims == table.dims and loaded.fixed == table.fixed
+    for name in table.keys():
+        np.testing.assert_array_equal(loaded[name], table[name])
+    assert isinstance(loaded['thrust'], np.memmap)
+
+
+def test_float32_columns_keep_exact_axes(tmp_path):
+    table = make_table(np.float32)
+    assert table['thrust'].dtype == np.float32
+    assert table['M_0'].dtype == np.float64
+    table.save(str(tmp_path))
+    loaded = ResultTable.load(str(tmp_path))
+    np.testing.assert_array_equal(loaded['altitude'], [0.0, 3.3, 11.1])
+
+
+def test_slices_are_views():
+    table = make_table()
+    part = table[2:5, ::2]
+    assert part.shape == (3, 2)
+    assert np.shares_memory(part['thrust'], table['thrust'])
+    np.testing.assert_array_equal(part['altitude'], [0.0, 11.1])
+
+
+def test_set_axes_rewrites_index(tmp_path):
+    table = ResultTable.create(str(tmp_path), ('M_0',), {'M_0': [0.1, 0.2]}, ['thrust'], np.float32)
+    table['thrust'][:] = [1.0, 2.0]
+    table.flush()
+    table.set_axes(coords={'M_0': [0.15, 0.25]}, fixed={'T_t4': 1500.0})
+    loaded = ResultTable.load(str(tmp_path))
+    np.testing.assert_array_equal(loaded['M_0'], [0.15, 0.25])
+    assert loaded.fixed == {'T_t4': 1500.0}
+    with pytest.raises(ValueError):
+        table.set_axes(coords={'M_0': [0.1]})
+
+
+def test_envelope_table_on_disk_matches_memory(tmp_path):
+    model = TurbojetModel(M_0=0.0, M_1=2.0, T_0=229.8, P_0=30.8, T_t4=1670, P9rat=0.955, num_points=10)
+    grid = {'M_0': np.linspace(0.1, 2.0, 5), 'altitude': np.array([0.0, 1.7, 9.3])}
+    on_disk = model.calculate_envelope_table(str(tmp_path), **grid)
+    in_memory = model.calculate_envelope_table(**grid)
+    loaded = ResultTable.load(str(tmp_path))
+    np.testing.assert_array_equal(loaded['altitude'], grid['altitude'])
+    np.testing.assert_array_equal(loaded['thrust'], in_memory['thrust'])
+    assert loaded.fixed == on_disk.fixed
@@ -0,0 +1,58 @@
+# test_spool_transient.py
+import numpy as np
+import pytest
+from model.spool_transient import SpoolTransient
+
+
+def test_dopri_matches_rk4():
+    spool = SpoolTransient()
+    times, schedule = [0.0, 1.0, 5.0], [1300.0, 1700.0, 1700.0]
+    rk4 = spool.simulate(times, schedule, method='rk4', dt=0.001)
+    dopri = spool.simulate(times, schedule, method='dopri', rtol=1e-8, atol=1e-6)
+    assert np.isclose(dopri.N[-1], rk4.N[-1], rtol=1e-6).all()
+
+
+def test_dopri_stops_on_non_finite_rates():
+    spool = SpoolTransient()
+    spool.derivative = lambda N, T_t4, condition: np.full(np.shape(N), np.nan)
+    with pytest.raises(RuntimeError, match="not finite"):
+        spool.simulate([0.0, 1.0], [1500.0, 1500.0], N_0=15000.0, method='dopri')
+
+
+def test_dopri_stops_when_rates_blow_up_mid_run():
+    spool = SpoolTransient()
+    derivative = spool.derivative
+    spool.derivative = lambda N, T_t4, condition: np.where(N > 15500, np.nan, derivative(N, T_t4, condition) + 1000)
+    with pytest.raises(RuntimeError):
+        spool.simulate([0.0, 10.0], [1500.0, 1500.0], N_0=15000.0, method='dopri')
+
+
+@pytest.mark.parametrize('method', ['euler', 'rk4', 'dopri'])
+def test_batch_matches_single_schedules(method):
+    spool = SpoolTransient()
+    times = [0.0, 0.5, 2.0, 4.0]
+    schedules = np.array([[1300.0, 1700.0, 1700.0, 1500.0],
+                          [1600.0, 1600.0, 1400.0, 1400.0],
+                          [1800.0, 1200.0, 1500.0, 1650.0]])
+    options = {'dt': 0.002, 'rtol': 1e-10, 'atol': 1e-7}
+    batch = spool.simulate(times, schedules, method=method, **options)
+    assert batch.N.shape[1:] == (3,)
+    for k, schedule in enumerate(schedules):
+        single = spool.simulate(times, schedule, method=method, **options)
+        if method == 'dopri':
+            # The adaptive step is shared by the batch, so only the accuracy, not the grid, is common
+            assert single.N[-1, 0] == pytest.approx(batch.N[-1, k], rel=1e-6)
+        else:
+            np.testing.assert_array_equal(single.t, batch.t)
+            np.testing.assert_allclose(single.N[:, 0], batch.N[:, k], rtol=1e-13)
+            np.testing.assert_allclose(single.T_t4[:, 0], batch.T_t4[:, k], rtol=1e-13)
+
+
+@pytest.mark.parametrize('method', ['euler', 'rk4', 'dopri'])
+def test_held_throttle_stays_at_steady_state(method):
+    spool = SpoolTransient()
+    T_t4 = np.array([spool.analysis.T_t4R, spool.analysis.T_t4, 1400.0])
+    steady = spool.steady_state_speed(T_t4)
+    result = spool.simulate([0.0, 5.0], np.stack([T_t4, T_t4], axis=-1), method=method, dt=0.01)
+    np.testing.assert_allclose(result.N[0], steady, rtol=1e-15)
+    np.testing.assert_allclose(result.N, np.broadcast_to(steady, result.N.shape), rtol=1e-9)
@@ -0,0 +1,47 @@
+# test_turbine.py
+import threading
+import numpy as np
+from utils.turbine import EnthalpyTable, TVel2h_total, get_air, static_enthalpy
+
+
+def test_non_finite_temperatures_give_nan():
+    t = np.array([300.0, np.nan, np.inf, 1500.0])
+    h = static_enthalpy(t)
+    assert np.isnan(h[1:3]).all() and np.isfinite(h[[0, 3]]).all()
+    table = EnthalpyTable(resolution=5.0)
+    looked_up = table.lookup(t)
+    assert np.isnan(looked_up[1:3]).all()
+    np.testing.assert_allclose(looked_up[[0, 3]], h[[0, 3]], rtol=1e-4)
+    assert np.isnan(TVel2h_total(300.0, np.nan))
+
+
+def test_each_thread_gets_its_own_solution():
+    solutions = {}
+
+    def record(name):
+        solutions[name] = get_air()
+
+    threads = [threading.Thread(target=record, args=(k,)) for k in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert solutions[0] is not solutions[1]
+    assert get_air() is get_air()
+
+
+def test_threads_agree_with_serial_result():
+    t = np.linspace(250, 2000, 200)
+    expected = static_enthalpy(t)
+    results = [None] * 4
+
+    def run(k):
+        results[k] = static_enthalpy(t)
+
+    threads = [threading.Thread(target=run, args=(k,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for result in results:
+        np.testing.assert_array_equal(result, expected)
@@ -0,0 +1,62 @@
+# test_uncertainty.py
+import numpy as np
+import pytest
+from model.uncertainty import RunningStats, UncertaintyAnalysis
+
+
+def test_running_stats_match_numpy_with_small_chunks():
+    values = np.random.default_rng(0).normal(3.0, 2.0, 100000)
+    stats = RunningStats(bins=4096)
+    for chunk in np.array_split(values, 1000):
+        stats.update(chunk)
+    assert stats.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert stats.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    q = [0.1, 1, 50, 99, 99.9]
+    estimate = stats.percentile(q)
+    assert np.isfinite(estimate).all()
+    np.testing.assert_allclose(estimate, np.percentile(values, q), atol=0.02)
+    assert stats.below == stats.above == 0
+
+
+def test_given_range_counts_values_outside():
+    stats = RunningStats(bins=10, range=(0.0, 1.0))
+    stats.update([-1.0, 0.5, 2.0, np.nan])
+    assert (stats.below, stats.above, stats.nan_count, stats.count) == (1, 1, 1, 3)
+    assert stats.min == -1.0 and stats.max == 2.0
+
+
+def test_samples_do_not_depend_on_chunk_size():
+    spec = {'eta_c': ('normal', 0.8641, 0.01), 'pi_b': ('uniform', 0.92, 0.96)}
+    small = UncertaintyAnalysis(spec, chunk_size=16).run(5000, seed=7, M_0=0.8)
+    large = UncertaintyAnalysis(spec, chunk_size=100000).run(5000, seed=7, M_0=0.8)
+    for name in ('thrust', 'S'):
+        assert small[name].mean == pytest.approx(large[name].mean, rel=1e-12)
+        assert small[name].min == large[name].min and small[name].max == large[name].max
+        assert np.isfinite(small[name].percentile([1, 99])).all()
+
+
+def test_unknown_constant_and_bad_distribution():
+    with pytest.raises(TypeError):
+        UncertaintyAnalysis({'not_a_constant': ('normal', 0, 1)})
+    with pytest.raises(ValueError):
+        UncertaintyAnalysis({'eta_c': ('normal', 0.8)})
+
+
+@pytest.mark.parametrize('range_', [None, (0.0, 10.0)])
+def test_infinities_are_counted_and_excluded(range_):
+    stats = RunningStats(bins=16, range=range_)
+    stats.update([1.0, np.inf, 2.0])
+    stats.update([-np.inf, np.nan, 3.0])
+    assert (stats.count, stats.nan_count, stats.inf_count) == (3, 1, 2)
+    assert stats.mean == pytest.approx(2.0) and stats.std == pytest.approx(1.0)
+    assert (stats.min, stats.max) == (1.0, 3.0)
+    assert np.isfinite(stats.edges).all() and stats.counts.sum() == 3
+    assert np.isfinite(stats.percentile([1, 50, 99])).all()
+    assert stats.summary()['inf_count'] == 2
+
+
+def test_all_non_finite_chunk_leaves_stats_empty():
+    stats = RunningStats()
+    stats.update([np.inf, -np.inf, np.nan])
+    assert stats.count == 0 and stats.edges is None
+    assert np.isnan(stats.percentile(50))
@@ -0,0 +1,65 @@
+# test_units.py
+import numpy as np
+import pytest
+from utils.units import UnitRegistry, units
+from utils.unit_conversions import UnitConversions
+
+
+@pytest.mark.parametrize('dimension', ['temperature', 'pressure', 'length', 'mass flow', 'force', 'energy'])
+def test_round_trip_through_every_unit(dimension):
+    values = np.linspace(-50.0, 5000.0, 101)
+    base = units.units(dimension)[0]
+    for unit in units.units(dimension):
+        there = units.convert(values, base, unit)
+        np.testing.assert_allclose(units.convert(there, unit, base), values, rtol=1e-12, atol=1e-9)
+
+
+def test_known_values():
+    assert units.convert(212.0, 'F', 'K') == pytest.approx(373.15)
+    assert units.convert(1.0, 'atm', 'kPa') == pytest.approx(101.325)
+    assert units.convert(1.0, 'psia', 'Pa') == pytest.approx(6894.757293168)
+    assert units.convert(3600.0, 'lbm/hr', 'kg/s') == pytest.approx(0.45359237)
+    assert units.convert(1000.0, 'ft', 'km') == pytest.approx(0.3048)
+
+
+def test_chain_is_fused():
+    direct = units.conversion('F', 'K')
+    chained = units.conversion('F', 'C', 'R', 'K')
+    assert chained.scale == pytest.approx(direct.scale) and chained.offset == pytest.approx(direct.offset)
+    assert units.conversion('F', 'C', 'R', 'K') is chained
+
+
+def test_in_place_conversion():
+    values = np.array([32.0, 212.0])
+    result = units.convert(values, 'F', 'C', inplace=True)
+    assert result is values
+    np.testing.assert_allclose(values, [0.0, 100.0], atol=1e-12)
+    with pytest.raises(TypeError):
+        units.convert(np.arange(3), 'ft', 'm', inplace=True)
+    np.testing.assert_allclose(units.convert(np.arange(3), 'ft', 'm'), [0.0, 0.3048, 0.6096])
+
+
+def test_convert_columns():
+    columns = {'altitude': np.array([0.0, 36089.0]), 'P_0': np.array([14.696]), 'M_0': np.array([0.8])}
+    units.convert_columns(columns, {'altitude': 'ft', 'P_0': 'psia'}, {'altitude': 'km', 'P_0': 'kPa'})
+    np.testing.assert_allclose(columns['altitude'], [0.0, 11.0], rtol=1e-4)
+    np.testing.assert_allclose(columns['P_0'], [101.325], rtol=1e-4)
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        units.conversion('ft', 'K')
+    with pytest.raises(ValueError):
+        units.conversion('furlong', 'm')
+    registry = UnitRegistry()
+    with pytest.raises(ValueError):
+        registry.conversion('m')
+
+
+def test_legacy_shims_keep_their_factors():
+    assert UnitConversions.lbhr_to_kgs(1.0) == 4.53592e-4
+    assert UnitConversions.kgs_to_lbhr(1.0) == 2204.62
+    assert UnitConversions.psia_to_Pa(1.0) == 6894.76
+    assert UnitConversions.F_to_K(212.0) == (212.0 - 32) * 5 / 9 + 273.15
+    assert UnitConversions.lbm_hr_to_kg_s(3600.0) == pytest.approx(0.45359237)
+    assert UnitConversions.kg_s_to_lbm_hr(UnitConversions.lbm_hr_to_kg_s(123.0)) == pytest.approx(123.0)
@@ -0,0 +1,209 @@
+# atmosphere.py
+# Standard atmosphere shared by GeneralAnalysis, the GUI and the sweep tools.
+# standard_atmosphere() evaluates the model directly on scalars or arrays, AtmosphereTable trades a small,
+# bounded interpolation error for a single table lookup per altitude and is what the sweep tools use.
+import numpy as np
+
+r_e = 3959*5280                       # earth radius, miles to feet
+R = 1716.5                            # ft2/R-sec
+g0 = 32.174                           # ft/s^2
+T0 = 518.69                           # sea level temperature, deg R
+P0 = 2116.22                          # sea level pressure, psf
+rho0 = 2.3769e-3                      # sea level density, slugs/ft3
+a1 = -3.57/1000                       # tropospheric lapse rate, deg R/ft
+h_trop = 36000                        # tropopause altitude (ft)
+T_trop = 389.99                       # constant stratosphere temperature, deg R
+P_trop = 4.760119191888137e+2         # from anderson
+rho_trop = 7.103559955456123e-4       # from running code at 36000
+
+
+def standard_atmosphere(h_G_km):
+    """
+    Evaluate the standard atmosphere at one or many geometric altitudes.
+
+    Parameters:
+    - h_G_km (float or array): Geometric altitude in kilometers.
+
+    Returns:
+    - list: [h_G (km), h (geopotential altitude, km), T (K), P (kPa), rho (kg/m^3), a (m/s)],
+      each a scalar or an array with the shape of h_G_km.
+    """
+    h_G = np.asarray(h_G_km, dtype=float)*3280.84    # Kilometers to feet
+    h = (r_e/(r_e + h_G))*h_G                        # geopotential altitude from geometric altitude
+    troposphere = h < h_trop
+
+    # standard atmosphere maths up until tropopause (altitude clipped so the unused branch stays finite)
+    T_lapse = T0 + a1*np.minimum(h, h_trop)
+    P_lapse = P0*(T_lapse/T0)**(-g0/(R*a1))
+    rho_lapse = rho0*(T_lapse/T0)**(-((g0/(R*a1)) + 1))
+
+    # isothermal layer above the tropopause
+    P_iso = P_trop*np.exp((-g0/(R*T_trop)*(h - h_trop)))
+    rho_iso = rho_trop*np.exp(-(g0/(R*T_trop)*(h - h_trop)))
+
+    T = np.where(troposphere, T_lapse, T_trop)
+    P = np.where(troposphere, P_lapse, P_iso)
+    rho = np.where(troposphere, rho_lapse, rho_iso)
+    a = np.sqrt(1.4*P/rho)            # speed of sound
+
+    values = [
+        h_G/3280.84,                  # Feet to Km
+        h/3280.84,                    # Geopotential altitude in km
+        T*0.555556,                   # Rankine to Kelvin
+        P/0.020885/1000,              # Psf to KPa
+        rho*515.4,                    # Slugs/ft^3 to kg/m^3
+        a/3.281,                      # Local m/s
+    ]
+    if np.ndim(h_G_km) == 0:
+        return [v[()] for v in values]
+    return values
+
+
+def _tropopause_km():
+    # Smallest geometric altitude (km) the model places in the isothermal layer, and the float just below it
+    split = h_trop*r_e/(r_e - h_trop)/3280.84
+    while standard_atmosphere(split)[1] >= h_trop/3280.84:
+        split = np.nextafter(split, -np.inf)
+    while standard_atmosphere(split)[1] < h_trop/3280.84:
+        split = np.nextafter(split, np.inf)
+    return np.nextafter(split, -np.inf), split
+
+
+class AtmosphereTable:
+    """
+    Precomputed standard atmosphere with linear interpolation.
+
+    The table is one evenly spaced grid of cells, so a lookup is index arithmetic, one gather of a start
+    value and a slope per column, and a multiply-add; nothing is searched. The two layers of the model do not
+    quite meet at the tropopause, so the spacing is chosen to put a cell edge exactly there and each cell
+    stores its own end values, taken from the layer it lies in. Geopotential altitude is cheap enough to
+    compute exactly. Altitudes outside the table fall back to standard_atmosphere(), and NaN altitudes give
+    NaN outputs.
+    """
+
+    def __init__(self, h_min=0.0, h_max=30.0, resolution=0.05, max_error=None, max_points=2**22):
+        """
+        Parameters:
+        - h_min (float): Lowest tabulated geometric altitude in km.
+        - h_max (float): Highest tabulated geometric altitude in km.
+        - resolution (float): Table spacing in km (the starting spacing when max_error is given).
+        - max_error (float, optional): Largest relative error allowed in T, P, rho and a. When given, the
+          spacing is halved until the error at the midpoints between table entries is within the bound.
+        - max_points (int): Table size at which refinement gives up and raises ValueError.
+        """
+        if h_max <= h_min:
+            raise ValueError("h_max must be greater than h_min")
+        self.h_min = float(h_min)
+        self.h_max = float(h_max)
+        self.error = None
+        spacing = float(resolution)
+        while True:
+            self._build(spacing)
+            if max_error is None:
+                break
+            self.error = self.measure_error()
+            if self.error <= max_error:
+                break
+            if 2*len(self.altitude) > max_points:
+                raise ValueError(f"Could not reach max_error={max_error} within {max_points} table points")
+            spacing /= 2
+        self.resolution = self._step
+
+    def _build(self, spacing):
+        below, split = _tropopause_km()
+        if self.h_min < split <= self.h_max:
+            # Align the grid so the tropopause is a cell edge
+            edge = max(int(np.ceil((split - self.h_min)/spacing)), 1)
+            step = (split - self.h_min)/edge
+        else:
+            edge, step = None, spacing
+        cells = max(int(np.ceil((self.h_max - self.h_min)/step)), 1)
+        nodes = self.h_min + step*np.arange(cells + 1)
+        right = nodes[1:].copy()
+        if edge is not None:
+            nodes[edge] = split
+            right[edge - 1] = below
+        self._step = step
+        self._inverse_step = 1/step
+        self._cells = cells
+        self.altitude = nodes
+
+        # Start value and slope of every cell for T, P, rho and a
+        start = standard_atmosphere(nodes[:-1])[2:]
+        end = standard_atmosphere(right)[2:]
+        self._columns = [(np.ascontiguousarray(s0), np.ascontiguousarray(s1 - s0)) for s0, s1 in zip(start, end)]
+
+    def measure_error(self):
+        """
+        Returns:
+        - float: Largest relative error of T, P, rho or a at the midpoints between table entries.
+        """
+        midpoints = 0.5*(self.altitude[1:] + self.altitude[:-1])
+        exact = standard_atmosphere(midpoints)[2:]
+        approx = self.lookup(midpoints)[2:]
+        return max(float(np.max(np.abs(b/e - 1))) for e, b in zip(exact, approx))
+
+    def lookup(self, h_G_km):
+        """
+        Interpolate the standard atmosphere at one or many geometric altitudes.
+
+        Parameters:
+        - h_G_km (float or array): Geometric altitude in kilometers.
+
+        Returns:
+        - list: Same layout as standard_atmosphere().
+        """
+        shape = np.shape(h_G_km)
+        h_G = np.asarray(h_G_km, dtype=float).reshape(-1)
+
+        # Cell index and position within the cell; NaN and out-of-table altitudes are parked in cell 0 and
+        # overwritten below
+        position = h_G - self.h_min
+        position *= self._inverse_step
+        outside = ~((h_G >= self.h_min) & (h_G <= self.h_max))
+        any_outside = outside.any()
+        if any_outside:
+            position[outside] = 0.0
+        i = position.astype(np.intp)
+        np.minimum(i, self._cells - 1, out=i)
+        position -= i
+
+        values = [h_G]
+        h = h_G*3280.84                          # geopotential altitude needs no table
+        h += r_e
+        np.divide(r_e, h, out=h)
+        h *= h_G
+        values.append(h)
+        for start, slope in self._columns:
+            value = slope.take(i)
+            value *= position
+            value += start.take(i)
+            values.append(value)
+
+        if any_outside:
+            with np.errstate(invalid='ignore'):
+                exact = standard_atmosphere(h_G[outside])
+            missing = np.isnan(exact[0])
+            for value, column in zip(values[1:], exact[1:]):
+                column[missing] = np.nan
+                value[outside] = column
+
+        values = [v.reshape(shape) for v in values]
+        if np.ndim(h_G_km) == 0:
+            return [v[()] for v in values]
+        return values
+
+
+_shared_table = None
+
+
+def atmosphere_table():
+    """
+    Returns:
+    - AtmosphereTable: A table shared by the sweep tools, accurate to 1e-6 in T, P, rho and a up to 30 km,
+      built on first use.
+    """
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = AtmosphereTable(max_error=1e-6)
+    return _shared_table
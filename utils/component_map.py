@@ -0,0 +1,179 @@
+# component_map.py
+import csv
+import numpy as np
+
+
+class ComponentMap:
+    """
+    Compressor or turbine map: corrected flow, pressure ratio, efficiency (or any other column) tabulated
+    over corrected speed and beta line, with vectorized bilinear or bicubic lookup.
+
+    The table must be a full grid, i.e. every speed line sampled at the same beta values. Everything that does
+    not depend on the query points is prepared once when the map is built: evenly spaced axes are indexed
+    arithmetically instead of searched, and for cubic lookup the 16 coefficients of every cell's bicubic
+    Hermite patch (slopes from finite differences across neighbouring cells) are stored, so a lookup is an
+    index computation, a gather and a short polynomial evaluation per point.
+    """
+
+    def __init__(self, speed, beta, **tables):
+        """
+        Parameters:
+        - speed (array): Corrected speed values, strictly increasing, length n.
+        - beta (array): Beta line values, strictly increasing, length m.
+        - **tables: Column name -> array of shape (n, m), e.g. flow=..., pi=..., eta=...
+        """
+        self.speed = np.ascontiguousarray(speed, dtype=float)
+        self.beta = np.ascontiguousarray(beta, dtype=float)
+        for axis, name in ((self.speed, 'speed'), (self.beta, 'beta')):
+            if axis.ndim != 1 or axis.size < 2 or np.any(np.diff(axis) <= 0):
+                raise ValueError(f"{name} must be a strictly increasing 1-D array with at least two values")
+        shape = (self.speed.size, self.beta.size)
+        self.tables = {}
+        for name, values in tables.items():
+            values = np.ascontiguousarray(values, dtype=float)
+            if values.shape != shape:
+                raise ValueError(f"Table {name} has shape {values.shape}, expected {shape}")
+            self.tables[name] = values
+        self._uniform = [self._is_uniform(axis) for axis in (self.speed, self.beta)]
+        self._cubic = {name: self._coefficients(values) for name, values in self.tables.items()}
+
+    @classmethod
+    def from_csv(cls, path, speed='speed', beta='beta'):
+        """
+        Load a map stored in long format, one row per (speed, beta) point and one column per quantity.
+
+        Parameters:
+        - path (str): CSV file with a header row.
+        - speed, beta (str): Names of the two axis columns; every other column becomes a table.
+
+        Returns:
+        - ComponentMap: The map.
+        """
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        if not rows:
+            raise ValueError(f"{path} contains no map points")
+        columns = {name: np.array([float(row[name]) for row in rows]) for name in rows[0]}
+        speeds, i = np.unique(columns.pop(speed), return_inverse=True)
+        betas, j = np.unique(columns.pop(beta), return_inverse=True)
+        tables = {}
+        for name, values in columns.items():
+            table = np.full((speeds.size, betas.size), np.nan)
+            table[i, j] = values
+            if np.isnan(table).any():
+                raise ValueError(f"{path} does not sample every speed line at the same beta values")
+            tables[name] = table
+        return cls(speeds, betas, **tables)
+
+    def to_csv(self, path, speed='speed', beta='beta'):
+        """
+        Write the map in the long format read by from_csv().
+        """
+        names = list(self.tables)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([speed, beta] + names)
+            for i, s in enumerate(self.speed):
+                for j, b in enumerate(self.beta):
+                    writer.writerow([float(s), float(b)] + [float(self.tables[name][i, j]) for name in names])
+
+    @staticmethod
+    def _is_uniform(axis):
+        step = (axis[-1] - axis[0]) / (axis.size - 1)
+        return bool(np.allclose(np.diff(axis), step, rtol=1e-9, atol=0.0))
+
+    def _locate(self, axis, uniform, x):
+        # Cell index and position within the cell (0..1, beyond that outside the table)
+        if uniform:
+            position = (x - axis[0]) * ((axis.size - 1) / (axis[-1] - axis[0]))
+            i = np.clip(np.floor(position), 0, axis.size - 2).astype(np.intp)
+            return i, position - i
+        i = np.clip(np.searchsorted(axis, x, side='right') - 1, 0, axis.size - 2)
+        return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+    def in_range(self, speed, beta):
+        """
+        Returns:
+        - array of bool: Points inside the tabulated speed and beta range.
+        """
+        speed, beta = np.asarray(speed, dtype=float), np.asarray(beta, dtype=float)
+        return (speed >= self.speed[0]) & (speed <= self.speed[-1]) & (beta >= self.beta[0]) & (beta <= self.beta[-1])
+
+    def lookup(self, speed, beta, names=None, method='linear', clip=True):
+        """
+        Interpolate map columns at arrays of operating points.
+
+        Parameters:
+        - speed, beta (float or array): Corrected speed and beta line, broadcast against each other.
+        - names (iterable, optional): Columns to return. Defaults to every column.
+        - method (str): 'linear' (bilinear) or 'cubic' (bicubic Hermite, continuous slopes).
+        - clip (bool): Clamp points outside the map to its edge. Otherwise they are extrapolated from the
+          edge cells; check in_range() to find them.
+
+        Returns:
+        - dict: Column name -> values with the broadcast shape of speed and beta.
+        """
+        speed, beta = np.broadcast_arrays(np.asarray(speed, dtype=float), np.asarray(beta, dtype=float))
+        # NaN and infinite points are parked in cell 0 so the index cast stays valid, and get NaN below
+        missing = ~(np.isfinite(speed) & np.isfinite(beta))
+        any_missing = missing.any()
+        if any_missing:
+            speed = np.where(missing, self.speed[0], speed)
+            beta = np.where(missing, self.beta[0], beta)
+        if clip:
+            speed = np.clip(speed, self.speed[0], self.speed[-1])
+            beta = np.clip(beta, self.beta[0], self.beta[-1])
+        names = list(self.tables) if names is None else list(names)
+        out = self._interpolate(speed, beta, names, method)
+        if any_missing:
+            out = {name: np.where(missing, np.nan, value) for name, value in out.items()}
+        return out
+
+    def _interpolate(self, speed, beta, names, method):
+        # lookup() for finite points
+        i, u = self._locate(self.speed, self._uniform[0], speed)
+        j, v = self._locate(self.beta, self._uniform[1], beta)
+
+        # Flat index of each point's lower-left corner; np.take on raveled tables is faster than 2-D indexing
+        m = self.beta.size
+        k = i * m + j
+        if method == 'linear':
+            out = {}
+            for name in names:
+                t = self.tables[name].ravel()
+                t00, t01, t10, t11 = t.take(k), t.take(k + 1), t.take(k + m), t.take(k + m + 1)
+                low = t00 + v * (t01 - t00)
+                out[name] = low + u * (t10 + v * (t11 - t10) - low)
+            return out
+        if method == 'cubic':
+            cell = i * (m - 1) + j
+            out = {}
+            for name in names:
+                c = [plane.take(cell) for plane in self._cubic[name]]  # c[4*k + l] multiplies u^k v^l
+                # p(u, v) = sum_k sum_l c[k, l] u^k v^l, evaluated with Horner's rule in both directions
+                rows = [((c[4*r + 3] * v + c[4*r + 2]) * v + c[4*r + 1]) * v + c[4*r] for r in range(4)]
+                out[name] = ((rows[3] * u + rows[2]) * u + rows[1]) * u + rows[0]
+            return out
+        raise ValueError(f"Unknown interpolation method: {method}")
+
+    def _coefficients(self, f):
+        # Bicubic Hermite patch coefficients of every cell of table f, as 16 contiguous planes over the cells
+        # Slopes with respect to the cell-normalized coordinates, from (one-sided at the edges) differences
+        fs = np.gradient(f, self.speed, axis=0)
+        fb = np.gradient(f, self.beta, axis=1)
+        fsb = np.gradient(fs, self.beta, axis=1)
+        hs = np.diff(self.speed)[:, None]
+        hb = np.diff(self.beta)[None, :]
+
+        def corners(g):
+            return g[:-1, :-1], g[1:, :-1], g[:-1, 1:], g[1:, 1:]
+
+        f00, f10, f01, f11 = corners(f)
+        u00, u10, u01, u11 = (d * hs for d in corners(fs))
+        v00, v10, v01, v11 = (d * hb for d in corners(fb))
+        w00, w10, w01, w11 = (d * hs * hb for d in corners(fsb))
+        # Corner values and derivatives in the standard order, then multiplied by the Hermite basis on both sides
+        F = np.stack([np.stack([f00, f01, v00, v01], -1), np.stack([f10, f11, v10, v11], -1),
+                      np.stack([u00, u01, w00, w01], -1), np.stack([u10, u11, w10, w11], -1)], -2)
+        A = np.array([[1, 0, 0, 0], [0, 0, 1, 0], [-3, 3, -2, -1], [2, -2, 1, 1]], dtype=float)
+        return np.ascontiguousarray((A @ F @ A.T).reshape(-1, 16).T)
@@ -11,12 +11,13 @@ class CompressorModel:
         Calculate the total enthalpy at the outlet of the compressor.
 
         Parameters:
-        - ht_in (float): Total enthalpy at the inlet of the compressor.
-        - ht_out_ideal (float): Ideal total enthalpy at the outlet of the compressor.
-        - eff (float): Efficiency of the compressor.
+        - ht_in (float or array): Total enthalpy at the inlet of the compressor.
+        - ht_out_ideal (float or array): Ideal total enthalpy at the outlet of the compressor.
+        - eff (float or array): Efficiency of the compressor, e.g. per operating point from
+          ComponentMap.lookup(...)['eta'].
 
         Returns:
-        - float: Total enthalpy at the outlet of the compressor.
+        - float or array: Total enthalpy at the outlet of the compressor.
         """
         ht_out = ht_in + (ht_out_ideal - ht_in) / eff
         return ht_out
@@ -0,0 +1,96 @@
+# cycle_graph.py
+import numpy as np
+from utils.general_analysis import GeneralAnalysis, CycleResult
+
+
+class CycleGraph:
+    """
+    Incremental evaluation of GeneralAnalysis.CYCLE_GRAPH.
+
+    The graph holds the current value of every input, design constant and station quantity. set() changes
+    leaves and marks only the quantities downstream of them as stale; reading a quantity recomputes just the
+    stale ones it depends on. Changing P9rat, for example, re-evaluates the nozzle and performance nodes but
+    leaves the inlet, compressor and burner untouched. Results equal calculateCycle() on the same inputs.
+    """
+
+    def __init__(self, analysis=None, **inputs):
+        """
+        Parameters:
+        - analysis (GeneralAnalysis, optional): Supplies the graph, the design constants and default inputs.
+        - **inputs: Initial values of any of M_0, T_0, P_0, T_t4, P9rat or a design constant (scalars or arrays).
+        """
+        self.analysis = analysis if analysis is not None else GeneralAnalysis()
+        a = self.analysis
+        self._values = a.designConstants()
+        self._values.update((name, getattr(a, name)) for name in a.CYCLE_INPUTS)
+        self._nodes = {name: (dependencies, method) for name, dependencies, method in a.CYCLE_GRAPH}
+        self._order = [name for name, _, _ in a.CYCLE_GRAPH]
+
+        # Direct dependents of every leaf and node, so a change can be propagated forward
+        self._dependents = {name: [] for name in list(self._values) + self._order}
+        for name, dependencies, _ in a.CYCLE_GRAPH:
+            for dependency in dependencies:
+                self._dependents[dependency].append(name)
+
+        self._stale = set(self._order)
+        self.evaluations = 0  # node evaluations performed so far
+        self.set(**inputs)
+
+    def set(self, **changes):
+        """
+        Change inputs or design constants. Values equal to the current ones invalidate nothing.
+
+        Returns:
+        - set: Names of the quantities that became stale.
+        """
+        invalidated = set()
+        for name, value in changes.items():
+            if name in self._nodes or name not in self._values:
+                raise TypeError(f"{name} is not an input or design constant")
+            if not isinstance(value, (int, float)):
+                value = np.asarray(value, dtype=float)
+            if np.shape(value) == np.shape(self._values[name]) and np.array_equal(value, self._values[name]):
+                continue
+            self._values[name] = value
+            pending = list(self._dependents[name])
+            while pending:
+                node = pending.pop()
+                if node not in invalidated:
+                    invalidated.add(node)
+                    pending.extend(self._dependents[node])
+        self._stale |= invalidated
+        return invalidated
+
+    def get(self, name):
+        """
+        Current value of an input, design constant or station quantity, recomputing stale ancestors first.
+        """
+        if name in self._stale:
+            needed = set()
+            pending = [name]
+            while pending:
+                node = pending.pop()
+                if node in self._stale and node not in needed:
+                    needed.add(node)
+                    pending.extend(self._nodes[node][0])
+            for node in self._order:
+                if node in needed:
+                    dependencies, method = self._nodes[node]
+                    self._values[node] = getattr(self.analysis, method)(*[self._values[d] for d in dependencies])
+                    self._stale.discard(node)
+                    self.evaluations += 1
+        return self._values[name]
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def result(self, names=None):
+        """
+        Parameters:
+        - names (iterable, optional): Quantities to bring up to date. Defaults to every node of the graph.
+
+        Returns:
+        - CycleResult: The requested quantities.
+        """
+        names = self._order if names is None else names
+        return CycleResult(**{name: self.get(name) for name in names})
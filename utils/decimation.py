@@ -0,0 +1,130 @@
+# decimation.py
+import numpy as np
+
+
+def visible_slice(x, xlim=None):
+    """
+    Index range of the points of a sorted x that fall inside xlim, widened by one point on each side so a
+    line still runs to the edge of the view.
+
+    Parameters:
+    - x (array): Sorted x values.
+    - xlim (tuple, optional): (low, high) view limits in either order. None means the whole series.
+
+    Returns:
+    - slice: Points to draw.
+    """
+    if xlim is None:
+        return slice(0, x.size)
+    low, high = sorted(xlim)
+    start = max(int(np.searchsorted(x, low, side='left')) - 1, 0)
+    stop = min(int(np.searchsorted(x, high, side='right')) + 1, x.size)
+    return slice(start, stop)
+
+
+def minmax(x, y, buckets):
+    """
+    Min/max decimation: split the series into equal index buckets and keep, in x order, the lowest and the
+    highest point of each, plus the first and last point. Every peak and trough survives, so at two points
+    per pixel column the plot looks the same as the full series.
+
+    Parameters:
+    - x, y (array): The series.
+    - buckets (int): Number of buckets; at most 2 * buckets + 2 points are returned.
+
+    Returns:
+    - tuple: (x, y) of the kept points.
+    """
+    n = y.size
+    buckets = int(buckets)
+    if buckets < 1 or n <= 2 * buckets + 2:
+        return x, y
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    # Pad the last bucket with its final point; NaNs never win a min or max but keep their gap if a whole bucket is NaN
+    padded = np.empty(buckets * size)
+    padded[:n] = y
+    padded[n:] = y[-1]
+    padded = padded.reshape(buckets, size)
+    nan = np.isnan(padded)
+    low = np.argmin(np.where(nan, np.inf, padded), axis=1)
+    high = np.argmax(np.where(nan, -np.inf, padded), axis=1)
+    offset = np.arange(buckets) * size
+    index = np.stack([np.minimum(low, high), np.maximum(low, high)], axis=1) + offset[:, None]
+    index = np.minimum(index.ravel(), n - 1)
+    index = np.concatenate([[0], index, [n - 1]])
+    index = index[np.concatenate([[True], np.diff(index) != 0])]
+    return x[index], y[index]
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-triangle-three-buckets downsampling (Steinarsson, 2013): keeps the first and last point and, from
+    each of threshold - 2 buckets in between, the point forming the largest triangle with the point kept from
+    the previous bucket and the mean of the next one. Follows the shape of the series more smoothly than
+    minmax() at the same point count, but a narrow spike can lose its extreme value.
+
+    Parameters:
+    - x, y (array): The series, without NaNs.
+    - threshold (int): Number of points to return.
+
+    Returns:
+    - tuple: (x, y) of the kept points.
+    """
+    n = y.size
+    threshold = int(threshold)
+    if threshold < 3 or n <= threshold:
+        return x, y
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(np.intp) + 1
+    edges[-1] = n - 1
+    # Means of every bucket in one pass
+    counts = np.diff(edges)
+    x_mean = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    y_mean = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    x_mean = np.append(x_mean, x[-1])
+    y_mean = np.append(y_mean, y[-1])
+
+    index = np.empty(threshold, dtype=np.intp)
+    index[0], index[-1] = 0, n - 1
+    a = 0
+    for k in range(threshold - 2):
+        start, stop = edges[k], edges[k + 1]
+        cx, cy = x_mean[k + 1], y_mean[k + 1]
+        # Twice the triangle area, for every candidate of the bucket at once
+        area = np.abs((x[a] - cx) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        index[k + 1] = a
+    return x[index], y[index]
+
+
+METHODS = {'minmax': minmax, 'lttb': lttb}
+
+
+def decimate(x, y, pixels, method='minmax', xlim=None):
+    """
+    Reduce a series to what can be seen at a given plot width, so drawing time depends on the pixel budget
+    rather than on the number of points.
+
+    Parameters:
+    - x (array): x values, sorted ascending.
+    - y (array): y values.
+    - pixels (int): Width of the plot area in pixels.
+    - method (str): 'minmax' (two points per pixel column, peaks preserved exactly) or 'lttb'.
+    - xlim (tuple, optional): Current view limits; only the points inside are decimated, so zooming in
+      reveals detail from the full data.
+
+    Returns:
+    - tuple: (x, y) to hand to the plot.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown decimation method: {method}")
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    view = visible_slice(x, xlim)
+    x, y = x[view], y[view]
+    pixels = max(int(pixels), 1)
+    if method == 'minmax':
+        return minmax(x, y, pixels)
+    finite = ~np.isnan(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    return lttb(x, y, 2 * pixels)
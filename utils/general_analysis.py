@@ -5,6 +5,62 @@
 # Seriously, read over Chapter 8 when you have the time, it explains what the inputs should be, what assumptions should be made,
 # and how to combine them all together to gain graphs similar to 1-14a thru 1-14e in the Mattingly textbook
 import numpy as np
+from utils.atmosphere import standard_atmosphere
+
+
+class CycleResult:
+    """
+    Everything GeneralAnalysis.calculateCycle computes for one or many operating points.
+
+    Outputs and intermediates are attributes (scalars, or arrays with the broadcast shape of the inputs)
+    and can also be read by name, e.g. result['thrust'].
+    """
+
+    outputs = ('thrust', 'tsfc', 'S', 'eta_T', 'eta_P', 'eta_O', 'n_over_nr', 'N')
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+    def __getitem__(self, name):
+        return self.__dict__[name]
+
+    def __contains__(self, name):
+        return name in self.__dict__
+
+    def keys(self):
+        return self.__dict__.keys()
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+
+class CycleJacobian:
+    """
+    Values and first derivatives of cycle outputs, as returned by GeneralAnalysis.calculateJacobian.
+
+    Attributes:
+    - outputs (tuple): Output names, e.g. ('thrust', 'tsfc').
+    - wrt (tuple): Names of the inputs and design constants differentiated against.
+    - values (dict): Output name -> values with the broadcast shape of the inputs.
+    - jacobian (dict): Output name -> {variable name -> d(output)/d(variable)} with the same shape.
+    """
+
+    def __init__(self, outputs, wrt, values, jacobian):
+        self.outputs = outputs
+        self.wrt = wrt
+        self.values = values
+        self.jacobian = jacobian
+
+    def __getitem__(self, name):
+        return self.jacobian[name]
+
+    def matrix(self):
+        """
+        Returns:
+        - array: The Jacobian with shape (..., len(outputs), len(wrt)), the point axes first.
+        """
+        return np.stack([np.stack([self.jacobian[o][v] for v in self.wrt], -1) for o in self.outputs], -2)
+
 
 class GeneralAnalysis:
 
@@ -125,10 +181,9 @@ class GeneralAnalysis:
         return tau_r**(gamma_c/(gamma_c - 1))
 
     def calc_eta_r(self, M_0):
-        if M_0 <= 1:
-            return 1
-        else:
-            return 1 - (0.075*(M_0 - 1)**1.35)
+        # eta_r = 1 for M_0 <= 1, written branch-free so M_0 can be an array
+        supersonic = np.real(M_0) > 1
+        return np.where(supersonic, 1 - (0.075*(np.where(supersonic, M_0, 1) - 1)**1.35), 1)
 
     def calc_pi_d(self, pi_d_max, eta_r):
         return pi_d_max * eta_r
@@ -161,13 +216,94 @@ class GeneralAnalysis:
     def calc_M_9(self, gamma_t, P9rat):
         return np.sqrt((2/(gamma_t - 1))*((P9rat**((gamma_t - 1)/gamma_t)) - 1))
 
-    def calc_T9T0Rat(self, T_t4, tau_t, P9rat, gamma_t,c_pc,c_pt):
-        tau_lambda = self.calc_tau_lambda(c_pt,T_t4,c_pc,self.T_0)
+    def calc_T9T0Rat(self, T_t4, tau_t, P9rat, gamma_t,c_pc,c_pt, T_0=None):
+        T_0 = self.T_0 if T_0 is None else T_0
+        tau_lambda = self.calc_tau_lambda(c_pt,T_t4,c_pc,T_0)
         return (tau_lambda*tau_t)/(P9rat**((gamma_t - 1)/gamma_t))*c_pc/c_pt
 
     def calc_V0a0Rat(self, M_9, gamma_t, R_t, T_9, gamma_c, R_c, T_0):
         return M_9*(((gamma_t*R_t*T_9)/(gamma_c*R_c*T_0))**0.5)
 
+    def calc_P_9(self, P_0, P9rat):
+        return P_0/P9rat
+
+    def calc_T_9(self, T9T0Rat, T_0):
+        return T9T0Rat*T_0
+
+    def calc_eta_T(self, a_0, f, V9a0Rat, M_0, g_c, h_pR):
+        # h_pR is in kJ/kg while a_0 is in m/s, hence the factor of 1000
+        return self.eta_T(a_0, f, V9a0Rat, M_0, g_c, h_pR*1000)
+
+    def calc_eta_P(self, a_0, f, V_0, V9a0Rat, M_0, g_c, tsfc):
+        numerator = 2*g_c*V_0*tsfc
+        denominator = (a_0**2)*(((1 + f)*(V9a0Rat**2)) - (M_0**2))
+        return numerator / denominator
+
+    def calc_eta_O(self, eta_T, eta_P):
+        return eta_T*eta_P
+
+    def calc_N(self, n_over_nr, N_R):
+        return n_over_nr * N_R
+
+    # Station dependency graph of the cycle, in evaluation order: (quantity, what it depends on, method computing it).
+    # The method is called with the dependencies as positional arguments. Leaves are the inputs (CYCLE_INPUTS) and
+    # the design constants (designConstants()). calculateCycle evaluates the whole graph; CycleGraph
+    # (utils/cycle_graph.py) uses it to recompute only what lies downstream of a changed input.
+    CYCLE_INPUTS = ('M_0', 'T_0', 'P_0', 'T_t4', 'P9rat')
+    CYCLE_GRAPH = (
+        ('R_c', ('gamma_c', 'c_pc'), 'calc_R_c'),
+        ('R_t', ('gamma_t', 'c_pt'), 'calc_R_t'),
+        ('a_0', ('gamma_c', 'R_c', 'g_c', 'T_0'), 'calc_a_0'),
+        ('V_0', ('a_0', 'M_0'), 'calc_V_0'),
+        # ram and diffuser
+        ('tau_r', ('gamma_c', 'M_0'), 'calc_tau_r'),
+        ('pi_r', ('tau_r', 'gamma_c'), 'calc_pi_r'),
+        ('eta_r', ('M_0',), 'calc_eta_r'),
+        ('pi_d', ('pi_d_max', 'eta_r'), 'calc_pi_d'),
+        # compressor
+        ('T_t2', ('T_0', 'tau_r'), 'calc_T_t2'),
+        ('T_t2R', ('T_0', 'tau_rR'), 'calc_T_t2'),
+        ('tau_c', ('tau_cR', 'T_t4', 'T_t2', 'T_t4R', 'T_t2R'), 'calc_tau_c'),
+        ('pi_c', ('eta_c', 'tau_c', 'gamma_c'), 'calc_pi_c'),
+        # burner and mass flow
+        ('tau_lambda', ('c_pt', 'T_t4', 'c_pc', 'T_0'), 'calc_tau_lambda'),
+        ('f', ('tau_lambda', 'tau_r', 'tau_c', 'h_pR', 'eta_b', 'c_p', 'T_0'), 'calc_f'),
+        ('m_dot', ('m_dot_R', 'P_0', 'pi_r', 'pi_d', 'pi_c', 'P_0R', 'pi_rR', 'pi_dR', 'pi_cR', 'T_t4', 'T_t4R'), 'calc_m_dot'),
+        # nozzle
+        ('P_9', ('P_0', 'P9rat'), 'calc_P_9'),
+        ('Pt9P9', ('P_0', 'P_9', 'pi_r', 'pi_d', 'pi_c', 'pi_b', 'pi_t', 'pi_n'), 'calc_P9Rat'),
+        ('M_9', ('gamma_t', 'Pt9P9'), 'calc_M_9'),
+        ('T9T0Rat', ('T_t4', 'tau_t', 'Pt9P9', 'gamma_t', 'c_pc', 'c_pt', 'T_0'), 'calc_T9T0Rat'),
+        ('T_9s', ('T9T0Rat', 'T_0'), 'calc_T_9'),
+        ('T9T0Rat_P9', ('T_t4', 'tau_t', 'P9rat', 'gamma_t', 'c_pc', 'c_pt', 'T_0'), 'calc_T9T0Rat'),
+        ('T_9', ('T9T0Rat_P9', 'T_0'), 'calc_T_9'),
+        ('V9a0Rat', ('M_9', 'gamma_t', 'R_t', 'T_9s', 'gamma_c', 'R_c', 'T_0'), 'calc_V0a0Rat'),
+        # performance
+        ('tsfc', ('a_0', 'g_c', 'f', 'V9a0Rat', 'M_0', 'R_t', 'R_c', 'T_9', 'T_0', 'P_0', 'P_9', 'gamma_c'), 'TSFC'),
+        ('thrust', ('tsfc', 'm_dot'), 'calc_thrust'),
+        ('S', ('tsfc', 'f'), 'S'),
+        ('eta_T', ('a_0', 'f', 'V9a0Rat', 'M_0', 'g_c', 'h_pR'), 'calc_eta_T'),
+        ('eta_P', ('a_0', 'f', 'V_0', 'V9a0Rat', 'M_0', 'g_c', 'tsfc'), 'calc_eta_P'),
+        ('eta_O', ('eta_T', 'eta_P'), 'calc_eta_O'),
+        ('n_over_nr', ('T_0', 'tau_r', 'pi_c', 'gamma_t', 'T_0R', 'tau_rR', 'pi_cR'), 'n_over_nr'),
+        ('N', ('n_over_nr', 'N_R'), 'calc_N'),
+    )
+
+    # Component stage of every CYCLE_GRAPH node, used to group the timings recorded by a profiler
+    CYCLE_STAGES = {
+        'R_c': 'freestream', 'R_t': 'freestream', 'a_0': 'freestream', 'V_0': 'freestream',
+        'tau_r': 'ram_diffuser', 'pi_r': 'ram_diffuser', 'eta_r': 'ram_diffuser', 'pi_d': 'ram_diffuser',
+        'T_t2': 'compressor', 'T_t2R': 'compressor', 'tau_c': 'compressor', 'pi_c': 'compressor',
+        'tau_lambda': 'burner', 'f': 'burner', 'm_dot': 'mass_flow',
+        'P_9': 'nozzle', 'Pt9P9': 'nozzle', 'M_9': 'nozzle', 'T9T0Rat': 'nozzle', 'T_9s': 'nozzle',
+        'T9T0Rat_P9': 'nozzle', 'T_9': 'nozzle', 'V9a0Rat': 'nozzle',
+        'tsfc': 'performance', 'thrust': 'performance', 'S': 'performance', 'eta_T': 'performance',
+        'eta_P': 'performance', 'eta_O': 'performance', 'n_over_nr': 'performance', 'N': 'performance',
+    }
+
+    # StageProfiler (utils/profiling.py) that calculateCycle reports to; None disables profiling
+    profiler = None
+
     # Combine all of them to make complete equations from clear independent variables
 
     def calculateTSFC(self, M_0, T_0, P_0, T_t4, P_9, g_c, gamma_c, c_pc, gamma_t, c_pt, pi_d_max, tau_cR, T_t4R, tau_rR, eta_c, h_pR, eta_b, m_dot_R, P_0R, pi_rR, pi_cR, pi_b, pi_t, pi_n, tau_t):
@@ -252,6 +388,125 @@ class GeneralAnalysis:
         thrust = self.calc_thrust(tsfc, m_dot)
         return thrust
 
+    # Design constants used by calculateCycle, keyed by the keyword names it accepts as overrides
+    def designConstants(self):
+        return {
+            'g_c': self.g_c, 'gamma_c': self.gamma_c, 'c_pc': self.c_pc, 'c_p': self.c_p,
+            'gamma_t': self.gamma_t, 'c_pt': self.c_pt, 'pi_d_max': self.pi_d_max, 'pi_dR': self.pi_dR,
+            'tau_cR': self.tau_cR, 'T_t4R': self.T_t4R, 'T_0R': self.T_0R, 'tau_rR': self.tau_rR,
+            'pi_rR': self.pi_rR, 'pi_cR': self.pi_cR, 'eta_c': self.eta_c, 'eta_b': self.eta_b,
+            'h_pR': self.h_pR, 'm_dot_R': self.m_dot_R, 'P_0R': self.P_0R, 'pi_b': self.pi_b,
+            'pi_t': self.pi_t, 'pi_n': self.pi_n, 'tau_t': self.tau_t, 'N_R': self.N_R,
+        }
+
+    # Fused, array-native cycle evaluation
+    # Evaluates CYCLE_GRAPH once, so the shared station chain is computed a single time, and returns every
+    # performance output together with its intermediates as a CycleResult. Any of M_0, T_0, P_0, T_t4 and P9rat
+    # may be a NumPy array; they are broadcast against each other. Inputs left as None fall back to the values
+    # the object was built with, and any name from designConstants() can be overridden (with a scalar or an
+    # array) as a keyword. For scalar inputs thrust and tsfc match calculateThrust and calculateTSFC exactly.
+    def calculateCycle(self, M_0=None, T_0=None, P_0=None, T_t4=None, P9rat=None, **constants):
+        values = self.designConstants()
+        unknown = set(constants) - set(values)
+        if unknown:
+            raise TypeError(f"Unknown design constant(s): {', '.join(sorted(unknown))}")
+        values.update(constants)
+
+        for name, value in zip(self.CYCLE_INPUTS, (M_0, T_0, P_0, T_t4, P9rat)):
+            if value is None:
+                values[name] = getattr(self, name)
+            else:
+                value = np.asarray(value)
+                values[name] = value if np.iscomplexobj(value) else value.astype(float)
+
+        if self.profiler is None:
+            for name, dependencies, method in self.CYCLE_GRAPH:
+                values[name] = getattr(self, method)(*[values[d] for d in dependencies])
+        else:
+            self._profiledCycle(values)
+
+        return CycleResult(**{name: values[name] for name, _, _ in self.CYCLE_GRAPH})
+
+    # calculateCycle's graph walk with every node timed and reported to self.profiler under its stage
+    # A method used by several nodes of a stage (calc_T9T0Rat, calc_T_9, calc_T_t2) is recorded once per cycle
+    # with its summed time, so its call and point counts match those of the stage.
+    def _profiledCycle(self, values):
+        profiler = self.profiler
+        clock = profiler.clock
+        points = int(np.prod(np.broadcast_shapes(*(np.shape(values[name]) for name in self.CYCLE_INPUTS))))
+        stages = {}
+        methods = {}
+        with profiler.frame('calculateCycle', points):
+            base = profiler.stack
+            for name, dependencies, method in self.CYCLE_GRAPH:
+                start = clock()
+                values[name] = getattr(self, method)(*[values[d] for d in dependencies])
+                elapsed = clock() - start
+                stage = self.CYCLE_STAGES[name]
+                stages[stage] = stages.get(stage, 0.0) + elapsed
+                methods[stage, method] = methods.get((stage, method), 0.0) + elapsed
+            for (stage, method), elapsed in methods.items():
+                profiler.record(base + (stage, method), elapsed, points)
+            for stage, elapsed in stages.items():
+                profiler.record(base + (stage,), elapsed, points)
+
+    # Values and full Jacobians of cycle outputs by the complex-step method
+    # Every variable in wrt (default: all five inputs and every design constant) gets its own row along an extra
+    # leading axis, perturbed by i*h in that row only, and the whole stack goes through calculateCycle once. Each
+    # graph node is analytic in its inputs, so Im(output)/h is the derivative to machine precision: there is no
+    # subtractive cancellation, so h can be tiny and the result does not depend on choosing a step. Points are
+    # processed in chunks so that rows times points stays below chunk_size. Arguments are as for calculateCycle.
+    def calculateJacobian(self, M_0=None, T_0=None, P_0=None, T_t4=None, P9rat=None, outputs=('thrust', 'tsfc'),
+                          wrt=None, chunk_size=262144, **constants):
+        h = 1e-30
+        point = self.designConstants()
+        unknown = set(constants) - set(point)
+        if unknown:
+            raise TypeError(f"Unknown design constant(s): {', '.join(sorted(unknown))}")
+        point.update(constants)
+        for name, value in zip(self.CYCLE_INPUTS, (M_0, T_0, P_0, T_t4, P9rat)):
+            point[name] = getattr(self, name) if value is None else value
+        point = {name: np.asarray(value, dtype=float) for name, value in point.items()}
+
+        wrt = self.CYCLE_INPUTS + tuple(self.designConstants()) if wrt is None else tuple(wrt)
+        unknown = set(wrt) - set(point)
+        if unknown:
+            raise TypeError(f"Cannot differentiate with respect to {', '.join(sorted(unknown))}")
+        outputs = tuple(outputs)
+        shape = np.broadcast_shapes(*(value.shape for value in point.values()))
+        size = int(np.prod(shape))
+        rows = len(wrt)
+        step = max(1, int(chunk_size) // rows)
+
+        flat = {name: np.broadcast_to(value, shape).reshape(-1) if value.ndim else value for name, value in point.items()}
+        values = {name: np.empty(size) for name in outputs}
+        jacobian = {name: {variable: np.empty(size) for variable in wrt} for name in outputs}
+        for start in range(0, size, step):
+            stop = min(start + step, size)
+            chunk = {name: value[start:stop] if value.ndim else value for name, value in flat.items()}
+            for j, variable in enumerate(wrt):
+                perturbed = np.empty((rows, stop - start), dtype=complex)
+                perturbed[...] = chunk[variable]
+                perturbed[j] += 1j * h
+                chunk[variable] = perturbed
+            with np.errstate(all='ignore'):
+                result = self.calculateCycle(**chunk)
+            for name in outputs:
+                out = np.broadcast_to(result[name], (rows, stop - start))
+                values[name][start:stop] = out[0].real
+                for j, variable in enumerate(wrt):
+                    jacobian[name][variable][start:stop] = out[j].imag / h
+
+        values = {name: value.reshape(shape)[()] for name, value in values.items()}
+        jacobian = {name: {variable: d.reshape(shape)[()] for variable, d in derivatives.items()}
+                    for name, derivatives in jacobian.items()}
+        return CycleJacobian(outputs, wrt, values, jacobian)
+
+    # Array-native version of calculateThrust and calculateTSFC, see calculateCycle
+    def calculateThrustAndTSFC(self, M_0=None, T_0=None, P_0=None, T_t4=None, P9rat=None):
+        result = self.calculateCycle(M_0, T_0, P_0, T_t4, P9rat)
+        return result.thrust, result.tsfc
+
     def calculateUninstalledTSFC(self, M_0, T_0, P_0, T_t4, P_9, g_c, gamma_c, c_pc, gamma_t, c_pt, pi_d_max, tau_cR, T_t4R, tau_rR, eta_c, h_pR, eta_b, m_dot_R, P_0R, pi_rR, pi_cR, pi_b, pi_t, pi_n, tau_t):
         # Calculate R_c ad R_t
         R_c = self.calc_R_c(gamma_c, c_pc)
@@ -396,34 +651,5 @@ class GeneralAnalysis:
         return n_div_nr * N_R
     
     def AtmosphereFunction(self, h_G_km):       #Atmosphere Function input hieght in Kilometers
-        h_G = h_G_km*3280.84              #Kilometers to feet
-        r_e=3959*5280                     #miles to feet
-        R=1716.5                          #ft2/R-sec
-        g0=32.174                         #ft/s^2
-        T0=518.69                         #deg R
-        g_hG=g0*(r_e/(r_e+h_G))**2        #gravity acceleration based on geopotential altitude
-        h=(r_e/(r_e+h_G))*h_G             #altitude from geopotential altitude and earth radius
-        if h<36000:                       # standard atmosphere maths up until tropopause
-            h0=0                          # initial altitude of comparison is sea level
-            T0=518.69                     #deg R
-            P0=2116.22                    #psf
-            rho0=2.3769e-3                #slugs/ft3
-            a1=-3.57/1000                 #deg R/ft
-            T= T0 + a1*(h-h0)             # calculate temperature from linear distribution
-            P= P0*(T/T0)**(-g0/(R*a1))    #pressure from temperature
-            rho = rho0*(T/T0)**(-((g0/(R*a1))+1))       #density from temperature
-        else:
-            h0=36000                      #tropopause altitude (ft)
-            P0=4.760119191888137e+2       #from anderson
-            rho0=7.103559955456123e-4     #from running code at 36000
-            T=389.99                      # constant temperature
-            P= P0*np.exp((-g0/(R*T)*(h-h0)))            #pressure from temperature
-            rho = rho0*np.exp(-(g0/(R*T)*(h-h0)))       #density from temperature
-        a=np.sqrt(1.4*P/rho)              # speed of sound
-        h_G = h_G_km/3280.84              #Feet to Km
-        h = h/3280.84                     #Geopotential altitude in km
-        T = T*0.555556                    #Rankine to Kelvin
-        P = P /0.020885 /1000             #Psf to KPa
-        rho = rho/515.4                   #Density in kg/m^2
-        a = a/3.281                       #Local  m/s
-        return [h_G, h, T, P, rho,a]
\ No newline at end of file
+        # Returns [h_G, h, T, P, rho, a] in km, km, K, kPa, kg/m^3 and m/s; h_G_km may be an array
+        return standard_atmosphere(h_G_km)
@@ -0,0 +1,126 @@
+# profiling.py
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StageProfiler:
+    """
+    Records call counts, cumulative time and points processed for nested stages of a calculation.
+
+    Attach one to GeneralAnalysis.profiler or TurbojetModel.profiler. Every frame is identified by its full
+    stack, e.g. ('TurbojetModel.calculate', 'calculateCycle', 'compressor', 'calc_tau_c'), and its recorded
+    time includes the frames below it. Each thread keeps its own stack, so a profiler can be shared with a
+    worker thread.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self._stats = {}  # stack -> [calls, seconds, points]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def stack(self):
+        # Frames currently open in this thread
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = ()
+        return self._local.stack
+
+    @contextmanager
+    def frame(self, name, points=0):
+        """
+        Time the body of a with-block as a frame called name, nested under the frames already open.
+        """
+        parent = self.stack
+        self._local.stack = parent + (name,)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._local.stack = parent
+            self.record(parent + (name,), self.clock() - start, points)
+
+    def record(self, stack, seconds, points=0, calls=1):
+        """
+        Add a measurement for a complete stack (a tuple of frame names).
+        """
+        with self._lock:
+            entry = self._stats.setdefault(tuple(stack), [0, 0.0, 0])
+            entry[0] += calls
+            entry[1] += seconds
+            entry[2] += points
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def report(self):
+        """
+        Returns:
+        - list: One dict per recorded stack with calls, total_s (including children), self_s, points and
+          points_per_sec, sorted by stack.
+        """
+        with self._lock:
+            stats = {stack: list(entry) for stack, entry in self._stats.items()}
+        children = {}
+        for stack, (_, seconds, _) in stats.items():
+            if stack[:-1] in stats:
+                children[stack[:-1]] = children.get(stack[:-1], 0.0) + seconds
+        rows = []
+        for stack in sorted(stats):
+            calls, seconds, points = stats[stack]
+            rows.append({
+                'stack': list(stack),
+                'calls': calls,
+                'total_s': seconds,
+                'self_s': max(seconds - children.get(stack, 0.0), 0.0),
+                'points': points,
+                'points_per_sec': points / seconds if points and seconds > 0 else None,
+            })
+        return rows
+
+    def by_name(self):
+        """
+        Totals per frame name over every stack it appears at the end of, e.g. all 'compressor' frames.
+
+        Returns:
+        - dict: name -> {'calls', 'total_s', 'points'}
+        """
+        totals = {}
+        for row in self.report():
+            entry = totals.setdefault(row['stack'][-1], {'calls': 0, 'total_s': 0.0, 'points': 0})
+            entry['calls'] += row['calls']
+            entry['total_s'] += row['total_s']
+            entry['points'] += row['points']
+        return totals
+
+    def to_json(self, path=None):
+        """
+        Serialize the report as JSON, writing it to path if given.
+
+        Returns:
+        - str: The JSON text.
+        """
+        text = json.dumps({'frames': self.report(), 'totals': self.by_name()}, indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text + '\n')
+        return text
+
+    def to_folded(self, path=None, unit=1e-6):
+        """
+        Export self time as folded stacks ("a;b;c 1234" per line, in microseconds by default), the input
+        format of flamegraph.pl, speedscope and inferno.
+
+        Returns:
+        - str: The folded stacks.
+        """
+        lines = [f"{';'.join(row['stack'])} {round(row['self_s'] / unit)}" for row in self.report()
+                 if round(row['self_s'] / unit) > 0]
+        text = '\n'.join(lines) + '\n' if lines else ''
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
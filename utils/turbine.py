@@ -1,44 +1,154 @@
 # turbine_model.py
-pip install cantera
-import cantera as ct
+import os
+import threading
+import numpy as np
+
+# One air Solution per thread (and per process); building it parses air.yaml, so it is created on first use
+# and reused. Setting its state and reading a property is two calls, so threads must not share one.
+# Cantera itself is imported at that point too, so importing this module stays cheap.
+_local = threading.local()
+
+
+def get_air():
+    """
+    Return this thread's cached Cantera Solution for air, creating it on first use.
+
+    Returns:
+        cantera.Solution: The calling thread's air Solution. Callers must not rely on its state between calls.
+    """
+    if getattr(_local, 'air', None) is None or _local.pid != os.getpid():
+        import cantera as ct
+        _local.air = ct.Solution('air.yaml')
+        _local.pid = os.getpid()
+    return _local.air
+
+
 class TurbineModel:
     """
     Class for modeling turbine behavior.
     """
 
-def TVel2h_total(t, v):
+    @staticmethod
+    def calculate_total_enthalpy_out(ht_in, ht_out_ideal, eff):
+        """
+        Calculate the total enthalpy at the outlet of the turbine.
+
+        Parameters:
+            ht_in (float or array): Total enthalpy at the inlet of the turbine.
+            ht_out_ideal (float or array): Ideal (isentropic) total enthalpy at the outlet of the turbine.
+            eff (float or array): Isentropic efficiency of the turbine.
+
+        Returns:
+            float or array: Total enthalpy at the outlet of the turbine.
+        """
+        return ht_in - eff * (ht_in - ht_out_ideal)
+
+
+def static_enthalpy(t):
     """
-    Calculate the enthalpy of air at given temperature and pressure.
+    Calculate the specific static enthalpy of air with Cantera.
 
     Parameters:
-        t (float): The temperature in Kelvin.
-        v (float): The air velocity magnitude in m/s.
+        t (float or array): The temperature in Kelvin.
 
     Returns:
-        float: The specific stagnation enthalpy of air in J/kg.
+        float or array: The specific enthalpy of air in J/kg, with the shape of t (NaN where t is not finite).
     """
-    # Create a Solution object for air
-    air = ct.Solution('air.yaml')
+    temperatures = np.asarray(t, dtype=float)
+    h = np.full(temperatures.shape, np.nan)
+    finite = np.isfinite(temperatures)
+    if finite.any():
+        air = get_air()
+        for i in np.ndindex(temperatures.shape):
+            if not finite[i]:
+                continue
+            air.TP = temperatures[i], 1 #the pressure value does not effect the enthalpy calculation( set it to a defualt 1)
+            h[i] = air.enthalpy_mass
+    if h.ndim == 0:
+        return h[()]
+    return h
+
 
-    # Set the temperature
-    air.TP = t, 1 #the pressure value does not effect the enthalpy calculation( set it to a defualt 1)
+class EnthalpyTable:
+    """
+    Precomputed h(T) of air with linear interpolation, for bulk enthalpy evaluation.
 
-    # Calculate the enthalpy
-    h = air.enthalpy_mass
+    The table is evenly spaced in temperature, so each lookup is a direct index computation. Temperatures
+    outside the table fall back to static_enthalpy(), and non-finite ones give NaN.
+    """
+
+    def __init__(self, T_min=200.0, T_max=3000.0, resolution=1.0):
+        """
+        Parameters:
+            T_min (float): Lowest tabulated temperature in Kelvin.
+            T_max (float): Highest tabulated temperature in Kelvin.
+            resolution (float): Table spacing in Kelvin.
+        """
+        if T_max <= T_min:
+            raise ValueError("T_max must be greater than T_min")
+        n = max(int(np.ceil((T_max - T_min)/resolution)) + 1, 2)
+        self.T_min = float(T_min)
+        self.T_max = float(T_max)
+        self.temperature = np.linspace(self.T_min, self.T_max, n)
+        self.step = (self.T_max - self.T_min)/(n - 1)
+        self.enthalpy = static_enthalpy(self.temperature)
+
+    def lookup(self, t):
+        """
+        Interpolate the specific static enthalpy of air.
+
+        Parameters:
+            t (float or array): The temperature in Kelvin.
+
+        Returns:
+            float or array: The specific enthalpy of air in J/kg, with the shape of t.
+        """
+        temperatures = np.asarray(t, dtype=float)
+        finite = np.isfinite(temperatures)
+        position = np.where(finite, (temperatures - self.T_min)/self.step, 0.0)
+        i = np.clip(np.floor(position), 0, len(self.enthalpy) - 2).astype(np.intp)
+        weight = position - i
+        h = self.enthalpy[i] + weight*(self.enthalpy[i + 1] - self.enthalpy[i])
+
+        outside = ~((temperatures >= self.T_min) & (temperatures <= self.T_max))
+        if np.any(outside):
+            h = np.where(outside, 0.0, h)
+            h[outside] = static_enthalpy(temperatures[outside])
+        if np.ndim(h) == 0:
+            return h[()]
+        return h
+
+
+def TVel2h_total(t, v, table=None):
+    """
+    Calculate the stagnation enthalpy of air at given temperature and velocity.
+
+    Parameters:
+        t (float or array): The temperature in Kelvin.
+        v (float or array): The air velocity magnitude in m/s.
+        table (EnthalpyTable, optional): Interpolate h(T) from this table instead of calling Cantera
+            for every temperature.
+
+    Returns:
+        float or array: The specific stagnation enthalpy of air in J/kg.
+    """
+    h = table.lookup(t) if table is not None else static_enthalpy(t)
     # Total enthalpy or stagnation enthalpy v is velocity magnitude
-    h_t = h + .5*v**2
+    h_t = h + .5*np.asarray(v)**2
+    if np.ndim(h_t) == 0:
+        return h_t[()]
     return h_t
 def calculate_power(massdot, h4, h5):
     """
     Calculate power using the given equation.
 
     Parameters:
-        massdot (float): Mass flow rate.
-        h4 (float): Stagnation Enthalpy at state 4.
-        h5 (float): Enthalpy at state 5.
+        massdot (float or array): Mass flow rate.
+        h4 (float or array): Stagnation Enthalpy at state 4.
+        h5 (float or array): Enthalpy at state 5.
 
     Returns:
-        float: Calculated power.
+        float or array: Calculated power, broadcast over the inputs.
     """
     return massdot * (h4 - h5)
 
@@ -48,10 +158,10 @@ def compressor_power(power_out_turbine, n_m=0.95):     #the efficiency paramater
     and the power output of the turbine.
 
     Args:
-    power_out_turbine (float): Power output of the turbine.
-    n_m (float, optional): Efficiency parameter of the shaft. Defaults to 0.95.
+    power_out_turbine (float or array): Power output of the turbine.
+    n_m (float or array, optional): Efficiency parameter of the shaft. Defaults to 0.95.
 
     Returns:
-    float: Power output to the compressor.
+    float or array: Power output to the compressor.
     """
     return n_m * power_out_turbine
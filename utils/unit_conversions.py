@@ -1,6 +1,16 @@
 # unit_conversions.py
+from utils.units import units
+
 
 class UnitConversions:
+    """
+    Named scalar conversions kept for existing callers, with their original factors. New code, and anything
+    working on arrays or columns, should use the unit registry in utils/units.py.
+
+    lbhr_to_kgs and kgs_to_lbhr keep their historical factors, which are not a pounds-per-hour conversion;
+    lbm_hr_to_kg_s and kg_s_to_lbm_hr are the exact ones.
+    """
+
     @staticmethod
     def C_to_K(C):
         """
@@ -126,3 +136,17 @@ class UnitConversions:
         Convert feet (ft) to kilometers (km).
         """
         return UnitConversions.feet_to_meters(f) / 1000.0
+
+    @staticmethod
+    def lbm_hr_to_kg_s(lbm_hr):
+        """
+        Convert pounds-mass per hour (lbm/hr) to kilograms per second (kg/s).
+        """
+        return units.convert(lbm_hr, 'lbm/hr', 'kg/s')
+
+    @staticmethod
+    def kg_s_to_lbm_hr(kg_s):
+        """
+        Convert kilograms per second (kg/s) to pounds-mass per hour (lbm/hr).
+        """
+        return units.convert(kg_s, 'kg/s', 'lbm/hr')
@@ -0,0 +1,188 @@
+# units.py
+import numpy as np
+
+
+class Conversion:
+    """
+    A resolved unit conversion, target = value * scale + offset.
+
+    However long the chain of units it was built from, applying it is one multiply and one add over the
+    array (either skipped when it is a no-op), optionally in place.
+    """
+
+    __slots__ = ('source', 'target', 'scale', 'offset')
+
+    def __init__(self, source, target, scale, offset=0.0):
+        self.source = source
+        self.target = target
+        self.scale = float(scale)
+        self.offset = float(offset)
+
+    def __repr__(self):
+        return f"Conversion({self.source!r} -> {self.target!r}: x * {self.scale!r} + {self.offset!r})"
+
+    def __call__(self, values, out=None):
+        """
+        Apply the conversion.
+
+        Parameters:
+        - values (float or array): Values in the source unit.
+        - out (array, optional): Float array to write into; pass values itself to convert in place.
+
+        Returns:
+        - float or array: Values in the target unit (out, if given).
+        """
+        if out is not None and not (isinstance(out, np.ndarray) and np.issubdtype(out.dtype, np.floating)):
+            raise TypeError(f"Can only convert into a float array, not {getattr(out, 'dtype', type(out).__name__)}")
+        if out is None:
+            if np.ndim(values) == 0 and not isinstance(values, np.ndarray):
+                return values * self.scale + self.offset
+            values = np.asarray(values)
+            out = np.empty(values.shape, dtype=np.result_type(values.dtype, float))
+        if self.scale != 1.0:
+            np.multiply(values, self.scale, out=out)
+        elif out is not values:
+            np.copyto(out, values)
+        if self.offset != 0.0:
+            np.add(out, self.offset, out=out)
+        return out
+
+    def then(self, other):
+        """
+        Returns:
+        - Conversion: This conversion followed by other, fused into a single scale and offset.
+        """
+        return Conversion(self.source, other.target, self.scale * other.scale, self.offset * other.scale + other.offset)
+
+    def inverse(self):
+        return Conversion(self.target, self.source, 1.0 / self.scale, -self.offset / self.scale)
+
+
+class UnitRegistry:
+    """
+    Named units grouped by dimension, each defined by its affine map to the dimension's base unit
+    (base = value * scale + offset).
+
+    conversion() resolves source -> target, or a longer chain, into one fused Conversion and caches it, so
+    converting a column costs the same whichever units it arrives in.
+    """
+
+    def __init__(self):
+        self._units = {}
+        self._cache = {}
+
+    def define(self, name, dimension, scale, offset=0.0, aliases=()):
+        """
+        Parameters:
+        - name (str): Unit name, e.g. 'ft'.
+        - dimension (str): Quantity it measures, e.g. 'length'. Only units of the same dimension convert.
+        - scale, offset (float): Affine map to the base unit of the dimension.
+        - aliases (iterable): Other names for the same unit.
+        """
+        for key in (name, *aliases):
+            self._units[key] = (dimension, float(scale), float(offset))
+        self._cache.clear()
+
+    def __contains__(self, name):
+        return name in self._units
+
+    def units(self, dimension=None):
+        return [name for name, spec in self._units.items() if dimension is None or spec[0] == dimension]
+
+    def dimension(self, name):
+        return self._lookup(name)[0]
+
+    def _lookup(self, name):
+        try:
+            return self._units[name]
+        except KeyError:
+            raise ValueError(f"Unknown unit: {name}") from None
+
+    def conversion(self, *chain):
+        """
+        Resolve a conversion.
+
+        Parameters:
+        - *chain (str): Two or more unit names; the conversion runs from the first to the last through the
+          others.
+
+        Returns:
+        - Conversion: The whole chain as a single scale and offset.
+        """
+        if len(chain) < 2:
+            raise ValueError("A conversion needs a source and a target unit")
+        cached = self._cache.get(chain)
+        if cached is not None:
+            return cached
+        result = None
+        for source, target in zip(chain, chain[1:]):
+            (dimension, scale, offset), (to_dimension, to_scale, to_offset) = self._lookup(source), self._lookup(target)
+            if dimension != to_dimension:
+                raise ValueError(f"Cannot convert {source} ({dimension}) to {target} ({to_dimension})")
+            step = Conversion(source, target, scale / to_scale, (offset - to_offset) / to_scale)
+            result = step if result is None else result.then(step)
+        self._cache[chain] = result
+        return result
+
+    def convert(self, values, source, target, inplace=False):
+        """
+        Convert values from source to target units.
+
+        Parameters:
+        - values (float or array): Values to convert.
+        - source, target (str): Unit names.
+        - inplace (bool): Overwrite values, which must then be a float array (TypeError otherwise).
+
+        Returns:
+        - float or array: Converted values.
+        """
+        return self.conversion(source, target)(values, out=values if inplace else None)
+
+    def convert_columns(self, columns, units, targets, inplace=True):
+        """
+        Bring several columns, each in its own unit, to the units a calculation expects.
+
+        Parameters:
+        - columns (dict): Column name -> array.
+        - units (dict): Column name -> unit the column is in. Columns without an entry are left alone.
+        - targets (dict): Column name -> unit wanted.
+        - inplace (bool): Overwrite the column arrays instead of replacing them in the dict.
+
+        Returns:
+        - dict: columns, with the converted values.
+        """
+        for name, unit in units.items():
+            if name in columns and unit != targets[name]:
+                columns[name] = self.convert(columns[name], unit, targets[name], inplace=inplace)
+        return columns
+
+
+# Exact definitions (NIST SP 811) relative to SI base units
+FOOT = 0.3048                  # m
+POUND = 0.45359237             # kg
+POUND_FORCE = POUND * 9.80665  # N
+PSI = POUND_FORCE / 0.0254**2  # Pa
+BTU = 1055.05585262            # J (International Table)
+
+units = UnitRegistry()
+units.define('K', 'temperature', 1.0, aliases=('kelvin',))
+units.define('C', 'temperature', 1.0, 273.15, aliases=('degC', 'celsius'))
+units.define('F', 'temperature', 5 / 9, 273.15 - 32 * 5 / 9, aliases=('degF', 'fahrenheit'))
+units.define('R', 'temperature', 5 / 9, aliases=('degR', 'rankine'))
+units.define('Pa', 'pressure', 1.0)
+units.define('kPa', 'pressure', 1000.0)
+units.define('bar', 'pressure', 1e5)
+units.define('atm', 'pressure', 101325.0)
+units.define('psia', 'pressure', PSI, aliases=('psi',))
+units.define('m', 'length', 1.0)
+units.define('km', 'length', 1000.0)
+units.define('ft', 'length', FOOT, aliases=('feet',))
+units.define('kg/s', 'mass flow', 1.0, aliases=('kgs',))
+units.define('lbm/s', 'mass flow', POUND, aliases=('lb/s',))
+units.define('lbm/hr', 'mass flow', POUND / 3600, aliases=('lb/hr', 'lbhr'))
+units.define('N', 'force', 1.0)
+units.define('kN', 'force', 1000.0)
+units.define('lbf', 'force', POUND_FORCE)
+units.define('J', 'energy', 1.0)
+units.define('kJ', 'energy', 1000.0)
+units.define('BTU', 'energy', BTU, aliases=('Btu',))